@@ -0,0 +1,55 @@
+"""game_records
+
+Revision ID: 5f3c8e2a7b41
+Revises: 393436b8aecc
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f3c8e2a7b41'
+down_revision: Union[str, Sequence[str], None] = '393436b8aecc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('game_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fastest_match_id', sa.Integer(), nullable=True),
+    sa.Column('fastest_seconds', sa.Float(), nullable=True),
+    sa.Column('fastest_ended_at', sa.DateTime(), nullable=True),
+    sa.Column('fastest_player_1_id', sa.Integer(), nullable=True),
+    sa.Column('fastest_player_2_id', sa.Integer(), nullable=True),
+    sa.Column('win_streak', sa.Integer(), nullable=True),
+    sa.Column('win_streak_player_id', sa.Integer(), nullable=True),
+    sa.Column('loss_streak', sa.Integer(), nullable=True),
+    sa.Column('loss_streak_player_id', sa.Integer(), nullable=True),
+    sa.Column('most_games', sa.Integer(), nullable=True),
+    sa.Column('most_games_player_id', sa.Integer(), nullable=True),
+    sa.Column('most_seconds', sa.Float(), nullable=True),
+    sa.Column('most_seconds_player_id', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('player_records',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=True),
+    sa.Column('play_seconds', sa.Float(), nullable=True),
+    sa.Column('current_win_streak', sa.Integer(), nullable=True),
+    sa.Column('best_win_streak', sa.Integer(), nullable=True),
+    sa.Column('current_loss_streak', sa.Integer(), nullable=True),
+    sa.Column('best_loss_streak', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('player_records')
+    op.drop_table('game_records')
@@ -0,0 +1,33 @@
+"""player_stats match totals
+
+Revision ID: 8c1d4e6f2a90
+Revises: 5f3c8e2a7b41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d4e6f2a90'
+down_revision: Union[str, Sequence[str], None] = '5f3c8e2a7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Значения для существующих игроков заполняет python -m scripts.backfill_player_totals
+    with op.batch_alter_table('player_stats') as batch_op:
+        batch_op.add_column(sa.Column('finished_matches', sa.Integer(), nullable=True, server_default='0'))
+        batch_op.add_column(sa.Column('play_seconds', sa.Float(), nullable=True, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('player_stats') as batch_op:
+        batch_op.drop_column('play_seconds')
+        batch_op.drop_column('finished_matches')
@@ -0,0 +1,34 @@
+"""player unreachable
+
+Revision ID: a7c9e1f3b5d2
+Revises: f2a4c6e8b0d1
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1f3b5d2'
+down_revision: Union[str, Sequence[str], None] = 'f2a4c6e8b0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.add_column(sa.Column('unreachable_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('broadcast_jobs') as batch_op:
+        batch_op.add_column(sa.Column('blocked', sa.Integer(), nullable=True, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('broadcast_jobs') as batch_op:
+        batch_op.drop_column('blocked')
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.drop_column('unreachable_at')
@@ -0,0 +1,30 @@
+"""drop match player indexes
+
+Revision ID: b3d5f7a9c1e4
+Revises: a7c9e1f3b5d2
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e4'
+down_revision: Union[str, Sequence[str], None] = 'a7c9e1f3b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Последние матчи игрока больше не читаются (достижения считаются по achievement_progress)
+    op.drop_index('ix_matches_player_2_ended_at', table_name='matches')
+    op.drop_index('ix_matches_player_1_ended_at', table_name='matches')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_matches_player_1_ended_at', 'matches', ['player_1_id', 'ended_at', 'winner_id', 'result'])
+    op.create_index('ix_matches_player_2_ended_at', 'matches', ['player_2_id', 'ended_at', 'winner_id', 'result'])
@@ -0,0 +1,31 @@
+"""match indexes
+
+Revision ID: d4a7b9c1e3f5
+Revises: 8c1d4e6f2a90
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7b9c1e3f5'
+down_revision: Union[str, Sequence[str], None] = '8c1d4e6f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_matches_player_1_ended_at', 'matches', ['player_1_id', 'ended_at', 'winner_id', 'result'])
+    op.create_index('ix_matches_player_2_ended_at', 'matches', ['player_2_id', 'ended_at', 'winner_id', 'result'])
+    op.create_index('ix_matches_result_ended_at', 'matches', ['result', 'ended_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_matches_result_ended_at', table_name='matches')
+    op.drop_index('ix_matches_player_2_ended_at', table_name='matches')
+    op.drop_index('ix_matches_player_1_ended_at', table_name='matches')
@@ -0,0 +1,35 @@
+"""achievement_progress
+
+Revision ID: e6b1c3d5f7a9
+Revises: d4a7b9c1e3f5
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1c3d5f7a9'
+down_revision: Union[str, Sequence[str], None] = 'd4a7b9c1e3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('achievement_progress',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('win_streak', sa.Integer(), nullable=True),
+    sa.Column('brave_loss_streak', sa.Integer(), nullable=True),
+    sa.Column('active_days', sa.Integer(), nullable=True),
+    sa.Column('last_active_day', sa.Date(), nullable=True),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('achievement_progress')
@@ -4,6 +4,13 @@ from aiogram import Bot, Dispatcher
 from app.handlers.register import register_handlers
 from app.logger import setup_logger
 from app.config import BOT_TOKEN
+from app.dependencies import run_db, shutdown_db_executor
+from app.db_utils.stats import warm_rating_index
+from app.services.achievements_service import load_achievements
+from app.services.fleet_pool import fleet_pool
+from app.services.presence_buffer import presence_buffer
+from app.services.broadcast_service import broadcast_worker
+from app.services.outbox import outbox
 
 # Инициализация логгера
 logger = setup_logger("bot")
@@ -16,14 +23,43 @@ dp = Dispatcher()
 register_handlers(dp)
 
 
+async def warm_up_rating_index() -> None:
+    """Загружает рейтинги в память в фоне; до окончания загрузки рейтинг считается через SQL."""
+    try:
+        players = await run_db(warm_rating_index)
+        logger.info(f"📈 Индекс рейтинга загружен: {players} игроков")
+    except Exception as e:
+        logger.exception(f"Не удалось загрузить индекс рейтинга, рейтинг считается через SQL: {e}")
+
+
+async def load_achievement_definitions() -> None:
+    """Создает недостающие достижения и кеширует их ID; при ошибке справочник будет прочитан при первом матче."""
+    try:
+        achievements = await run_db(load_achievements)
+        logger.info(f"🏅 Справочник достижений загружен: {achievements} достижений")
+    except Exception as e:
+        logger.exception(f"Не удалось загрузить справочник достижений: {e}")
+
+
 async def main():
     logger.info("✅ Морской Бой Бот запущен!")
+    await load_achievement_definitions()
+    fleet_pool.start()
+    presence_buffer.start()
+    broadcast_worker.start(bot)
+    rating_warmup = asyncio.create_task(warm_up_rating_index())
     try:
         await dp.start_polling(bot)
     except Exception as e:
         logger.exception(f"Ошибка в bot.py: {e}")
     finally:
+        rating_warmup.cancel()
+        await fleet_pool.stop()
+        await broadcast_worker.stop()
+        await outbox.stop()
+        await presence_buffer.stop()
         await bot.session.close()
+        shutdown_db_executor()
 
 
 if __name__ == "__main__":
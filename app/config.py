@@ -14,6 +14,40 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 # Получаем ID администратора для рассылок
 ADMIN_ID = os.getenv("ADMIN_ID")
 
+# Число потоков для синхронной работы с БД (SQLAlchemy выполняется вне event loop)
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "4"))
+
+# Профиль настроек SQLite (см. app.database.SQLITE_PROFILES): "wal" — WAL и ускоренная запись, "default" — как есть
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+
+# Пул соединений с БД: постоянные соединения (по умолчанию по числу потоков БД) и дополнительные сверх них
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(DB_EXECUTOR_WORKERS)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Пул заранее расставленных флотов: при падении ниже нижней отметки фоновая задача пополняет его до верхней
+FLEET_POOL_LOW_WATER = int(os.getenv("FLEET_POOL_LOW_WATER", "32"))
+FLEET_POOL_HIGH_WATER = int(os.getenv("FLEET_POOL_HIGH_WATER", "256"))
+
+# Как часто (в секундах) сбрасывать в БД накопленные обновления last_seen и username
+PRESENCE_FLUSH_INTERVAL = float(os.getenv("PRESENCE_FLUSH_INTERVAL", "5"))
+
+# Рассылка: общий лимит сообщений в секунду (у Telegram — около 30), число параллельных отправителей
+# и размер порции получателей, читаемой из БД за раз
+BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", "25"))
+BROADCAST_WORKERS = int(os.getenv("BROADCAST_WORKERS", "8"))
+BROADCAST_CHUNK = int(os.getenv("BROADCAST_CHUNK", "1000"))
+
+# Пропускать в рассылках игроков, заблокировавших бота (отмечаются автоматически по ошибке Forbidden)
+BROADCAST_SKIP_UNREACHABLE = os.getenv("BROADCAST_SKIP_UNREACHABLE", "1") == "1"
+
+# Исходящие сообщения игрокам (app.services.outbox): общий лимит в секунду, лимит одного чата (у Telegram —
+# около сообщения в секунду, короткие всплески допустимы) и число повторов после RetryAfter и сетевых ошибок
+OUTBOX_RATE = float(os.getenv("OUTBOX_RATE", "30"))
+OUTBOX_CHAT_RATE = float(os.getenv("OUTBOX_CHAT_RATE", "1"))
+OUTBOX_CHAT_BURST = int(os.getenv("OUTBOX_CHAT_BURST", "3"))
+OUTBOX_MAX_RETRIES = int(os.getenv("OUTBOX_MAX_RETRIES", "3"))
+
 # Задаем временную зону по МСК
 MOSCOW_TZ = ZoneInfo("Europe/Moscow")
 
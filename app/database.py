@@ -1,8 +1,68 @@
-from sqlalchemy import create_engine
+from functools import partial
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 
-from app.config import DATABASE_URL
+from app.config import DATABASE_URL, SQLITE_PROFILE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT
 from app.models.base import Base
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Профили PRAGMA для SQLite, выполняются при открытии каждого соединения.
+# "wal": журнал WAL (читатели не ждут писателя), synchronous=NORMAL (в режиме WAL fsync только
+# при checkpoint — матч не теряется при падении процесса, только при отключении питания),
+# кеш страниц 64 МБ, чтение через mmap до 256 МБ и временные таблицы в памяти
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def _is_sqlite_memory(url) -> bool:
+    """База SQLite в памяти: у нее свой пул (одно соединение на поток), настройки пула к ней не применяются."""
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _apply_pragmas(pragmas: dict[str, str | int], dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def create_db_engine(database_url: str, profile: str = SQLITE_PROFILE, pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW, pool_timeout: float = DB_POOL_TIMEOUT) -> Engine:
+    """
+    Создает движок БД с настройками пула соединений и, для SQLite, с PRAGMA выбранного профиля.
+
+    :param database_url: URL базы данных.
+    :param profile: Профиль SQLite из SQLITE_PROFILES (для других БД не используется).
+    :param pool_size: Число постоянных соединений в пуле.
+    :param max_overflow: Сколько соединений можно открыть сверх pool_size при нагрузке.
+    :param pool_timeout: Сколько секунд ждать свободное соединение.
+    :return: Движок SQLAlchemy.
+    """
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    if is_sqlite and profile not in SQLITE_PROFILES:
+        raise ValueError(f"Неизвестный профиль SQLite: {profile} (доступны: {', '.join(SQLITE_PROFILES)})")
+
+    kwargs = {}
+    if is_sqlite:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not (is_sqlite and _is_sqlite_memory(url)):
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+
+    db_engine = create_engine(database_url, **kwargs)
+    if is_sqlite and SQLITE_PROFILES[profile]:
+        event.listen(db_engine, "connect", partial(_apply_pragmas, SQLITE_PROFILES[profile]))
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,14 +1,18 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Dict
 from sqlalchemy.orm import Session
 
-from app.models import Achievement, PlayerAchievement
+from app.models import Achievement, PlayerAchievement, AchievementProgress, Match
 from app.config import MOSCOW_TZ
 
+# Сколько матчей читать из БД за раз при пересборке прогресса достижений
+REBUILD_BATCH = 10_000
 
-def seed_achievements(db: Session, definitions: list[dict]) -> None:
+
+def seed_achievements(db: Session, definitions: list[dict], commit: bool = True) -> None:
     """
     Создаёт записи достижений в таблице Achievement, если их ещё нет.
+    При commit=False новые записи только отправляются в БД (flush).
     """
     existing_codes = {a.code for a in db.query(Achievement).all()}
     created = False
@@ -23,7 +27,10 @@ def seed_achievements(db: Session, definitions: list[dict]) -> None:
         ))
         created = True
     if created:
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
 
 
 def get_all_achievements(db: Session) -> List:
@@ -47,32 +54,39 @@ def get_player_achievements(db: Session, player_id: int) -> List:
     return db.query(PlayerAchievement).filter(PlayerAchievement.player_id == player_id).all()
 
 
-def get_or_create_player_achievement(db: Session, player_id: int, achievement: Achievement) -> PlayerAchievement:
+def get_or_create_player_achievement(db: Session, player_id: int, achievement_id: int,
+                                     commit: bool = True) -> PlayerAchievement:
     """
     Получает или создаёт запись PlayerAchievement.
+    При commit=False новая запись только отправляется в БД (flush).
     """
     link = (
         db.query(PlayerAchievement)
-        .filter(PlayerAchievement.player_id == player_id, PlayerAchievement.achievement_id == achievement.id)
+        .filter(PlayerAchievement.player_id == player_id, PlayerAchievement.achievement_id == achievement_id)
         .first()
     )
     if link is None:
-        link = PlayerAchievement(player_id=player_id, achievement_id=achievement.id, is_unlocked=False)
+        link = PlayerAchievement(player_id=player_id, achievement_id=achievement_id, is_unlocked=False)
         db.add(link)
-        db.commit()
-        db.refresh(link)
+        if commit:
+            db.commit()
+            db.refresh(link)
+        else:
+            db.flush()
     return link
 
 
-def unlock_achievement(db: Session, link: PlayerAchievement) -> None:
+def unlock_achievement(db: Session, link: PlayerAchievement, commit: bool = True) -> None:
     """
     Помечает достижение как разблокированное.
+    При commit=False изменение фиксирует вызывающий код.
     """
     if link.is_unlocked:
         return
     link.is_unlocked = True
     link.unlocked_at = datetime.now(MOSCOW_TZ)
-    db.commit()
+    if commit:
+        db.commit()
 
 
 def get_achievement_percentages(db: Session) -> Dict[str, float]:
@@ -110,3 +124,94 @@ def get_achievement_percentages(db: Session) -> Dict[str, float]:
         result[achievement.code] = round(percentage, 1)
     
     return result
+
+
+def _new_achievement_progress(player_id: int) -> AchievementProgress:
+    return AchievementProgress(player_id=player_id, win_streak=0, brave_loss_streak=0, active_days=0)
+
+
+def _apply_match_to_progress(progress: AchievementProgress, won: bool, result: str, day: date) -> None:
+    """
+    Учитывает один завершенный матч в счетчиках прогресса игрока.
+    Общая часть для обновления после матча и для пересборки по таблице matches.
+    """
+    progress.win_streak = progress.win_streak + 1 if won else 0
+    # Поражение сдачей, как и победа, прерывает серию поражений без сдачи
+    progress.brave_loss_streak = progress.brave_loss_streak + 1 if not won and result != "surrender" else 0
+
+    last_day = progress.last_active_day
+    if last_day is None or (day - last_day).days > 1:
+        progress.active_days = 1
+        progress.last_active_day = day
+    elif (day - last_day).days == 1:
+        progress.active_days += 1
+        progress.last_active_day = day
+
+
+def get_or_create_achievement_progress(db: Session, player_id: int) -> AchievementProgress:
+    """
+    Получает счетчики прогресса достижений игрока или создает пустые (без commit, только flush).
+
+    :param db: Сессия SQLAlchemy.
+    :param player_id: telegram_id игрока.
+    :return: Объект AchievementProgress.
+    """
+    progress = db.get(AchievementProgress, player_id)
+    if progress is None:
+        progress = _new_achievement_progress(player_id)
+        db.add(progress)
+        db.flush()
+    return progress
+
+
+def update_achievement_progress(db: Session, player_id: int, won: bool, result: str, day: date,
+                                commit: bool = True) -> AchievementProgress:
+    """
+    Обновляет счетчики прогресса достижений игрока после матча.
+
+    :param db: Сессия SQLAlchemy.
+    :param player_id: telegram_id игрока.
+    :param won: Победил ли игрок.
+    :param result: Тип завершения матча ('normal', 'surrender', 'complaint').
+    :param day: День окончания матча (по МСК).
+    :param commit: Зафиксировать транзакцию (при False — только flush, фиксирует вызывающий код).
+    :return: Обновленный объект AchievementProgress.
+    """
+    progress = get_or_create_achievement_progress(db, player_id)
+    _apply_match_to_progress(progress, won, result or "", day)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return progress
+
+
+def rebuild_achievement_progress(db: Session) -> int:
+    """
+    Пересобирает счетчики прогресса достижений с нуля по таблице matches
+    (матчи проходятся по порядку завершения). Используется для первоначального заполнения.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Количество учтенных матчей.
+    """
+    players: dict[int, AchievementProgress] = {}
+    applied = 0
+
+    matches = (
+        db.query(Match)
+        .filter(Match.ended_at.isnot(None))
+        .order_by(Match.ended_at.asc(), Match.id.asc())
+        .yield_per(REBUILD_BATCH)
+    )
+    for match in matches:
+        for player_id in (match.player_1_id, match.player_2_id):
+            if player_id not in players:
+                players[player_id] = _new_achievement_progress(player_id)
+            _apply_match_to_progress(players[player_id], match.winner_id == player_id, match.result or "",
+                                     match.ended_at.date())
+        applied += 1
+
+    db.query(AchievementProgress).delete()
+    db.add_all(players.values())
+    db.commit()
+    return applied
@@ -0,0 +1,265 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import MOSCOW_TZ
+from app.models.broadcast import BroadcastJob, BroadcastDelivery
+from app.models.player import Player
+
+# Задания, которые фоновый отправитель должен выполнить (или продолжить после перезапуска)
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _job_summary(job: BroadcastJob) -> dict:
+    return {
+        "id": job.id,
+        "admin_id": job.admin_id,
+        "text": job.text,
+        "status": job.status,
+        "cursor": job.cursor,
+        "total": job.total,
+        "sent": job.sent,
+        "failed": job.failed,
+        "blocked": job.blocked or 0,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def count_recipients(db: Session, skip_unreachable: bool = True) -> int:
+    """
+    Возвращает число получателей рассылки.
+
+    :param db: Сессия SQLAlchemy.
+    :param skip_unreachable: Не считать игроков, заблокировавших бота.
+    :return: Количество игроков.
+    """
+    query = select(func.count(Player.id))
+    if skip_unreachable:
+        query = query.where(Player.unreachable_at.is_(None))
+    return db.execute(query).scalar_one()
+
+
+def count_reachable_players(db: Session) -> tuple[int, int]:
+    """
+    Возвращает число игроков, доступных для рассылки, и число заблокировавших бота.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Пара (доступны, недоступны).
+    """
+    unreachable = func.count(Player.unreachable_at)
+    total, unreachable = db.execute(select(func.count(Player.id), unreachable)).one()
+    return total - unreachable, unreachable
+
+
+def get_pending_recipients(db: Session, job_id: int, after_id: int, limit: int,
+                           skip_unreachable: bool = True) -> list[tuple[int, str]]:
+    """
+    Возвращает следующую порцию получателей задания (keyset-пагинация по players.id):
+    игроки с id больше after_id, которым это задание еще не отправлялось.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания рассылки.
+    :param after_id: id последнего игрока предыдущей порции (0 — с начала).
+    :param limit: Размер порции.
+    :param skip_unreachable: Пропускать игроков, заблокировавших бота.
+    :return: Список пар (id игрока, telegram_id).
+    """
+    delivered = (
+        select(BroadcastDelivery.player_id)
+        .where(BroadcastDelivery.job_id == job_id, BroadcastDelivery.player_id == Player.id)
+        .exists()
+    )
+    query = select(Player.id, Player.telegram_id).where(Player.id > after_id, ~delivered)
+    if skip_unreachable:
+        query = query.where(Player.unreachable_at.is_(None))
+    rows = db.execute(query.order_by(Player.id).limit(limit)).all()
+    return [(player_id, telegram_id) for player_id, telegram_id in rows]
+
+
+def save_broadcast_draft(db: Session, admin_id: int, text: str) -> int:
+    """
+    Сохраняет подготовленное сообщение рассылки. Прежние черновики администратора отменяются.
+
+    :param db: Сессия SQLAlchemy.
+    :param admin_id: Telegram ID администратора.
+    :param text: Текст рассылки.
+    :return: ID задания.
+    """
+    db.execute(
+        update(BroadcastJob)
+        .where(BroadcastJob.admin_id == admin_id, BroadcastJob.status == "draft")
+        .values(status="cancelled", finished_at=datetime.now(MOSCOW_TZ))
+    )
+    job = BroadcastJob(admin_id=admin_id, text=text, status="draft", created_at=datetime.now(MOSCOW_TZ))
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def get_broadcast_draft(db: Session, admin_id: int) -> Optional[dict]:
+    """
+    Возвращает последний черновик рассылки администратора.
+
+    :param db: Сессия SQLAlchemy.
+    :param admin_id: Telegram ID администратора.
+    :return: Данные задания или None.
+    """
+    job = (
+        db.query(BroadcastJob)
+        .filter(BroadcastJob.admin_id == admin_id, BroadcastJob.status == "draft")
+        .order_by(BroadcastJob.id.desc())
+        .first()
+    )
+    return _job_summary(job) if job else None
+
+
+def cancel_broadcast_draft(db: Session, admin_id: int) -> int:
+    """
+    Отменяет черновики рассылки администратора.
+
+    :param db: Сессия SQLAlchemy.
+    :param admin_id: Telegram ID администратора.
+    :return: Количество отмененных черновиков.
+    """
+    result = db.execute(
+        update(BroadcastJob)
+        .where(BroadcastJob.admin_id == admin_id, BroadcastJob.status == "draft")
+        .values(status="cancelled", finished_at=datetime.now(MOSCOW_TZ))
+    )
+    db.commit()
+    return result.rowcount
+
+
+def queue_broadcast_job(db: Session, job_id: int) -> bool:
+    """
+    Ставит черновик рассылки в очередь на отправку.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания.
+    :return: True, если задание было черновиком и поставлено в очередь.
+    """
+    result = db.execute(
+        update(BroadcastJob)
+        .where(BroadcastJob.id == job_id, BroadcastJob.status == "draft")
+        .values(status="queued")
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def get_next_broadcast_job(db: Session) -> Optional[dict]:
+    """
+    Возвращает задание, которое нужно выполнять: сначала прерванное (running), затем самое старое в очереди.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Данные задания или None.
+    """
+    job = (
+        db.query(BroadcastJob)
+        .filter(BroadcastJob.status.in_(ACTIVE_STATUSES))
+        .order_by(case((BroadcastJob.status == "running", 0), else_=1), BroadcastJob.id)
+        .first()
+    )
+    return _job_summary(job) if job else None
+
+
+def start_broadcast_job(db: Session, job_id: int, skip_unreachable: bool = True) -> dict:
+    """
+    Отмечает задание как выполняемое. При первом запуске запоминает время начала и число получателей.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания.
+    :param skip_unreachable: Не считать получателями игроков, заблокировавших бота.
+    :return: Данные задания.
+    """
+    job = db.get(BroadcastJob, job_id)
+    if job.status == "queued":
+        job.status = "running"
+        job.started_at = datetime.now(MOSCOW_TZ)
+        job.total = count_recipients(db, skip_unreachable)
+        db.commit()
+    return _job_summary(job)
+
+
+def record_broadcast_deliveries(db: Session, job_id: int, results: list[tuple[int, str]],
+                                cursor: Optional[int] = None) -> None:
+    """
+    Записывает результаты отправки одним пакетом и увеличивает счетчики задания.
+    Игроки, заблокировавшие бота, в той же транзакции отмечаются недоступными для следующих рассылок.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания.
+    :param results: Пары (id игрока, статус отправки: sent / failed / blocked).
+    :param cursor: Новый курсор задания (все получатели до него включительно обработаны) или None.
+    """
+    if results:
+        db.execute(insert(BroadcastDelivery), [
+            {"job_id": job_id, "player_id": player_id, "status": status}
+            for player_id, status in results
+        ])
+    blocked = [player_id for player_id, status in results if status == "blocked"]
+    if blocked:
+        db.execute(
+            update(Player)
+            .where(Player.id.in_(blocked), Player.unreachable_at.is_(None))
+            .values(unreachable_at=datetime.now(MOSCOW_TZ))
+        )
+    sent = sum(1 for _, status in results if status == "sent")
+    values = {
+        "sent": BroadcastJob.sent + sent,
+        "failed": BroadcastJob.failed + (len(results) - sent),
+        "blocked": BroadcastJob.blocked + len(blocked),
+    }
+    if cursor is not None:
+        values["cursor"] = cursor
+    db.execute(update(BroadcastJob).where(BroadcastJob.id == job_id).values(**values))
+    db.commit()
+
+
+def finish_broadcast_job(db: Session, job_id: int) -> dict:
+    """
+    Отмечает задание завершенным.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания.
+    :return: Данные задания.
+    """
+    job = db.get(BroadcastJob, job_id)
+    job.status = "done"
+    job.finished_at = datetime.now(MOSCOW_TZ)
+    db.commit()
+    return _job_summary(job)
+
+
+def get_broadcast_job(db: Session, job_id: int) -> Optional[dict]:
+    """
+    Возвращает данные задания рассылки.
+
+    :param db: Сессия SQLAlchemy.
+    :param job_id: ID задания.
+    :return: Данные задания или None.
+    """
+    job = db.get(BroadcastJob, job_id)
+    return _job_summary(job) if job else None
+
+
+def get_recent_broadcast_jobs(db: Session, limit: int = 5) -> list[dict]:
+    """
+    Возвращает последние отправленные и отправляемые задания рассылки (без черновиков и отмененных).
+
+    :param db: Сессия SQLAlchemy.
+    :param limit: Сколько заданий вернуть.
+    :return: Список данных заданий, новые первыми.
+    """
+    jobs = (
+        db.query(BroadcastJob)
+        .filter(BroadcastJob.status.in_(ACTIVE_STATUSES + ("done",)))
+        .order_by(BroadcastJob.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [_job_summary(job) for job in jobs]
@@ -54,7 +54,7 @@ def handle_donation(db, player, stars_amount: int, payment_date):
     achievements_by_code = get_achievements_by_code(db)
     if "project_supporter" in achievements_by_code:
         achievement = achievements_by_code["project_supporter"]
-        player_achievement = get_or_create_player_achievement(db, player.telegram_id, achievement)
+        player_achievement = get_or_create_player_achievement(db, player.telegram_id, achievement.id)
         unlock_achievement(db, player_achievement)
 
     db.commit()
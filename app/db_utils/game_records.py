@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.models.game_records import GameRecords, PlayerRecords
+from app.models.match import Match
+from app.models.player import Player
+from app.db_utils.records import UNKNOWN_PLAYER
+
+GAME_RECORDS_ID = 1
+
+# Сколько матчей читать из БД за раз при пересборке рекордов
+REBUILD_BATCH = 10_000
+
+
+def _new_game_records() -> GameRecords:
+    return GameRecords(id=GAME_RECORDS_ID, win_streak=0, loss_streak=0, most_games=0, most_seconds=0)
+
+
+def _new_player_records(player_id: int) -> PlayerRecords:
+    return PlayerRecords(player_id=player_id, games_played=0, play_seconds=0, current_win_streak=0,
+                         best_win_streak=0, current_loss_streak=0, best_loss_streak=0)
+
+
+def _apply_match(records: GameRecords, winner: PlayerRecords, loser: PlayerRecords, match_id: int,
+                 seconds: float, ended_at: datetime, player_1_id: int, player_2_id: int) -> None:
+    """
+    Учитывает один завершенный матч в показателях игроков и в общих рекордах.
+    Общая часть для обновления после матча и для пересборки по таблице matches.
+    """
+    if records.fastest_seconds is None or seconds < records.fastest_seconds:
+        records.fastest_match_id = match_id
+        records.fastest_seconds = seconds
+        records.fastest_ended_at = ended_at
+        records.fastest_player_1_id = player_1_id
+        records.fastest_player_2_id = player_2_id
+
+    winner.current_win_streak += 1
+    winner.current_loss_streak = 0
+    winner.best_win_streak = max(winner.best_win_streak, winner.current_win_streak)
+
+    loser.current_loss_streak += 1
+    loser.current_win_streak = 0
+    loser.best_loss_streak = max(loser.best_loss_streak, loser.current_loss_streak)
+
+    if winner.best_win_streak > records.win_streak:
+        records.win_streak = winner.best_win_streak
+        records.win_streak_player_id = winner.player_id
+    if loser.best_loss_streak > records.loss_streak:
+        records.loss_streak = loser.best_loss_streak
+        records.loss_streak_player_id = loser.player_id
+
+    for player in (winner, loser):
+        player.games_played += 1
+        player.play_seconds += seconds
+        if player.games_played > records.most_games:
+            records.most_games = player.games_played
+            records.most_games_player_id = player.player_id
+        if player.play_seconds > records.most_seconds:
+            records.most_seconds = player.play_seconds
+            records.most_seconds_player_id = player.player_id
+
+
+def _counts_for_records(match: Match) -> bool:
+    """Матч учитывается в рекордах, если он завершен со статусом 'normal' и у него есть победитель."""
+    return (match.result == 'normal' and match.winner_id is not None
+            and match.started_at is not None and match.ended_at is not None)
+
+
+def get_or_create_game_records(db: Session) -> GameRecords:
+    """
+    Получает строку рекордов или создает пустую (без commit, только flush).
+
+    :param db: Сессия SQLAlchemy.
+    :return: Объект GameRecords.
+    """
+    records = db.get(GameRecords, GAME_RECORDS_ID)
+    if records is None:
+        records = _new_game_records()
+        db.add(records)
+        db.flush()
+    return records
+
+
+def get_or_create_player_records(db: Session, player_id: int) -> PlayerRecords:
+    """
+    Получает накопленные показатели игрока или создает пустые (без commit, только flush).
+
+    :param db: Сессия SQLAlchemy.
+    :param player_id: telegram_id игрока.
+    :return: Объект PlayerRecords.
+    """
+    player = db.get(PlayerRecords, player_id)
+    if player is None:
+        player = _new_player_records(player_id)
+        db.add(player)
+        db.flush()
+    return player
+
+
+def update_records_after_match(db: Session, match: Match, commit: bool = True) -> None:
+    """
+    Обновляет рекорды после завершения матча. Матчи не со статусом 'normal' не учитываются.
+
+    Вызывается после записи результата матча в той же транзакции: на SQLite к этому моменту
+    транзакция уже держит блокировку на запись, поэтому чтение и обновление строки рекордов
+    не пересекаются с завершением других матчей.
+
+    :param db: Сессия SQLAlchemy.
+    :param match: Завершенный матч.
+    :param commit: Зафиксировать транзакцию (при False — только flush, фиксирует вызывающий код).
+    """
+    if not _counts_for_records(match):
+        return
+
+    loser_id = match.player_2_id if match.winner_id == match.player_1_id else match.player_1_id
+    _apply_match(
+        get_or_create_game_records(db),
+        get_or_create_player_records(db, match.winner_id),
+        get_or_create_player_records(db, loser_id),
+        match.id,
+        (match.ended_at - match.started_at).total_seconds(),
+        match.ended_at,
+        match.player_1_id,
+        match.player_2_id,
+    )
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+
+def rebuild_game_records(db: Session) -> int:
+    """
+    Пересобирает рекорды с нуля по таблице matches (матчи проходятся по порядку завершения).
+    Используется для первоначального заполнения и восстановления после ручных правок в БД.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Количество учтенных матчей.
+    """
+    records = _new_game_records()
+    players: dict[int, PlayerRecords] = {}
+    applied = 0
+
+    matches = (
+        db.query(Match)
+        .filter(Match.result == 'normal', Match.winner_id.isnot(None),
+                Match.started_at.isnot(None), Match.ended_at.isnot(None))
+        .order_by(Match.ended_at.asc(), Match.id.asc())
+        .yield_per(REBUILD_BATCH)
+    )
+    for match in matches:
+        loser_id = match.player_2_id if match.winner_id == match.player_1_id else match.player_1_id
+        for player_id in (match.winner_id, loser_id):
+            if player_id not in players:
+                players[player_id] = _new_player_records(player_id)
+        _apply_match(records, players[match.winner_id], players[loser_id], match.id,
+                     (match.ended_at - match.started_at).total_seconds(), match.ended_at,
+                     match.player_1_id, match.player_2_id)
+        applied += 1
+
+    db.query(PlayerRecords).delete()
+    db.query(GameRecords).delete()
+    db.add(records)
+    db.add_all(players.values())
+    db.commit()
+    return applied
+
+
+def get_records_summary(db: Session) -> Tuple[Optional[Tuple], ...]:
+    """
+    Возвращает все рекорды для страницы рекордов: одна строка game_records и usernames держателей.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Кортеж (самая быстрая игра, стрик побед, стрик поражений, больше всего игр, больше всего времени).
+             Самая быстрая игра — (секунды, время окончания, username_1, username_2), остальные — (значение, username).
+             Отсутствующий рекорд — None.
+    """
+    records = db.get(GameRecords, GAME_RECORDS_ID)
+    if records is None:
+        return None, None, None, None, None
+
+    holder_ids = {
+        records.fastest_player_1_id, records.fastest_player_2_id, records.win_streak_player_id,
+        records.loss_streak_player_id, records.most_games_player_id, records.most_seconds_player_id,
+    } - {None}
+    usernames = dict(
+        db.query(Player.telegram_id, Player.username)
+        .filter(Player.telegram_id.in_([str(player_id) for player_id in holder_ids]))
+        .all()
+    )
+
+    def username(player_id: int) -> str:
+        return usernames.get(str(player_id)) or UNKNOWN_PLAYER
+
+    fastest_game = None
+    if records.fastest_seconds is not None:
+        fastest_game = (records.fastest_seconds, records.fastest_ended_at,
+                        username(records.fastest_player_1_id), username(records.fastest_player_2_id))
+
+    win_streak = (records.win_streak, username(records.win_streak_player_id)) if records.win_streak else None
+    loss_streak = (records.loss_streak, username(records.loss_streak_player_id)) if records.loss_streak else None
+    most_games = (records.most_games, username(records.most_games_player_id)) if records.most_games else None
+    most_time = None
+    if records.most_seconds:
+        most_time = (int(records.most_seconds // 60), username(records.most_seconds_player_id))
+
+    return fastest_game, win_streak, loss_streak, most_games, most_time
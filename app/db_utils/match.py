@@ -28,8 +28,21 @@ def create_match(db: Session, game_id: str, player_1_id: int, player_2_id: int)
     return match
 
 
+def delete_match(db: Session, game_id: str) -> bool:
+    """
+    Удаляет запись о матче (например, если игра исчезла, пока матч записывался в БД).
+
+    :param db: Сессия SQLAlchemy.
+    :param game_id: Уникальный идентификатор игры.
+    :return: True, если запись была удалена.
+    """
+    deleted = db.query(Match).filter(Match.game_id == game_id).delete()
+    db.commit()
+    return deleted > 0
+
+
 def update_match_result(db: Session, game_id: str, winner_id: int = None, result: str = None,
-                        ended_at: datetime = None) -> Type[Match] | None:
+                        ended_at: datetime = None, commit: bool = True) -> Type[Match] | None:
     """
     Обновляет информацию о завершившемся матче.
 
@@ -38,6 +51,8 @@ def update_match_result(db: Session, game_id: str, winner_id: int = None, result
     :param winner_id: ID победителя (если есть).
     :param result: Тип завершения матча (например, 'surrender', 'win').
     :param ended_at: Время окончания матча (по умолчанию текущее время).
+    :param commit: Зафиксировать транзакцию. При False изменения только отправляются в БД (flush),
+                   а фиксирует их вызывающий код.
     :return: Обновленный объект Match или None, если матч не найден.
     """
     match = db.query(Match).filter(Match.game_id == game_id).first()
@@ -48,7 +63,11 @@ def update_match_result(db: Session, game_id: str, winner_id: int = None, result
     if result:
         match.result = result
     match.ended_at = ended_at or datetime.now(MOSCOW_TZ)
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    # Перечитываем строку, чтобы даты были в том же виде, что хранит БД (SQLite возвращает их без зоны)
     db.refresh(match)
     return match
 
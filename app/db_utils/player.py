@@ -1,12 +1,10 @@
-from sqlalchemy import func
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.models.player import Player
-from app.models.player_stats import PlayerStats
-from app.models.match import Match
 from app.models.donor import Donor
-from app.db_utils.stats import get_stats, get_or_create_stats
+from app.db_utils.stats import get_stats, get_or_create_stats, get_rating_place
 from app.config import MOSCOW_TZ
 
 
@@ -17,6 +15,7 @@ def get_or_create_player(db: Session, telegram_id: str, username: str | None = N
     Если игрок найден:
       - обновляется время последнего появления (last_seen)
       - обновляется username, если он изменился
+      - игрок снова считается доступным для рассылок (unreachable_at сбрасывается)
 
     Если игрок не найден:
       - создается новый игрок с текущим временем регистрации и последнего появления
@@ -35,6 +34,9 @@ def get_or_create_player(db: Session, telegram_id: str, username: str | None = N
 
         if player.username != username:
             player.username = username
+
+        # Написал боту — значит, больше не заблокировал его
+        player.unreachable_at = None
     else:
         player = Player(
             telegram_id=telegram_id,
@@ -43,17 +45,40 @@ def get_or_create_player(db: Session, telegram_id: str, username: str | None = N
             last_seen=datetime.now(MOSCOW_TZ)
         )
         db.add(player)
-        db.commit()
-        db.refresh(player)
 
-        # Создаём статистику игроку сразу при регистрации
-        get_or_create_stats(db, player_id=int(player.telegram_id))
+        # Создаём статистику игроку сразу при регистрации, в той же транзакции
+        get_or_create_stats(db, player_id=int(player.telegram_id), commit=False)
 
     db.commit()
     db.refresh(player)
     return player
 
 
+def update_players_presence(db: Session, updates: list[dict]) -> int:
+    """
+    Записывает накопленные обновления last_seen и username одним пакетным UPDATE (executemany).
+    Вернувшийся игрок снова считается доступным для рассылок (unreachable_at сбрасывается).
+
+    :param db: Сессия SQLAlchemy.
+    :param updates: Словари с ключами telegram_id, username, last_seen.
+    :return: Количество переданных обновлений.
+    """
+    if not updates:
+        return 0
+    players = Player.__table__
+    statement = (
+        update(players)
+        .where(players.c.telegram_id == bindparam("b_telegram_id"))
+        .values(username=bindparam("b_username"), last_seen=bindparam("b_last_seen"), unreachable_at=None)
+    )
+    db.execute(statement, [
+        {"b_telegram_id": u["telegram_id"], "b_username": u["username"], "b_last_seen": u["last_seen"]}
+        for u in updates
+    ])
+    db.commit()
+    return len(updates)
+
+
 def get_player_by_telegram_id(db: Session, telegram_id: str) -> Player | None:
     """
     Получает игрока по его Telegram ID.
@@ -83,29 +108,11 @@ def get_extended_stats(db: Session, telegram_id: str) -> dict | None:
     donor = db.query(Donor).filter(Donor.player_id == player.telegram_id).first()
     is_donor = donor is not None and donor.is_donor
 
-    higher_count = (
-        db.query(func.count(PlayerStats.player_id))
-        .filter(PlayerStats.rating > stats.rating)
-        .scalar()
-    )
-    place = higher_count + 1
-    total_players = db.query(func.count(PlayerStats.player_id)).scalar()
-
-    matches = (
-        db.query(Match)
-        .filter((Match.player_1_id == player.telegram_id) | (Match.player_2_id == player.telegram_id))
-        .filter(Match.ended_at.isnot(None))
-        .all()
-    )
-
-    durations = [
-        (m.ended_at - m.started_at).total_seconds()
-        for m in matches
-        if m.started_at and m.ended_at
-    ]
+    place, total_players = get_rating_place(db, stats.rating)
 
-    total_time = sum(durations) if durations else 0
-    avg_time = total_time / len(durations) if durations else 0
+    # Итоги по завершенным матчам накапливаются в PlayerStats при завершении каждого матча
+    total_time = stats.play_seconds or 0
+    avg_time = total_time / stats.finished_matches if stats.finished_matches else 0
 
     return {
         "games_played": stats.games_played,
@@ -1,31 +1,60 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy import event, func, select, update
 
 from app.models.player_stats import PlayerStats
 from app.models.player import Player
 from app.models.donor import Donor
 from app.utils.rating import calculate_elo
+from app.utils.rating_index import rating_index
 from app.db_utils.donor import is_donor
+from app.db_utils.records import match_duration_seconds, match_participants
+from app.models.match import Match
 
+# Ключ в Session.info: рейтинги, которые попадут в rating_index после успешного commit
+_PENDING_RATINGS = "pending_ratings"
 
-def get_or_create_stats(db: Session, player_id: int) -> PlayerStats:
+
+def _set_rating_after_commit(db: Session, player_id: int, rating: int) -> None:
+    """Запоминает новый рейтинг игрока; в rating_index он попадет, только когда транзакция зафиксирована."""
+    db.info.setdefault(_PENDING_RATINGS, {})[player_id] = rating
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_ratings(session: Session) -> None:
+    for player_id, rating in session.info.pop(_PENDING_RATINGS, {}).items():
+        rating_index.set(player_id, rating)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending_ratings(session: Session, transaction: SessionTransaction) -> None:
+    # После отката (или закрытия сессии без commit) несохраненные рейтинги в индекс не попадают
+    if transaction.parent is None:
+        session.info.pop(_PENDING_RATINGS, None)
+
+
+def get_or_create_stats(db: Session, player_id: int, commit: bool = True) -> PlayerStats:
     """
     Получает статистику игрока по ID или создает новую запись, если она отсутствует.
 
     :param db: Сессия SQLAlchemy.
     :param player_id: ID игрока.
+    :param commit: Зафиксировать транзакцию после создания записи (при False — только flush).
     :return: Объект PlayerStats.
     """
     stats = db.query(PlayerStats).filter_by(player_id=player_id).first()
     if not stats:
         stats = PlayerStats(player_id=player_id)
         db.add(stats)
-        db.commit()
-        db.refresh(stats)
+        db.flush()
+        _set_rating_after_commit(db, player_id, stats.rating)
+        if commit:
+            db.commit()
+            db.refresh(stats)
     return stats
 
 
-def update_stats_after_match(db: Session, winner_id: int, loser_id: int) -> None:
+def update_stats_after_match(db: Session, winner_id: int, loser_id: int, commit: bool = True,
+                             match_seconds: float = 0.0) -> None:
     """
     Обновляет статистику игроков после завершения матча.
 
@@ -33,14 +62,18 @@ def update_stats_after_match(db: Session, winner_id: int, loser_id: int) -> None
       - увеличивается счетчик игр и побед.
     У проигравшего:
       - увеличивается счетчик игр и поражений.
-    Также пересчитывается рейтинг Elo с учетом статуса донора.
+    У обоих растут итоги завершенных матчей: их количество и суммарное время.
+    Также пересчитывается рейтинг Elo с учетом статуса донора; новые рейтинги попадают в rating_index
+    после фиксации транзакции (при откате индекс не меняется).
 
     :param db: Сессия SQLAlchemy.
     :param winner_id: ID победителя.
     :param loser_id: ID проигравшего.
+    :param commit: Зафиксировать транзакцию (при False — только flush, фиксирует вызывающий код).
+    :param match_seconds: Длительность матча в секундах.
     """
-    winner_stats = get_or_create_stats(db, winner_id)
-    loser_stats = get_or_create_stats(db, loser_id)
+    winner_stats = get_or_create_stats(db, winner_id, commit=commit)
+    loser_stats = get_or_create_stats(db, loser_id, commit=commit)
 
     winner_stats.games_played += 1
     winner_stats.wins += 1
@@ -48,6 +81,10 @@ def update_stats_after_match(db: Session, winner_id: int, loser_id: int) -> None
     loser_stats.games_played += 1
     loser_stats.losses += 1
 
+    for stats in (winner_stats, loser_stats):
+        stats.finished_matches = (stats.finished_matches or 0) + 1
+        stats.play_seconds = (stats.play_seconds or 0) + match_seconds
+
     # Проверяем, является ли победитель донором
     winner_is_donor = is_donor(db, winner_id)
 
@@ -56,8 +93,13 @@ def update_stats_after_match(db: Session, winner_id: int, loser_id: int) -> None
         loser_rating=loser_stats.rating,
         winner_is_donor=winner_is_donor
     )
+    _set_rating_after_commit(db, winner_id, winner_stats.rating)
+    _set_rating_after_commit(db, loser_id, loser_stats.rating)
 
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
 
 
 def get_stats(db: Session, player_id: int) -> PlayerStats | None:
@@ -71,11 +113,119 @@ def get_stats(db: Session, player_id: int) -> PlayerStats | None:
     return db.query(PlayerStats).filter_by(player_id=player_id).first()
 
 
+def backfill_match_totals(db: Session) -> int:
+    """
+    Пересчитывает finished_matches и play_seconds всех игроков по таблице matches
+    (учитываются все завершенные матчи, как раньше в профиле).
+
+    :param db: Сессия SQLAlchemy.
+    :return: Количество игроков, у которых есть завершенные матчи.
+    """
+    games = match_participants(
+        match_duration_seconds(db).label("seconds"),
+        condition=Match.ended_at.isnot(None) & Match.started_at.isnot(None),
+    )
+    totals = db.execute(
+        select(games.c.player_id, func.count().label("matches"), func.sum(games.c.seconds).label("seconds"))
+        .group_by(games.c.player_id)
+    ).all()
+    known = {player_id for player_id, in db.query(PlayerStats.player_id)}
+
+    db.query(PlayerStats).update({PlayerStats.finished_matches: 0, PlayerStats.play_seconds: 0})
+    rows = [
+        {"player_id": player_id, "finished_matches": matches, "play_seconds": seconds or 0}
+        for player_id, matches, seconds in totals
+        if player_id in known
+    ]
+    if rows:
+        db.execute(update(PlayerStats), rows)
+    db.commit()
+    return len(rows)
+
+
+def warm_rating_index(db: Session) -> int:
+    """
+    Загружает рейтинги всех игроков в rating_index. Пока загрузка не завершена,
+    таблица лидеров и место в рейтинге считаются через SQL.
+
+    :param db: Сессия SQLAlchemy.
+    :return: Количество загруженных игроков.
+    """
+    rating_index.begin_load()
+    rows = db.query(PlayerStats.player_id, PlayerStats.rating).all()
+    rating_index.load((player_id, rating) for player_id, rating in rows)
+    return len(rows)
+
+
+def get_rating_place(db: Session, rating: int) -> tuple[int, int]:
+    """
+    Возвращает место для рейтинга (1 + число игроков с большим рейтингом) и общее число игроков.
+    Берет данные из rating_index, пока он не загружен — из БД.
+
+    :param db: Сессия SQLAlchemy.
+    :param rating: Рейтинг игрока.
+    :return: (место, общее количество игроков)
+    """
+    if rating_index.ready:
+        return rating_index.place(rating), len(rating_index)
+
+    higher_count = db.query(func.count(PlayerStats.player_id)).filter(PlayerStats.rating > rating).scalar()
+    total_players = db.query(func.count(PlayerStats.player_id)).scalar()
+    return higher_count + 1, total_players
+
+
+def _leaderboard_rows(db: Session, entries: list[tuple[int, int]]) -> list[tuple]:
+    """
+    Дополняет пары (player_id, rating) из rating_index username и статусом донора одним запросом.
+    Возвращает строки в том же виде, что и SQL-вариант: (username, rating, player_id, is_donor).
+    """
+    if not entries:
+        return []
+    ids = [player_id for player_id, _ in entries]
+    info = {
+        int(telegram_id): (username, is_donor)
+        for telegram_id, username, is_donor in (
+            db.query(Player.telegram_id, Player.username, Donor.is_donor)
+            .outerjoin(Donor, Donor.player_id == Player.telegram_id)
+            .filter(Player.telegram_id.in_([str(player_id) for player_id in ids]))
+            .all()
+        )
+    }
+    return [
+        (info[player_id][0], rating, player_id, info[player_id][1])
+        for player_id, rating in entries
+        if player_id in info
+    ]
+
+
+def _get_top_and_bottom_from_index(db: Session, top_limit: int, bottom_limit: int, current_user_id: str = None):
+    """Вариант get_top_and_bottom_players поверх rating_index."""
+    top_players = _leaderboard_rows(db, rating_index.top(top_limit))
+    bottom_players = _leaderboard_rows(db, rating_index.bottom(bottom_limit))
+    total_players = len(rating_index)
+
+    current_user_position = None
+    if current_user_id:
+        user_id = int(current_user_id)
+        listed = {player_id for _, _, player_id, _ in top_players + bottom_players}
+        placed = rating_index.player_place(user_id)
+        if user_id not in listed and placed:
+            rating, position = placed
+            rows = _leaderboard_rows(db, [(user_id, rating)])
+            if rows:
+                username, _, _, is_donor = rows[0]
+                current_user_position = (username, rating, position, is_donor)
+
+    return top_players, list(reversed(bottom_players)), total_players, current_user_position
+
+
 def get_top_and_bottom_players(db: Session, top_limit: int = 10, bottom_limit: int = 3, current_user_id: str = None):
     """
     Возвращает топ лучших и худших игроков по рейтингу, а также общее количество игроков.
     Если указан current_user_id и пользователь не входит в топ, возвращает его позицию.
     Включает информацию о статусе донора.
+    Если rating_index загружен, порядок игроков и позиция берутся из него, а из БД читаются только
+    username и статус донора показанных игроков.
 
     :param db: Сессия SQLAlchemy.
     :param top_limit: Количество лучших игроков (по умолчанию 10).
@@ -83,6 +233,9 @@ def get_top_and_bottom_players(db: Session, top_limit: int = 10, bottom_limit: i
     :param current_user_id: ID текущего пользователя для проверки его позиции.
     :return: (топ-игроки, худшие игроки, общее количество игроков, позиция текущего пользователя)
     """
+    if rating_index.ready:
+        return _get_top_and_bottom_from_index(db, top_limit, bottom_limit, current_user_id)
+
     # Получаем топ игроков с информацией о донорах
     top_players = (
         db.query(Player.username, PlayerStats.rating, PlayerStats.player_id, Donor.is_donor)
@@ -1,9 +1,18 @@
-from typing import Generator
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Generator, TypeVar
 from contextlib import contextmanager
 from sqlalchemy.orm import Session
 
+from app.config import DB_EXECUTOR_WORKERS
 from app.database import SessionLocal
 
+T = TypeVar("T")
+
+# Ограниченный пул потоков для синхронных запросов SQLAlchemy, чтобы они не блокировали event loop
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -31,3 +40,29 @@ def db_session() -> Generator[Session, None, None]:
         yield db
     finally:
         db_gen.close()
+
+
+def _run_in_session(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    with db_session() as db:
+        return func(db, *args, **kwargs)
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Выполняет func(db, *args, **kwargs) в отдельной сессии в пуле потоков БД и возвращает результат.
+    Используется в обработчиках вместо блокирующего with db_session():
+        player = await run_db(get_player_by_telegram_id, telegram_id)
+
+    Сессия закрывается сразу после вызова, поэтому func должна возвращать обычные данные,
+    а не ORM-объекты, к ленивым атрибутам которых обратятся позже.
+
+    :param func: Синхронная функция, первым аргументом принимающая сессию.
+    :return: Результат func.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(_run_in_session, func, *args, **kwargs))
+
+
+def shutdown_db_executor() -> None:
+    """Дожидается завершения запросов в пуле потоков БД и останавливает его."""
+    db_executor.shutdown(wait=True)
@@ -1,5 +1,6 @@
 import random
-from typing import List, Tuple, Optional, Set
+from enum import IntEnum
+from typing import Callable, List, Optional, Tuple, TypeVar
 
 # Задаем размер игрового поля
 BOARD_SIZE = 10
@@ -8,40 +9,251 @@ DIRECTIONS_8 = [(-1, -1), (-1, 0), (-1, 1),  # Верхняя строка
                 (0, -1), (0, 1),  # Левая и правая ячейки
                 (1, -1), (1, 0), (1, 1)]  # Нижняя строка
 
-Board = List[List[str]]
+# Эмодзи клеток для отображения поля
+EMPTY_CELL = "⬜"
+SHIP_CELL = "🚢"
+HIT_CELL = "💥"
+MISS_CELL = "❌"
+
+# Подписи строк и столбцов поля
+BOARD_LETTERS = "ABCDEFGHIJ"
+BOARD_HEADER = "  1️⃣ 2️⃣ 3️⃣ 4️⃣ 5️⃣ 6️⃣ 7️⃣ 8️⃣ 9️⃣ 🔟"
+
+# Битовые маски поля: клетка (x, y) соответствует биту x * BOARD_SIZE + y
+FULL_MASK = (1 << (BOARD_SIZE * BOARD_SIZE)) - 1
+CELL_MASKS = [1 << i for i in range(BOARD_SIZE * BOARD_SIZE)]
+FIRST_COLUMN_MASK = sum(CELL_MASKS[x * BOARD_SIZE] for x in range(BOARD_SIZE))
+LAST_COLUMN_MASK = sum(CELL_MASKS[x * BOARD_SIZE + BOARD_SIZE - 1] for x in range(BOARD_SIZE))
+
+# Маска одной строки поля (младшие BOARD_SIZE бит)
+ROW_MASK = (1 << BOARD_SIZE) - 1
+
+# Для каждой клетки — маска её соседей (включая диагонали), без самой клетки
+NEIGHBOURS_MASKS = [
+    sum(
+        CELL_MASKS[(x + dx) * BOARD_SIZE + y + dy]
+        for dx, dy in DIRECTIONS_8
+        if 0 <= x + dx < BOARD_SIZE and 0 <= y + dy < BOARD_SIZE
+    )
+    for x in range(BOARD_SIZE)
+    for y in range(BOARD_SIZE)
+]
+
+# Размеры кораблей флота (в порядке расстановки — от крупных к мелким)
+FLEET_SIZES = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+# Значение в Board.cell_ship для клетки без корабля
+NO_SHIP = 255
+
+
+class ShotResult(IntEnum):
+    """Результат выстрела. MISS равен 0, поэтому любое попадание истинно в булевом контексте."""
+    MISS = 0
+    HIT = 1
+    SUNK = 2
+    VICTORY = 3
+
+
+class Board:
+    """
+    Игровое поле в виде битовых масок (по биту на клетку):
+    - ships — клетки кораблей;
+    - hits — подбитые клетки кораблей;
+    - misses — промахи;
+    - revealed — клетки, открытые вокруг уничтоженных кораблей.
+
+    Реестр флота:
+    - ship_masks — маска клеток каждого корабля;
+    - ship_health — сколько неподбитых клеток осталось у каждого корабля;
+    - cell_ship — номер корабля для каждой клетки (NO_SHIP, если клетка пустая);
+    - ships_alive — сколько кораблей ещё не потоплено.
+
+    render_cache — кэш отрисованных строк поля (см. cached_rows).
+    """
+    __slots__ = ("ships", "hits", "misses", "revealed", "ship_masks", "ship_health", "cell_ship", "ships_alive",
+                 "render_cache")
+
+    def __init__(self) -> None:
+        self.ships: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revealed: int = 0
+        self.ship_masks: List[int] = []
+        self.ship_health: List[int] = []
+        self.cell_ship: bytearray = bytearray([NO_SHIP]) * (BOARD_SIZE * BOARD_SIZE)
+        self.ships_alive: int = 0
+        self.render_cache: dict = {}
+
+    @property
+    def opened(self) -> int:
+        """Маска клеток, по которым уже стреляли или которые открыты вокруг потопленных кораблей."""
+        return self.hits | self.misses | self.revealed
+
+    def __repr__(self) -> str:
+        return f"<Board ships={bin(self.ships).count('1')} hits={bin(self.hits).count('1')}>"
+
+
+def _cell_mask(x: int, y: int) -> int:
+    return CELL_MASKS[x * BOARD_SIZE + y]
+
+
+def _expand_all(mask: int) -> int:
+    """Расширяет маску на все соседние клетки, включая диагонали."""
+    horizontal = (mask | ((mask << 1) & ~FIRST_COLUMN_MASK) | ((mask >> 1) & ~LAST_COLUMN_MASK)) & FULL_MASK
+    return (horizontal | (horizontal << BOARD_SIZE) | (horizontal >> BOARD_SIZE)) & FULL_MASK
+
+
+def _placement_masks(size: int) -> List[Tuple[int, int]]:
+    """
+    Возвращает все размещения корабля заданного размера в виде пар (маска корабля, маска корабля с соседями).
+    """
+    placements = []
+    for x in range(BOARD_SIZE):
+        for y in range(BOARD_SIZE):
+            if y + size <= BOARD_SIZE:
+                placements.append(sum(CELL_MASKS[x * BOARD_SIZE + y + i] for i in range(size)))
+            if size > 1 and x + size <= BOARD_SIZE:
+                placements.append(sum(CELL_MASKS[(x + i) * BOARD_SIZE + y] for i in range(size)))
+    return [(ship, _expand_all(ship)) for ship in placements]
+
+
+# Все допустимые размещения для каждого размера корабля считаются один раз при импорте
+PLACEMENTS = {size: _placement_masks(size) for size in set(FLEET_SIZES)}
+
+# Сколько случайных проб делать для корабля, прежде чем перебирать все совместимые размещения
+PLACEMENT_PROBES = 32
+
+
+def _iter_cells(mask: int) -> List[Tuple[int, int]]:
+    """Возвращает координаты всех клеток, отмеченных в маске."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append(divmod(index, BOARD_SIZE))
+        mask ^= low
+    return cells
 
 
 def create_empty_board() -> Board:
     """
     Создает пустое игровое поле размером BOARD_SIZE x BOARD_SIZE.
     """
-    return [["⬜" for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    return Board()
+
+
+def cell_emoji(board: Board, x: int, y: int, hide_ships: bool = False) -> str:
+    """
+    Возвращает эмодзи клетки поля — адаптер битового поля к отображению.
+
+    :param board: Игровое поле.
+    :param x: Координата X.
+    :param y: Координата Y.
+    :param hide_ships: Если True, скрывает неподбитые корабли.
+    """
+    bit = _cell_mask(x, y)
+    if board.hits & bit:
+        return HIT_CELL
+    if (board.misses | board.revealed) & bit:
+        return MISS_CELL
+    if board.ships & bit and not hide_ships:
+        return SHIP_CELL
+    return EMPTY_CELL
+
+
+def board_row(board: Board, x: int, hide_ships: bool = False) -> List[str]:
+    """
+    Возвращает одну строку поля в виде эмодзи.
+
+    :param board: Игровое поле.
+    :param x: Номер строки.
+    :param hide_ships: Если True, скрывает неподбитые корабли.
+    """
+    return [cell_emoji(board, x, y, hide_ships) for y in range(BOARD_SIZE)]
+
+
+def board_rows(board: Board, hide_ships: bool = False) -> List[List[str]]:
+    """
+    Возвращает поле в виде строк эмодзи (для текста сообщения и клавиатур).
+
+    :param board: Игровое поле.
+    :param hide_ships: Если True, скрывает неподбитые корабли.
+    """
+    return [board_row(board, x, hide_ships) for x in range(BOARD_SIZE)]
+
+
+RowT = TypeVar("RowT")
+
+
+def cached_rows(board: Board, name: str, hide_ships: bool, build_row: Callable[[int], RowT]) -> List[RowT]:
+    """
+    Возвращает отрисованные строки поля, перестраивая только те, что изменились с прошлого вызова.
+    Состояние строки определяется её битами в масках поля, поэтому после выстрела заново строится
+    одна строка (или несколько — если открылись клетки вокруг потопленного корабля).
+
+    :param board: Игровое поле.
+    :param name: Имя кэша (у каждого вида отрисовки — свой).
+    :param hide_ships: Если True, неподбитые корабли не влияют на строку.
+    :param build_row: Функция, строящая строку по её номеру.
+    :return: Список из BOARD_SIZE отрисованных строк.
+    """
+    cache = board.render_cache.get(name)
+    if cache is None:
+        cache = board.render_cache[name] = [None] * BOARD_SIZE
+
+    hits = board.hits
+    shown_misses = board.misses | board.revealed
+    ships = 0 if hide_ships else board.ships
+    rows = []
+    for x in range(BOARD_SIZE):
+        shift = x * BOARD_SIZE
+        key = ((hits >> shift) & ROW_MASK
+               | ((shown_misses >> shift) & ROW_MASK) << BOARD_SIZE
+               | ((ships >> shift) & ROW_MASK) << 2 * BOARD_SIZE)
+        entry = cache[x]
+        if entry is None or entry[0] != key:
+            entry = cache[x] = (key, build_row(x))
+        rows.append(entry[1])
+    return rows
+
+
+def ship_cells(board: Board) -> List[Tuple[int, int]]:
+    """
+    Возвращает координаты всех клеток кораблей на поле.
+
+    :param board: Игровое поле.
+    """
+    return _iter_cells(board.ships)
+
+
+def is_cell_opened(board: Board, x: int, y: int) -> bool:
+    """
+    Проверяет, стреляли ли уже по клетке (или она открыта вокруг потопленного корабля).
+
+    :param board: Игровое поле.
+    :param x: Координата X.
+    :param y: Координата Y.
+    """
+    return bool(board.opened & _cell_mask(x, y))
 
 
 def print_board(board: Board, hide_ships: bool = False) -> str:
     """
     Возвращает строку для отображения игрового поля.
+    Строки поля берутся из кэша доски и перестраиваются только при изменении.
 
     :param board: Игровое поле.
     :param hide_ships: Если True, скрывает корабли на поле.
     """
-    letters = "ABCDEFGHIJ"
-    header = "  1️⃣ 2️⃣ 3️⃣ 4️⃣ 5️⃣ 6️⃣ 7️⃣ 8️⃣ 9️⃣ 🔟"
-    rows = []
-
-    for i, row in enumerate(board):
-        line = []
-        for cell in row:
-            if hide_ships and cell == "🚢":
-                line.append("⬜")
-            elif cell in {"🚢", "❌", "💥"}:
-                line.append(cell)
-            else:
-                line.append("⬜")
-        rows.append(f"{letters[i]} " + " ".join(line))
+    rows = cached_rows(
+        board,
+        "text_hidden" if hide_ships else "text",
+        hide_ships,
+        lambda x: f"{BOARD_LETTERS[x]} " + " ".join(board_row(board, x, hide_ships)),
+    )
 
     # Оборачиваем в моноширный текст, чтобы всё было ровно
-    return "<code>\n" + header + "\n" + "\n".join(rows) + "\n</code>"
+    return "<code>\n" + BOARD_HEADER + "\n" + "\n".join(rows) + "\n</code>"
 
 
 def place_ship(board: Board, x: int, y: int, size: int, orientation: str) -> bool:
@@ -58,40 +270,86 @@ def place_ship(board: Board, x: int, y: int, size: int, orientation: str) -> boo
     if orientation == "horizontal":
         if y + size > BOARD_SIZE:
             return False
-        # Проверяем каждую клетку на наличие соседних кораблей
-        for i in range(size):
-            if board[x][y + i] != "⬜" or not is_valid_position(board, x, y + i):
-                return False
-        # Размещаем корабль
-        for i in range(size):
-            board[x][y + i] = "🚢"
+        ship = sum(_cell_mask(x, y + i) for i in range(size))
     else:
         if x + size > BOARD_SIZE:
             return False
-        # Проверяем каждую клетку на наличие соседних кораблей
-        for i in range(size):
-            if board[x + i][y] != "⬜" or not is_valid_position(board, x + i, y):
-                return False
-        # Размещаем корабль
-        for i in range(size):
-            board[x + i][y] = "🚢"
+        ship = sum(_cell_mask(x + i, y) for i in range(size))
+
+    # Корабль не может занимать и касаться (включая диагонали) клеток других кораблей
+    if _expand_all(ship) & board.ships:
+        return False
+    _register_ship(board, ship, size)
     return True
 
 
+def _register_ship(board: Board, ship: int, size: int) -> None:
+    """
+    Добавляет корабль на поле и в реестр флота.
+
+    :param board: Игровое поле.
+    :param ship: Маска клеток корабля.
+    :param size: Размер корабля.
+    """
+    index = len(board.ship_masks)
+    board.ships |= ship
+    board.ship_masks.append(ship)
+    board.ship_health.append(size)
+    board.ships_alive += 1
+    while ship:
+        low = ship & -ship
+        board.cell_ship[low.bit_length() - 1] = index
+        ship ^= low
+
+
 def place_all_ships(board: Board) -> None:
     """
     Размещает все корабли на поле по заданным размерам.
+    Каждый корабль выбирается случайно из заранее посчитанных размещений, совместимых с уже поставленными;
+    если для очередного корабля места не осталось — откатываемся к предыдущему (бэктрекинг).
 
     :param board: Игровое поле.
     """
-    ship_sizes = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
-    for size in ship_sizes:
-        placed = False
-        while not placed:
-            x = random.randint(0, BOARD_SIZE - 1)
-            y = random.randint(0, BOARD_SIZE - 1)
-            orientation = random.choice(["horizontal", "vertical"])
-            placed = place_ship(board, x, y, size, orientation)
+    fleet: List[int] = []
+    if not _sample_fleet(FLEET_SIZES, 0, _expand_all(board.ships), fleet):
+        raise RuntimeError("Не удалось расставить флот")
+    for ship, size in zip(fleet, FLEET_SIZES):
+        _register_ship(board, ship, size)
+
+
+def _sample_fleet(sizes: Tuple[int, ...], index: int, blocked: int, fleet: List[int]) -> bool:
+    """
+    Рекурсивно подбирает маски кораблей sizes[index:], не пересекающиеся с blocked.
+    Сначала делает несколько случайных проб по таблице размещений (обычно этого хватает),
+    и только если они не помогли — перебирает все совместимые размещения в случайном порядке.
+
+    :param sizes: Размеры кораблей флота.
+    :param index: Номер текущего корабля.
+    :param blocked: Маска занятых клеток и их соседей.
+    :param fleet: Список, в который складываются маски выбранных кораблей.
+    :return: True, если флот удалось расставить.
+    """
+    if index == len(sizes):
+        return True
+    placements = PLACEMENTS[sizes[index]]
+
+    for _ in range(PLACEMENT_PROBES):
+        ship, halo = random.choice(placements)
+        if not ship & blocked:
+            fleet.append(ship)
+            if _sample_fleet(sizes, index + 1, blocked | halo, fleet):
+                return True
+            fleet.pop()
+            break
+
+    candidates = [placement for placement in placements if not placement[0] & blocked]
+    random.shuffle(candidates)
+    for ship, halo in candidates:
+        fleet.append(ship)
+        if _sample_fleet(sizes, index + 1, blocked | halo, fleet):
+            return True
+        fleet.pop()
+    return False
 
 
 def is_valid_position(board: Board, x: int, y: int) -> bool:
@@ -103,12 +361,7 @@ def is_valid_position(board: Board, x: int, y: int) -> bool:
     :param y: Координата Y.
     :return: True, если положение валидно; иначе False.
     """
-    for dx, dy in DIRECTIONS_8:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
-            if board[nx][ny] == "🚢":
-                return False
-    return True
+    return not NEIGHBOURS_MASKS[x * BOARD_SIZE + y] & board.ships
 
 
 def mark_surrounding(board: Board, x: int, y: int) -> None:
@@ -119,77 +372,67 @@ def mark_surrounding(board: Board, x: int, y: int) -> None:
     :param x: Координата X.
     :param y: Координата Y.
     """
-    for dx, dy in DIRECTIONS_8:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE and board[nx][ny] == "⬜":
-            board[nx][ny] = "❌"
+    board.revealed |= NEIGHBOURS_MASKS[x * BOARD_SIZE + y] & ~(board.ships | board.opened)
 
 
-def is_ship_destroyed(board: Board, x: int, y: int, visited: Optional[Set[Tuple[int, int]]] = None) -> Tuple[
-    bool, List[Tuple[int, int]]]:
+def is_ship_destroyed(board: Board, x: int, y: int) -> Tuple[bool, List[Tuple[int, int]]]:
     """
-    Проверяет, уничтожен ли корабль, начиная с клетки (x, y).
+    Проверяет, уничтожен ли корабль, которому принадлежит клетка (x, y).
 
     :param board: Игровое поле.
     :param x: Координата X.
     :param y: Координата Y.
-    :param visited: Множество уже проверенных клеток.
-    :return: Кортеж (уничтожен ли, список координат всех поврежденных клеток корабля).
+    :return: Кортеж (уничтожен ли, список координат клеток корабля).
     """
-    if visited is None:
-        visited = set()
-    if (x, y) in visited or board[x][y] != "💥":
-        return True, []  # Если клетка не повреждена или уже проверена
-
-    visited.add((x, y))
-    ship_cells = [(x, y)]
-    destroyed = True
-
-    # Проверяем все соседние клетки (вверх, вниз, влево, вправо)
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
-            if board[nx][ny] == "🚢":
-                return False, []  # Корабль не уничтожен
-            if board[nx][ny] == "💥" and (nx, ny) not in visited:
-                sub_destroyed, sub_cells = is_ship_destroyed(board, nx, ny, visited)
-                destroyed = destroyed and sub_destroyed
-                ship_cells.extend(sub_cells)
-
-    return destroyed, ship_cells
+    index = board.cell_ship[x * BOARD_SIZE + y]
+    if index == NO_SHIP or board.ship_health[index]:
+        return False, []
+    return True, _iter_cells(board.ship_masks[index])
 
 
-def handle_ship_destruction(board: Board, x: int, y: int) -> None:
+def handle_ship_destruction(board: Board, x: int, y: int) -> bool:
     """
-    Проверяет и обрабатывает полное уничтожение корабля.
+    Проверяет и обрабатывает полное уничтожение корабля: закрашивает клетки вокруг него.
 
     :param board: Игровое поле.
     :param x: Координата попадания X.
     :param y: Координата попадания Y.
+    :return: True, если корабль уничтожен.
     """
-    destroyed, ship_cells = is_ship_destroyed(board, x, y)
-    if destroyed:
-        for sx, sy in ship_cells:
-            mark_surrounding(board, sx, sy)
+    index = board.cell_ship[x * BOARD_SIZE + y]
+    if index == NO_SHIP or board.ship_health[index]:
+        return False
+    board.revealed |= _expand_all(board.ship_masks[index]) & ~(board.ships | board.opened)
+    return True
 
 
-def process_shot(board: Board, x: int, y: int) -> Optional[bool]:
+def process_shot(board: Board, x: int, y: int) -> Optional[ShotResult]:
     """
     Обрабатывает выстрел по координатам.
 
     :param board: Игровое поле.
     :param x: Координата X.
     :param y: Координата Y.
-    :return: True — попадание, False — промах, None — недопустимый ход.
+    :return: MISS, HIT, SUNK или VICTORY; None — недопустимый ход.
     """
-    if board[x][y] == "🚢":
-        board[x][y] = "💥"
-        handle_ship_destruction(board, x, y)  # Проверка и закрашивание
-        return True
-    elif board[x][y] == "⬜":
-        board[x][y] = "❌"
-        return False
-    return None
+    cell = x * BOARD_SIZE + y
+    bit = CELL_MASKS[cell]
+    if board.opened & bit:
+        return None
+    if not board.ships & bit:
+        board.misses |= bit
+        return ShotResult.MISS
+
+    board.hits |= bit
+    index = board.cell_ship[cell]
+    board.ship_health[index] -= 1
+    if board.ship_health[index]:
+        return ShotResult.HIT
+
+    # Корабль потоплен — закрашиваем клетки вокруг него
+    board.ships_alive -= 1
+    board.revealed |= _expand_all(board.ship_masks[index]) & ~(board.ships | board.opened)
+    return ShotResult.VICTORY if board.ships_alive == 0 else ShotResult.SUNK
 
 
 def check_victory(board: Board) -> bool:
@@ -199,7 +442,4 @@ def check_victory(board: Board) -> bool:
     :param board: Игровое поле.
     :return: True, если победа (кораблей не осталось); иначе False.
     """
-    for row in board:
-        if "🚢" in row:
-            return False
-    return True
+    return board.ships_alive == 0
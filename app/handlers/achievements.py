@@ -1,7 +1,8 @@
 from aiogram import Dispatcher
 from aiogram.types import CallbackQuery
+from sqlalchemy.orm import Session
 
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.db_utils.player import get_player_by_telegram_id
 from app.services.achievements_service import get_player_achievements
 from app.keyboards import achievements_menu
@@ -40,6 +41,22 @@ def _format_achievements(items: list[dict]) -> str:
     return "\n".join(lines)
 
 
+def _load_achievements(db: Session, telegram_id: int) -> list[dict] | None:
+    """
+    Загружает ачивки игрока (вызывается через run_db в пуле потоков БД).
+
+    Args:
+        db (Session): Сессия базы данных.
+        telegram_id (int): Telegram ID игрока.
+
+    Returns:
+        list[dict] | None: Список ачивок или None, если игрок не зарегистрирован.
+    """
+    if not get_player_by_telegram_id(db, str(telegram_id)):
+        return None
+    return get_player_achievements(db, telegram_id)
+
+
 async def achievements_menu_callback(callback: CallbackQuery) -> None:
     """
     Хендлер для показа меню ачивок игрока.
@@ -58,12 +75,10 @@ async def achievements_menu_callback(callback: CallbackQuery) -> None:
     except Exception:
         pass
 
-    with db_session() as db:
-        player = get_player_by_telegram_id(db, str(callback.from_user.id))
-        if not player:
-            await callback.message.edit_text(NOT_REGISTERED_MESSAGE, reply_markup=achievements_menu())
-            return
-        items = get_player_achievements(db, callback.from_user.id)
+    items = await run_db(_load_achievements, callback.from_user.id)
+    if items is None:
+        await callback.message.edit_text(NOT_REGISTERED_MESSAGE, reply_markup=achievements_menu())
+        return
 
     text = _format_achievements(items)
     await callback.message.edit_text(text, parse_mode="HTML", reply_markup=achievements_menu())
@@ -4,8 +4,7 @@ from aiogram.filters import Command
 
 from app.keyboards import main_menu, back_to_main_menu
 from app.logger import setup_logger
-from app.services.player_service import register_or_update_player
-from app.dependencies import db_session
+from app.services.player_service import touch_player
 from app.messages.texts import START_MESSAGE, GAME_RULES
 from app.config import ADMIN_ID
 
@@ -22,8 +21,7 @@ async def start_command(message: Message) -> None:
     """
     logger.info(f"👋 Игрок @{message.from_user.username} запустил бота!")
 
-    with db_session() as db:
-        register_or_update_player(db, telegram_id=str(message.from_user.id), username=message.from_user.username)
+    await touch_player(str(message.from_user.id), message.from_user.username)
 
     is_admin = str(message.from_user.id) == ADMIN_ID
 
@@ -61,8 +59,7 @@ async def main_menu_callback(callback: CallbackQuery) -> None:
     except Exception:
         pass
 
-    with db_session() as db:
-        register_or_update_player(db, telegram_id=str(callback.from_user.id), username=callback.from_user.username)
+    await touch_player(str(callback.from_user.id), callback.from_user.username)
 
     is_admin = str(callback.from_user.id) == ADMIN_ID
 
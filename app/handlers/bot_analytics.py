@@ -1,7 +1,8 @@
 from aiogram import Dispatcher
 from aiogram.types import CallbackQuery
+from sqlalchemy.orm import Session
 
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.db_utils.player import get_player_by_telegram_id
 from app.db_utils.bot_stats import get_aggregated_bot_stats
 from app.keyboards import bot_analytic_menu
@@ -11,6 +12,22 @@ from app.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def _load_bot_stats(db: Session, telegram_id: int) -> dict | None:
+    """
+    Загружает агрегированную статистику игр игрока против бота (вызывается через run_db в пуле потоков БД).
+
+    Args:
+        db (Session): Сессия базы данных.
+        telegram_id (int): Telegram ID игрока.
+
+    Returns:
+        dict | None: Статистика или None, если игрок не зарегистрирован.
+    """
+    if not get_player_by_telegram_id(db, str(telegram_id)):
+        return None
+    return get_aggregated_bot_stats(db, telegram_id)
+
+
 async def bot_analytics_callback(callback: CallbackQuery) -> None:
     """
     Обрабатывает нажатие на кнопку "Статистика бота" и отправляет игроку
@@ -34,14 +51,7 @@ async def bot_analytics_callback(callback: CallbackQuery) -> None:
     except Exception:
         pass
 
-    with db_session() as db:
-        player = get_player_by_telegram_id(db, str(callback.from_user.id))
-        if not player:
-            await callback.message.edit_text(NO_BOT_ANALYTICS, reply_markup=bot_analytic_menu())
-            return
-
-        data = get_aggregated_bot_stats(db, callback.from_user.id)
-
+    data = await run_db(_load_bot_stats, callback.from_user.id)
     if not data or data.get("total_games", 0) == 0:
         await callback.message.edit_text(NO_BOT_ANALYTICS, reply_markup=bot_analytic_menu())
         return
@@ -3,10 +3,11 @@ from aiogram.types import CallbackQuery
 
 from app.keyboards import bot_difficulty_menu, playing_menu, main_menu
 from app.logger import setup_logger
-from app.state.in_memory import games
+from app.state.in_memory import games, open_lobbies
+from app.storage import delete_game, get_player_game_id
 from app.services.bot_game_service import start_bot_game
 from app.messages.texts import YOUR_BOARD_TEXT, START_BOT_GAME, STARTING_GAME_ERROR, INVALID_DIFFICULT_MODE
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.db_utils.donor import is_donor
 
 logger = setup_logger(__name__)
@@ -29,8 +30,7 @@ async def play_vs_bot_menu_callback(callback: CallbackQuery) -> None:
         pass
 
     # Проверяем статус донора
-    with db_session() as db:
-        donor_status = is_donor(db, callback.from_user.id)
+    donor_status = await run_db(is_donor, callback.from_user.id)
     
     # Выбираем соответствующую клавиатуру
     keyboard = bot_difficulty_menu(is_donor=donor_status)
@@ -72,18 +72,17 @@ async def start_bot_game_callback(callback: CallbackQuery) -> None:
         return
 
     # Блокируем запуск новой игры, если пользователь уже участвует в какой-либо игре
-    for gid, g in games.items():
-        if user_id == g.get("player1") or user_id == g.get("player2"):
-            # если это игра с ботом или активная PvP (оба игрока есть) — запрещаем запуск
-            if g.get("is_bot_game") or (g.get("player1") and g.get("player2")):
-                logger.warning(f"⚠️ Игрок @{username} пытался начать новую игру с ботом, имея активную игру {gid}.")
-                await callback.message.edit_text(STARTING_GAME_ERROR, reply_markup=main_menu())
-                return
-
-    # Перед стартом игры с ботом удаляем все созданные пользователем PvP-игры без второго игрока
-    to_delete = [gid for gid, g in games.items() if g.get("player1") == user_id and not g.get("player2") and not g.get("is_bot_game")]
-    for gid in to_delete:
-        games.pop(gid, None)
+    gid = get_player_game_id(user_id)
+    g = games.get(gid) if gid else None
+    # если это игра с ботом или активная PvP (оба игрока есть) — запрещаем запуск
+    if g and (g.is_bot_game or g.is_full):
+        logger.warning(f"⚠️ Игрок @{username} пытался начать новую игру с ботом, имея активную игру {gid}.")
+        await callback.message.edit_text(STARTING_GAME_ERROR, reply_markup=main_menu())
+        return
+
+    # Перед стартом игры с ботом удаляем созданную пользователем PvP-игру без второго игрока
+    if gid in open_lobbies:
+        delete_game(gid)
 
     game_id = start_bot_game(user_id=user_id, username=username, difficulty=difficulty)
 
@@ -91,7 +90,7 @@ async def start_bot_game_callback(callback: CallbackQuery) -> None:
     await callback.message.edit_text(
         YOUR_BOARD_TEXT.format(
             board=__import__('app.game_logic', fromlist=['print_board']).print_board(
-                games[game_id]["boards"][user_id]
+                games[game_id].board_of(user_id)
             )
         ),
         parse_mode="HTML"
@@ -100,7 +99,7 @@ async def start_bot_game_callback(callback: CallbackQuery) -> None:
     await callback.bot.send_message(
         user_id,
         "🎯 Стреляйте по полю соперника!",
-        reply_markup=playing_menu(game_id, games[game_id]["bot_id"])
+        reply_markup=playing_menu(game_id, games[game_id].bot_id)
     )
 
 
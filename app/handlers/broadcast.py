@@ -1,26 +1,28 @@
 import os
 import asyncio
 from datetime import datetime
-from sqlalchemy import select
 from aiogram import Dispatcher
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
-from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import Message, CallbackQuery
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import FSInputFile
 
 from app.keyboards import broadcast_menu, broadcast_confirm_menu, back_to_main_menu
 from app.logger import setup_logger
 from app.config import ADMIN_ID, MOSCOW_TZ
-from app.dependencies import db_session
-from app.models.player import Player
+from app.dependencies import run_db
+from app.db_utils.broadcast import (
+    save_broadcast_draft, get_broadcast_draft, cancel_broadcast_draft, queue_broadcast_job,
+    get_recent_broadcast_jobs, count_reachable_players,
+)
+from app.services.broadcast_service import BroadcastProgress, broadcast_worker
 from app.messages.texts import (
-    BROADCAST_MENU, CREATE_BROADCAST, VIEW_BROADCAST,
-    START_BROADCAST, STAT_BROADCAST, CANCEL_BROADCAST
+    BROADCAST_MENU, CREATE_BROADCAST, VIEW_BROADCAST, START_BROADCAST, QUEUED_BROADCAST,
+    PROGRESS_BROADCAST, STAT_BROADCAST, CANCEL_BROADCAST, BROADCAST_JOBS, BROADCAST_AUDIENCE
 )
 
 logger = setup_logger(__name__)
 
-# Хранилище для сообщения рассылки и состояния админов
-broadcast_message = None
+# Состояние админов при подготовке рассылки (само сообщение и ход рассылки хранятся в БД, broadcast_jobs)
 admin_broadcast_state = {}  # {user_id: True/False} - находится ли админ в режиме создания рассылки
 admin_creation_message = {}  # {user_id: message} - сообщение "Создание рассылки" для каждого админа
 
@@ -35,6 +37,24 @@ async def is_admin(user_id: int) -> bool:
     return str(user_id) == ADMIN_ID
 
 
+# Подписи статусов заданий рассылки в меню
+JOB_STATUSES = {
+    "queued": "⏳ в очереди",
+    "running": "📤 отправляется",
+    "done": "✅ завершена",
+}
+
+
+def _job_line(job: dict) -> str:
+    """Строка меню рассылки с ходом одного задания."""
+    line = (f"• #{job['id']} {JOB_STATUSES.get(job['status'], job['status'])}: "
+            f"{job['sent'] + job['failed']} из {job['total']}, ошибок {job['failed']}")
+    progress = broadcast_worker.progress.get(job["id"])
+    if job["status"] == "running" and progress and not progress.finished:
+        line += f", {progress.rate:.1f} сообщ./с"
+    return line
+
+
 async def broadcast_menu_callback(callback: CallbackQuery) -> None:
     """
     Обрабатывает переход в меню рассылки.
@@ -53,8 +73,14 @@ async def broadcast_menu_callback(callback: CallbackQuery) -> None:
     except Exception:
         pass
 
+    reachable, unreachable = await run_db(count_reachable_players)
+    jobs = await run_db(get_recent_broadcast_jobs)
+    text = BROADCAST_MENU + BROADCAST_AUDIENCE.format(reachable=reachable, unreachable=unreachable)
+    if jobs:
+        text += BROADCAST_JOBS.format(jobs="\n".join(_job_line(job) for job in jobs))
+
     await callback.message.edit_text(
-        BROADCAST_MENU,
+        text,
         reply_markup=broadcast_menu(),
         parse_mode="HTML"
     )
@@ -105,8 +131,7 @@ async def handle_broadcast_message(message: Message) -> None:
     if not admin_broadcast_state.get(message.from_user.id, False):
         return
 
-    global broadcast_message
-    broadcast_message = message.text
+    await run_db(save_broadcast_draft, message.from_user.id, message.text)
 
     # Сбрасываем состояние создания рассылки
     admin_broadcast_state[message.from_user.id] = False
@@ -134,9 +159,41 @@ async def handle_broadcast_message(message: Message) -> None:
     )
 
 
+# Как часто (в секундах) обновлять у администратора сообщение с ходом рассылки
+PROGRESS_INTERVAL = 5
+
+
+def _format_duration(seconds: float | None) -> str:
+    """Форматирует длительность для отчета о рассылке: «1 ч 5 мин», «3 мин 10 с», «12 с»."""
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours} ч {minutes} мин"
+    if minutes:
+        return f"{minutes} мин {seconds} с"
+    return f"{seconds} с"
+
+
+def _progress_text(progress: BroadcastProgress) -> str:
+    return PROGRESS_BROADCAST.format(
+        processed=progress.processed,
+        total_users=progress.total,
+        percent=progress.processed / progress.total * 100 if progress.total else 100,
+        successful_sends=progress.sent,
+        failed_sends=progress.failed,
+        blocked_sends=progress.blocked,
+        rate=progress.rate,
+        eta=_format_duration(progress.eta_seconds()),
+    )
+
+
 async def send_broadcast_callback(callback: CallbackQuery) -> None:
     """
-    Обрабатывает отправку рассылки всем пользователям.
+    Ставит подготовленную рассылку в очередь фонового отправителя.
+    Пока рассылка идет, раз в PROGRESS_INTERVAL секунд обновляет у администратора сообщение с прогрессом.
     
     :param callback: Объект callback-запроса от пользователя.
     """
@@ -144,81 +201,51 @@ async def send_broadcast_callback(callback: CallbackQuery) -> None:
         await callback.answer("❌ У вас нет прав для доступа к этой функции!", show_alert=True)
         return
 
-    global broadcast_message
-
-    if not broadcast_message:
+    draft = await run_db(get_broadcast_draft, callback.from_user.id)
+    if not draft or not await run_db(queue_broadcast_job, draft["id"]):
         await callback.answer("❌ Нет сообщения для рассылки!", show_alert=True)
         return
 
-    logger.info(f"📢 Админ @{callback.from_user.username} начал рассылку сообщения")
+    job_id = draft["id"]
+    broadcast_worker.wake()
+    logger.info(f"📢 Админ @{callback.from_user.username} начал рассылку сообщения (задание #{job_id})")
 
     try:
         await callback.answer()
     except Exception:
         pass
 
+    # Очищаем ссылку на сообщение "Создание рассылки"
+    if callback.from_user.id in admin_creation_message:
+        del admin_creation_message[callback.from_user.id]
+
     # Показываем сообщение о начале рассылки
     await callback.message.edit_text(
         START_BROADCAST,
         parse_mode="HTML"
     )
 
-    # Получаем всех пользователей из базы данных
-    with db_session() as db:
-        result = db.execute(select(Player.telegram_id))
-        user_ids = [row[0] for row in result.fetchall()]
-
-    total_users = len(user_ids)
-    successful_sends = 0
-    failed_sends = 0
-
-    logger.info(f"📊 Начинаем рассылку для {total_users} пользователей")
-
-    # Отправляем сообщения с ограничением скорости
-    for i, user_id in enumerate(user_ids):
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL)
+        progress = broadcast_worker.progress.get(job_id)
+        if progress and progress.finished:
+            break
         try:
-            await callback.bot.send_message(
-                chat_id=user_id,
-                text=f"{broadcast_message}\n\n"
-                     f"🎮 <b>Начните играть командой /start</b>",
-                parse_mode="HTML",
-                reply_markup=ReplyKeyboardRemove()
-            )
-            successful_sends += 1
-
-            # Ограничиваем скорость отправки (1 сообщение в секунду)
-            if i < total_users - 1:
-                await asyncio.sleep(1)
-
-        except TelegramForbiddenError:
-            # Пользователь заблокировал бота
-            failed_sends += 1
-            logger.warning(f"❌ Пользователь {user_id} заблокировал бота")
-
-        except TelegramBadRequest as e:
-            # Другие ошибки API
-            failed_sends += 1
-            logger.error(f"❌ Ошибка при отправке пользователю {user_id}: {e}")
-
-        except Exception as e:
-            # Неожиданные ошибки
-            failed_sends += 1
-            logger.error(f"❌ Неожиданная ошибка при отправке пользователю {user_id}: {e}")
-
-    # Сбрасываем сообщение рассылки и очищаем ссылку на сообщение "Создание рассылки"
-    broadcast_message = None
-    if callback.from_user.id in admin_creation_message:
-        del admin_creation_message[callback.from_user.id]
+            await callback.message.edit_text(_progress_text(progress) if progress else QUEUED_BROADCAST,
+                                             parse_mode="HTML")
+        except TelegramBadRequest:
+            # Текст не изменился с прошлого обновления
+            pass
 
     # Показываем результат
     await callback.message.edit_text(
-        STAT_BROADCAST.format(total_users=total_users, successful_sends=successful_sends, failed_sends=failed_sends),
+        STAT_BROADCAST.format(total_users=progress.total, successful_sends=progress.sent,
+                              failed_sends=progress.failed, blocked_sends=progress.blocked,
+                              elapsed=_format_duration(progress.elapsed), rate=progress.rate),
         reply_markup=back_to_main_menu(),
         parse_mode="HTML"
     )
 
-    logger.info(f"📊 Рассылка завершена: {successful_sends}/{total_users} успешно")
-
 
 async def cancel_broadcast_callback(callback: CallbackQuery) -> None:
     """
@@ -230,8 +257,7 @@ async def cancel_broadcast_callback(callback: CallbackQuery) -> None:
         await callback.answer("❌ У вас нет прав для доступа к этой функции!", show_alert=True)
         return
 
-    global broadcast_message
-    broadcast_message = None
+    await run_db(cancel_broadcast_draft, callback.from_user.id)
 
     # Очищаем ссылку на сообщение "Создание рассылки"
     if callback.from_user.id in admin_creation_message:
@@ -1,9 +1,10 @@
 from datetime import datetime
 from aiogram import Dispatcher
 from aiogram.types import CallbackQuery, PreCheckoutQuery, Message, LabeledPrice
+from sqlalchemy.orm import Session
 
 from app.keyboards import donation_menu, back_to_main_menu, donation_cancel_keyboard
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.db_utils.player import get_or_create_player
 from app.db_utils.donor import is_donor, handle_donation
 from app.messages.texts import (DONATION_MENU, DONATION_MENU_ALREADY_DONOR,
@@ -14,6 +15,14 @@ from app.logger import setup_logger
 logger = setup_logger("donation")
 
 
+def _save_donation(db: Session, telegram_id: str, username: str, stars_amount: int) -> None:
+    """
+    Сохраняет донат игрока (вызывается через run_db в пуле потоков БД).
+    """
+    player = get_or_create_player(db, telegram_id, username)
+    handle_donation(db, player, stars_amount, datetime.now(MOSCOW_TZ))
+
+
 async def donation_menu_callback(callback: CallbackQuery) -> None:
     """
     Обработчик для показа меню доната.
@@ -21,8 +30,7 @@ async def donation_menu_callback(callback: CallbackQuery) -> None:
     logger.info(f"💰 Пользователь @{callback.from_user.username} вошел в меню доната!")
 
     # Проверяем статус донора
-    with db_session() as db:
-        donor_status = is_donor(db, callback.from_user.id)
+    donor_status = await run_db(is_donor, callback.from_user.id)
 
     text = DONATION_MENU_ALREADY_DONOR if donor_status else DONATION_MENU
 
@@ -143,9 +151,7 @@ async def successful_payment_handler(message: Message) -> None:
 
         stars_amount = int(payload.replace("donation_", "").replace("_stars", ""))
 
-        with db_session() as db:
-            player = get_or_create_player(db, str(message.from_user.id), message.from_user.username)
-            handle_donation(db, player, stars_amount, datetime.now(MOSCOW_TZ))
+        await run_db(_save_donation, str(message.from_user.id), message.from_user.username, stars_amount)
 
         await message.answer(DONATION_SUCCESS, parse_mode="HTML", reply_markup=back_to_main_menu())
         logger.info(f"Пользователь {message.from_user.username} стал донором ({stars_amount} ⭐)")
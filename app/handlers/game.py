@@ -5,7 +5,7 @@ from app.state.constants import COORDINATES
 from app.services.game_service import handle_surrender, handle_shot
 from app.services.bot_game_service import handle_player_shot_vs_bot, handle_surrender_vs_bot
 from app.services.complaint_service import handle_complaint
-from app.state.in_memory import games
+from app.storage import get_player_game
 
 
 async def shot_command_coord(message: Message) -> None:
@@ -17,30 +17,9 @@ async def shot_command_coord(message: Message) -> None:
 
     :param message: Объект сообщения от пользователя.
     """
-    # Определяем тип игры до обработки
-    user_id = message.from_user.id
-    chosen_game = None
-    # 1) Приоритет — игра, где сейчас ход пользователя
-    for gid, g in games.items():
-        if (user_id == g.get("player1") or user_id == g.get("player2")) and g.get("turn") == user_id:
-            # Пропускаем незаполненные PvP игры
-            if not g.get("is_bot_game") and not (g.get("player1") and g.get("player2")):
-                continue
-            chosen_game = g
-            break
-    # 2) Если нет — игра с ботом
-    if not chosen_game:
-        for gid, g in games.items():
-            if (user_id == g.get("player1") or user_id == g.get("player2")) and g.get("is_bot_game"):
-                chosen_game = g
-                break
-    # 3) Если нет — любая активная PvP-игра (оба игрока на месте)
-    if not chosen_game:
-        for gid, g in games.items():
-            if (user_id == g.get("player1") or user_id == g.get("player2")) and g.get("player1") and g.get("player2"):
-                chosen_game = g
-                break
-    is_bot_game = bool(chosen_game and chosen_game.get("is_bot_game"))
+    # Определяем тип игры до обработки — игра пользователя берётся из индекса за O(1)
+    chosen_game = get_player_game(message.from_user.id)
+    is_bot_game = bool(chosen_game and chosen_game.is_bot_game)
 
     if message.text == "🏳️ Сдаться":
         if is_bot_game:
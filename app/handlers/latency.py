@@ -0,0 +1,60 @@
+from aiogram import Dispatcher
+from aiogram.types import Message
+from aiogram.filters import Command
+
+from app.logger import setup_logger
+from app.config import ADMIN_ID
+from app.utils.latency import LatencyHistogram, shot_latency
+from app.messages.texts import SHOT_LATENCY, NO_SHOT_LATENCY
+
+logger = setup_logger(__name__)
+
+
+def _format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f} мс"
+
+
+def latency_text(histogram: LatencyHistogram) -> str:
+    """
+    Формирует отчет о распределении задержки: квантили и непустые корзины.
+
+    :param histogram: Гистограмма задержек.
+    :return: Текст отчета или NO_SHOT_LATENCY, если замеров еще нет.
+    """
+    if not histogram.count:
+        return NO_SHOT_LATENCY
+    lines = []
+    for bound, count in histogram.buckets():
+        label = f"≤ {_format_ms(bound)}" if bound is not None else f"> {_format_ms(histogram.bounds[-1])}"
+        lines.append(f"• {label}: {count} ({count / histogram.count:.0%})")
+    return SHOT_LATENCY.format(
+        count=histogram.count,
+        p50=_format_ms(histogram.quantile(0.5)),
+        p95=_format_ms(histogram.quantile(0.95)),
+        p99=_format_ms(histogram.quantile(0.99)),
+        max=_format_ms(histogram.max),
+        buckets="\n".join(lines),
+    )
+
+
+async def latency_command(message: Message) -> None:
+    """
+    Обрабатывает команду /latency: показывает администратору задержку доставки хода
+    обоим игрокам (с запуска бота). Остальным пользователям команда не отвечает.
+
+    :param message: Объект входящего сообщения от пользователя.
+    """
+    if str(message.from_user.id) != ADMIN_ID:
+        return
+
+    logger.info(f"⏱ Админ @{message.from_user.username} запросил задержки ходов")
+    await message.answer(latency_text(shot_latency), parse_mode="HTML")
+
+
+def register_handler(dp: Dispatcher) -> None:
+    """
+    Регистрирует обработчик команды /latency (только для администратора).
+
+    :param dp: Объект диспетчера aiogram.
+    """
+    dp.message.register(latency_command, Command("latency"))
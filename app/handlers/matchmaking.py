@@ -3,9 +3,11 @@ from aiogram.types import CallbackQuery, ReplyKeyboardRemove
 import asyncio
 
 from app.services.matchmaking_service import try_create_game, try_join_game
+from app.services.outbox import outbox
 from app.game_logic import print_board
 from app.keyboards import connect_menu, playing_menu, current_game_menu, main_menu
-from app.state.in_memory import user_game_requests, games
+from app.state.in_memory import user_game_requests, games, open_lobbies
+from app.storage import get_player_game_id
 from app.utils.game_cleanup import remove_game_if_no_join
 from app.logger import setup_logger
 
@@ -35,7 +37,7 @@ async def create_game_callback(callback: CallbackQuery) -> None:
     username = callback.from_user.username
 
     # Проверяем, что игрок не в игре
-    if not any(user_id == games[g]["player1"] or user_id == games[g]["player2"] for g in games):
+    if get_player_game_id(user_id) is None:
         try:
             game_id = try_create_game(user_id, username)
         except Exception as e:
@@ -53,14 +55,13 @@ async def create_game_callback(callback: CallbackQuery) -> None:
                                          parse_mode="html")
 
         # Сохраняем message_id сообщения о создании игры для последующего удаления
-        games[game_id]["creation_message_id"] = callback.message.message_id
+        games[game_id].creation_message_id = callback.message.message_id
     else:
         # Проверяем, не существует ли уже созданная пользователем игра, ожидающая второго игрока
         existing_waiting_game_id = None
-        for gid, g in games.items():
-            if g.get("player1") == user_id and not g.get("player2"):
-                existing_waiting_game_id = gid
-                break
+        own_game_id = get_player_game_id(user_id)
+        if own_game_id in open_lobbies and games[own_game_id].player1.id == user_id:
+            existing_waiting_game_id = own_game_id
 
         if existing_waiting_game_id:
             # Повторно показываем исходное сообщение с кодом уже созданной игры
@@ -98,12 +99,11 @@ async def join_game_callback(callback: CallbackQuery) -> None:
 
     # Проверяем, не играет ли игрок в активной игре (игра началась, есть 2 игрока)
     active_game = None
-    for gid, g in games.items():
-        if user_id == g.get("player1") or user_id == g.get("player2"):
-            # Если игра активна (есть 2 игрока), блокируем присоединение
-            if g.get("player1") and g.get("player2"):
-                active_game = gid
-                break
+    own_game_id = get_player_game_id(user_id)
+    own_game = games.get(own_game_id) if own_game_id else None
+    # Если игра активна (есть 2 игрока), блокируем присоединение
+    if own_game and own_game.is_full:
+        active_game = own_game_id
 
     if active_game:
         logger.warning(
@@ -135,18 +135,18 @@ async def join_game_by_id_callback(callback: CallbackQuery) -> None:
 
     # Проверяем, не играет ли первый игрок уже с ботом
     target_game = games.get(game_id)
-    if target_game and target_game.get("player1"):
-        player1_id = target_game["player1"]
-        for gid, g in games.items():
-            if gid != game_id and (player1_id == g.get("player1") or player1_id == g.get("player2")) and g.get("is_bot_game"):
-                logger.warning(f"⚠️ Игрок @{username} пытался присоединиться к игре {game_id}, но первый игрок уже играет с ботом в игре {gid}.")
-                try:
-                    await callback.message.edit_text("⚠️ Первый игрок уже играет с ботом. Присоединение невозможно.", reply_markup=main_menu())
-                except Exception:
-                    pass
-                return
-
-    result = try_join_game(game_id, user_id, username)
+    if target_game:
+        player1_id = target_game.player1.id
+        gid = get_player_game_id(player1_id)
+        if gid and gid != game_id and games[gid].is_bot_game:
+            logger.warning(f"⚠️ Игрок @{username} пытался присоединиться к игре {game_id}, но первый игрок уже играет с ботом в игре {gid}.")
+            try:
+                await callback.message.edit_text("⚠️ Первый игрок уже играет с ботом. Присоединение невозможно.", reply_markup=main_menu())
+            except Exception:
+                pass
+            return
+
+    result = await try_join_game(game_id, user_id, username)
 
     if result == "same_game":
         logger.warning(f"⚠️ Игрок @{username} пытался подключиться к своей же игре с ID: {game_id}")
@@ -179,49 +179,54 @@ async def join_game_by_id_callback(callback: CallbackQuery) -> None:
         user_game_requests.pop(user_id, None)
         player1 = result["player1"]
         player2 = result["player2"]
-        usernames = games[game_id].get("usernames", {})
-        username_player1 = usernames.get(player1, "Игрок 1")
-        username_player2 = usernames.get(player2, "Игрок 2")
+        game = result["game"]
+        username_player1 = game.username_of(player1, "Игрок 1")
+        username_player2 = game.username_of(player2, "Игрок 2")
 
         logger.info(f"➕ Игрок @{username} присоединился к игре, ID игры: {game_id}")
 
         # Удаляем сообщение о создании игры у первого игрока
-        creation_message_id = games[game_id].get("creation_message_id")
+        creation_message_id = game.creation_message_id
         if creation_message_id:
             try:
                 await callback.bot.delete_message(player1, creation_message_id)
             except Exception:
                 pass
 
-        await callback.message.edit_text(SUCCESSFULLY_JOINED.format(game_id=game_id))
-        await callback.bot.send_message(player1, PLAYER1_GAME_START.format(username=username_player2),
-                                        parse_mode="html",
-                                        reply_markup=ReplyKeyboardRemove())
-        await callback.bot.send_message(player2, PLAYER2_GAME_START.format(username=username_player1),
-                                        parse_mode="html",
-                                        reply_markup=ReplyKeyboardRemove())
-
-        # Отправляем сообщение игроку 1 и сохраняем message_id
-        msg1 = await callback.bot.send_message(
-            player1,
-            YOUR_BOARD_TEXT.format(board=print_board(games[game_id]["boards"][player1])),
-            parse_mode="html",
-            reply_markup=playing_menu(game_id, player2)
-        )
-
-        # Отправляем сообщение игроку 2 и сохраняем message_id
-        msg2 = await callback.bot.send_message(
-            player2,
-            YOUR_BOARD_TEXT.format(board=print_board(games[game_id]["boards"][player2])),
-            parse_mode="html",
-            reply_markup=playing_menu(game_id, player1)
+        # Сообщения обоим игрокам отправляются одновременно: ошибка отправки одному не мешает другому
+        outbox.send_message(callback.bot, player1, PLAYER1_GAME_START.format(username=username_player2),
+                            parse_mode="html",
+                            reply_markup=ReplyKeyboardRemove())
+        outbox.send_message(callback.bot, player2, PLAYER2_GAME_START.format(username=username_player1),
+                            parse_mode="html",
+                            reply_markup=ReplyKeyboardRemove())
+
+        _, msg1, msg2 = await asyncio.gather(
+            callback.message.edit_text(SUCCESSFULLY_JOINED.format(game_id=game_id)),
+            # Поле игрока 1
+            outbox.send_message(
+                callback.bot,
+                player1,
+                YOUR_BOARD_TEXT.format(board=print_board(game.player1.board)),
+                parse_mode="html",
+                reply_markup=playing_menu(game_id, player2)
+            ),
+            # Поле игрока 2
+            outbox.send_message(
+                callback.bot,
+                player2,
+                YOUR_BOARD_TEXT.format(board=print_board(game.player2.board)),
+                parse_mode="html",
+                reply_markup=playing_menu(game_id, player1)
+            ),
+            return_exceptions=True,
         )
 
-        # Сохраняем ID сообщений в память
-        games[game_id]["message_ids"] = {
-            player1: msg1.message_id,
-            player2: msg2.message_id,
-        }
+        # Сохраняем ID сообщений в память (если отправка не удалась, ошибка уже записана в лог outbox)
+        if not isinstance(msg1, BaseException):
+            game.player1.message_id = msg1.message_id
+        if not isinstance(msg2, BaseException):
+            game.player2.message_id = msg2.message_id
 
 
 async def refresh_games_callback(callback: CallbackQuery) -> None:
@@ -1,6 +1,8 @@
 from aiogram import Dispatcher
 
-from app.handlers import base, stats, game, matchmaking, records, broadcast, bot_game, bot_analytics, achievements, donation
+from app.handlers import (
+    base, stats, game, matchmaking, records, broadcast, bot_game, bot_analytics, achievements, donation, latency
+)
 
 
 def register_handlers(dp: Dispatcher) -> None:
@@ -10,6 +12,7 @@ def register_handlers(dp: Dispatcher) -> None:
     :param dp: Экземпляр Dispatcher из aiogram.
     """
     base.register_handler(dp)
+    latency.register_handler(dp)
     stats.register_handler(dp)
     game.register_handler(dp)
     matchmaking.register_handler(dp)
@@ -1,11 +1,12 @@
 from aiogram import Dispatcher
 from aiogram.types import CallbackQuery
+from sqlalchemy.orm import Session
 
 from app.keyboards import rating_menu, back_to_main_menu, profile_menu
 from app.logger import setup_logger
 from app.db_utils.stats import get_top_and_bottom_players
 from app.db_utils.player import get_player_by_telegram_id, get_extended_stats
-from app.dependencies import db_session
+from app.dependencies import run_db
 
 from app.messages.texts import (
     STATS_TEMPLATE,
@@ -21,6 +22,19 @@ from app.messages.texts import (
 logger = setup_logger(__name__)
 
 
+def _load_profile_stats(db: Session, telegram_id: str) -> tuple[bool, dict | None]:
+    """
+    Загружает расширенную статистику игрока (вызывается через run_db в пуле потоков БД).
+
+    :param db: Сессия базы данных.
+    :param telegram_id: Telegram ID игрока.
+    :return: Кортеж (зарегистрирован ли игрок, статистика или None).
+    """
+    if not get_player_by_telegram_id(db, telegram_id):
+        return False, None
+    return True, get_extended_stats(db, telegram_id)
+
+
 async def stats_callback(callback: CallbackQuery) -> None:
     """
     Обрабатывает callback-запрос показа статистики игрока.
@@ -34,37 +48,35 @@ async def stats_callback(callback: CallbackQuery) -> None:
         pass
 
     username = callback.from_user.username
-    with db_session() as db:
-        player = get_player_by_telegram_id(db, str(callback.from_user.id))
-        if not player:
-            logger.info(f"📊 Игрок @{username} пытался получить статистику, будучи не авторизованным.")
-            await callback.message.edit_text(NOT_REGISTERED_MESSAGE, reply_markup=back_to_main_menu())
-            return
-
-        stats = get_extended_stats(db, str(callback.from_user.id))
-        if not stats:
-            logger.info(f"📊 Игрок @{username} пытался получить статистику, ни разу не сыграв.")
-            await callback.message.edit_text(NO_STATS_MESSAGE, reply_markup=back_to_main_menu())
-            return
-
-        logger.info(f"📊 Игрок @{username} получил свою статистику.")
-
-        await callback.message.edit_text(
-            STATS_TEMPLATE.format(
-                donor='открыты' if stats.get("is_donor", False) else 'закрыты',
-                games_played=stats["games_played"],
-                wins=stats["wins"],
-                losses=stats["losses"],
-                rating=stats["rating"],
-                place=stats["place"],
-                total_players=stats["total_players"],
-                first_seen=stats["first_seen"].strftime("%d.%m.%Y"),
-                avg_time=int(stats["avg_time"] // 60),
-                total_time=int(stats["total_time"] // 60),
-            ),
-            parse_mode='HTML',
-            reply_markup=profile_menu()
-        )
+    registered, stats = await run_db(_load_profile_stats, str(callback.from_user.id))
+    if not registered:
+        logger.info(f"📊 Игрок @{username} пытался получить статистику, будучи не авторизованным.")
+        await callback.message.edit_text(NOT_REGISTERED_MESSAGE, reply_markup=back_to_main_menu())
+        return
+
+    if not stats:
+        logger.info(f"📊 Игрок @{username} пытался получить статистику, ни разу не сыграв.")
+        await callback.message.edit_text(NO_STATS_MESSAGE, reply_markup=back_to_main_menu())
+        return
+
+    logger.info(f"📊 Игрок @{username} получил свою статистику.")
+
+    await callback.message.edit_text(
+        STATS_TEMPLATE.format(
+            donor='открыты' if stats.get("is_donor", False) else 'закрыты',
+            games_played=stats["games_played"],
+            wins=stats["wins"],
+            losses=stats["losses"],
+            rating=stats["rating"],
+            place=stats["place"],
+            total_players=stats["total_players"],
+            first_seen=stats["first_seen"].strftime("%d.%m.%Y"),
+            avg_time=int(stats["avg_time"] // 60),
+            total_time=int(stats["total_time"] // 60),
+        ),
+        parse_mode='HTML',
+        reply_markup=profile_menu()
+    )
 
 
 async def leaderboard_callback(callback: CallbackQuery) -> None:
@@ -81,46 +93,45 @@ async def leaderboard_callback(callback: CallbackQuery) -> None:
         pass
 
     username = callback.from_user.username
-    with db_session() as db:
-        top_players, bottom_players, total_players, current_user_position = get_top_and_bottom_players(
-            db, current_user_id=str(callback.from_user.id)
-        )
-
-        if not top_players:
-            logger.info(f"🥇 Игрок @{username} пытался получить рейтинг, но он пуст.")
-            await callback.message.edit_text(EMPTY_LEADERBOARD_MESSAGE, reply_markup=back_to_main_menu())
-            return
-
-        text = LEADERBOARD_HEADER
-        for i, (player_username, rating, _, is_donor) in enumerate(top_players, 1):
-            donor_badge = "💎" if is_donor else ""
-            name = f"@{player_username}" if player_username else UNKNOWN_USERNAME_FIRST
-            name_with_badge = f"{donor_badge} {name}".strip()
-            text += LEADERBOARD_ROW.format(index=i, username=name_with_badge, rating=rating)
-
-        # Если пользователь не в топе, добавляем его позицию
-        if current_user_position:
-            user_username, user_rating, user_position, user_is_donor = current_user_position
-            donor_badge = "💎" if user_is_donor else ""
-            name = f"@{user_username}" if user_username else UNKNOWN_USERNAME_FIRST
-            name_with_badge = f"{donor_badge} {name}".strip()
-            text += "...\n"
-            text += LEADERBOARD_ROW.format(index=user_position, username=name_with_badge, rating=user_rating)
-            text += "...\n"
-        else:
-            text += "...\n"
-
-        start_index = total_players - len(bottom_players) + 1
-        for i, (player_username, rating, _, is_donor) in enumerate(bottom_players, start_index):
-            donor_badge = "💎" if is_donor else ""
-            name = f"@{player_username}" if player_username else UNKNOWN_USERNAME_FIRST
-            name_with_badge = f"{donor_badge} {name}".strip()
-            text += LEADERBOARD_ROW.format(index=i, username=name_with_badge, rating=rating)
-
-        # text += LEADERBOARD_FOOTER.format(total_players=total_players)
-
-        logger.info(f"🥇 Игрок @{username} получил рейтинг игроков.")
-        await callback.message.edit_text(text, parse_mode='html', reply_markup=rating_menu())
+    top_players, bottom_players, total_players, current_user_position = await run_db(
+        get_top_and_bottom_players, current_user_id=str(callback.from_user.id)
+    )
+
+    if not top_players:
+        logger.info(f"🥇 Игрок @{username} пытался получить рейтинг, но он пуст.")
+        await callback.message.edit_text(EMPTY_LEADERBOARD_MESSAGE, reply_markup=back_to_main_menu())
+        return
+
+    text = LEADERBOARD_HEADER
+    for i, (player_username, rating, _, is_donor) in enumerate(top_players, 1):
+        donor_badge = "💎" if is_donor else ""
+        name = f"@{player_username}" if player_username else UNKNOWN_USERNAME_FIRST
+        name_with_badge = f"{donor_badge} {name}".strip()
+        text += LEADERBOARD_ROW.format(index=i, username=name_with_badge, rating=rating)
+
+    # Если пользователь не в топе, добавляем его позицию
+    if current_user_position:
+        user_username, user_rating, user_position, user_is_donor = current_user_position
+        donor_badge = "💎" if user_is_donor else ""
+        name = f"@{user_username}" if user_username else UNKNOWN_USERNAME_FIRST
+        name_with_badge = f"{donor_badge} {name}".strip()
+        text += "...\n"
+        text += LEADERBOARD_ROW.format(index=user_position, username=name_with_badge, rating=user_rating)
+        text += "...\n"
+    else:
+        text += "...\n"
+
+    start_index = total_players - len(bottom_players) + 1
+    for i, (player_username, rating, _, is_donor) in enumerate(bottom_players, start_index):
+        donor_badge = "💎" if is_donor else ""
+        name = f"@{player_username}" if player_username else UNKNOWN_USERNAME_FIRST
+        name_with_badge = f"{donor_badge} {name}".strip()
+        text += LEADERBOARD_ROW.format(index=i, username=name_with_badge, rating=rating)
+
+    # text += LEADERBOARD_FOOTER.format(total_players=total_players)
+
+    logger.info(f"🥇 Игрок @{username} получил рейтинг игроков.")
+    await callback.message.edit_text(text, parse_mode='html', reply_markup=rating_menu())
 
 
 async def get_elo_explanation_callback(callback: CallbackQuery) -> None:
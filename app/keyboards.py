@@ -1,5 +1,6 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
-from app.storage import games
+from app.game_logic import Board, board_row, cached_rows
+from app.storage import games, open_lobbies
 
 
 def main_menu(is_admin: bool = False) -> InlineKeyboardMarkup:
@@ -108,6 +109,23 @@ def connect_menu() -> InlineKeyboardMarkup:
     return keyboard
 
 
+def board_buttons(board: Board) -> list[list[KeyboardButton]]:
+    """
+    Возвращает ряды кнопок игрового поля: попадание, промах или координаты клетки.
+    Ряды кэшируются на доске, поэтому после выстрела заново создаются кнопки только изменившихся рядов.
+
+    :param board: Игровое поле.
+    :return: Список рядов KeyboardButton.
+    """
+    def build_row(row: int) -> list[KeyboardButton]:
+        return [
+            KeyboardButton(text=(cell if cell in ["❌", "💥"] else f"{chr(65 + row)}{col + 1}"))
+            for col, cell in enumerate(board_row(board, row, hide_ships=True))
+        ]
+
+    return cached_rows(board, "keyboard", True, build_row)
+
+
 def playing_menu(game_id: str, player_id: int) -> ReplyKeyboardMarkup:
     """
     Создает клавиатуру с игровым полем для текущего игрока.
@@ -120,15 +138,9 @@ def playing_menu(game_id: str, player_id: int) -> ReplyKeyboardMarkup:
     """
     keyboard = ReplyKeyboardMarkup(
         resize_keyboard=True,
-        keyboard=[
-                     [
-                         KeyboardButton(text=(cell if cell in ["❌", "💥"] else f"{chr(65 + row)}{col + 1}"))
-                         for col, cell in enumerate(games[game_id]['boards'][player_id][row])
-                     ]
-                     for row in range(10)
-                 ] + [
-                     [KeyboardButton(text="🏳️ Сдаться"), KeyboardButton(text="⚠️ Пожаловаться на бездействие")]
-                 ],
+        keyboard=board_buttons(games[game_id].board_of(player_id)) + [
+            [KeyboardButton(text="🏳️ Сдаться"), KeyboardButton(text="⚠️ Пожаловаться на бездействие")]
+        ],
     )
     return keyboard
 
@@ -144,19 +156,13 @@ def current_game_menu(user_id: int | None = None) -> InlineKeyboardMarkup:
     """
     keyboard_buttons = []
 
-    # Добавляем кнопки только с доступными для подключения играми
-    for gid, game in games.items():
-        # Пропускаем игры, где уже есть два игрока
-        if game.get("player1") and game.get("player2") and not game.get("is_bot_game"):
-            continue
-
+    # Добавляем кнопки только с доступными для подключения играми (открытые лобби)
+    for gid in open_lobbies:
         # Пропускаем собственные игры пользователя (если передан user_id)
-        if user_id is not None and user_id == game.get("player1"):
+        if user_id is not None and user_id == games[gid].player1.id:
             continue
 
-        # В меню присоединения показываем только PvP-игры, где есть только первый игрок
-        if not game.get("is_bot_game") and game.get("player1") and not game.get("player2"):
-            keyboard_buttons.append([InlineKeyboardButton(text=f"{gid}", callback_data=f"join_game_{gid}")])
+        keyboard_buttons.append([InlineKeyboardButton(text=f"{gid}", callback_data=f"join_game_{gid}")])
 
     # Добавляем навигационные кнопки
     keyboard_buttons.extend([
@@ -266,18 +272,11 @@ def enemy_board_keyboard(game_id: str, opponent_id: int) -> ReplyKeyboardMarkup:
     :param opponent_id: ID соперника (для отображения его поля).
     :return: Объект ReplyKeyboardMarkup с игровым полем соперника и кнопками.
     """
-    board = games[game_id]['boards'][opponent_id]
     keyboard = ReplyKeyboardMarkup(
         resize_keyboard=True,
-        keyboard=[
-                     [
-                         KeyboardButton(text=(cell if cell in ["❌", "💥"] else f"{chr(65 + row)}{col + 1}"))
-                         for col, cell in enumerate(board[row])
-                     ]
-                     for row in range(10)
-                 ] + [
-                     [KeyboardButton(text="🏳️ Сдаться"), KeyboardButton(text="⚠️ Пожаловаться на бездействие")]
-                 ],
+        keyboard=board_buttons(games[game_id].board_of(opponent_id)) + [
+            [KeyboardButton(text="🏳️ Сдаться"), KeyboardButton(text="⚠️ Пожаловаться на бездействие")]
+        ],
     )
     return keyboard
 
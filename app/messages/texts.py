@@ -107,6 +107,22 @@ YOUR_BOARD_TEXT_AFTER_BAD_SHOT = (
     "🎯 <b>Ваш ход!</b>"
 )
 
+YOUR_BOARD_TEXT_AFTER_BOT_TURN = (
+    "🤖 <b>Ход соперника:</b> {shots}\n\n"
+    "<b>Ваше поле после хода соперника</b>:{board}\n"
+    "🎯 <b>Ваш ход!</b>"
+)
+
+YOUR_BOARD_TEXT_AFTER_BOT_WIN = (
+    "🤖 <b>Ход соперника:</b> {shots}\n\n"
+    "<b>Ваше поле после хода соперника</b>:{board}"
+)
+
+# Отметки выстрелов бота в сводке хода
+BOT_SHOT_MISS = "❌"
+BOT_SHOT_HIT = "💥"
+BOT_SHOT_SUNK = "☠️"
+
 LOSER = (
     "<b>🏁 Итоговое поле соперника:</b>\n"
     "{board}\n"
@@ -251,6 +267,10 @@ BROADCAST_MENU = (
     "Нажмите «Новое сообщение» чтобы создать рассылку."
 )
 
+BROADCAST_AUDIENCE = (
+    "\n\n👥 <b>Получатели:</b> {reachable} доступны, {unreachable} заблокировали бота"
+)
+
 CREATE_BROADCAST = (
     "📝 <b>Создание рассылки</b>\n\n"
     "Отправьте мне сообщение, которое хотите разослать всем пользователям.\n\n"
@@ -267,7 +287,35 @@ VIEW_BROADCAST = (
 START_BROADCAST = (
     "📢 <b>Рассылка началась</b>\n\n"
     "Сообщение отправляется всем пользователям...\n"
-    "Это может занять некоторое время."
+    "Это может занять некоторое время. Рассылка продолжится и после перезапуска бота, "
+    "ход рассылки виден в меню рассылки."
+)
+
+QUEUED_BROADCAST = (
+    "⏳ <b>Рассылка в очереди</b>\n\n"
+    "Она начнется, когда закончится предыдущая рассылка."
+)
+
+BROADCAST_JOBS = (
+    "\n\n📋 <b>Последние рассылки:</b>\n"
+    "{jobs}"
+)
+
+SHOT_LATENCY = (
+    "⏱ <b>Доставка хода обоим игрокам</b> (ходов с запуска: {count}):\n"
+    "p50 {p50} · p95 {p95} · p99 {p99} · макс. {max}\n"
+    "{buckets}"
+)
+
+NO_SHOT_LATENCY = "⏱ С запуска бота еще не было ходов в играх между игроками."
+
+PROGRESS_BROADCAST = (
+    "📢 <b>Рассылка идет</b>\n\n"
+    "📊 <b>Прогресс:</b> {processed} из {total_users} ({percent:.0f}%)\n"
+    "• Успешно отправлено: {successful_sends}\n"
+    "• Ошибок: {failed_sends} (заблокировали бота: {blocked_sends})\n"
+    "• Скорость: {rate:.1f} сообщ./с\n"
+    "• Осталось примерно: {eta}"
 )
 
 STAT_BROADCAST = (
@@ -275,7 +323,8 @@ STAT_BROADCAST = (
     "📊 <b>Статистика:</b>\n"
     "• Всего пользователей: {total_users}\n"
     "• Успешно отправлено: {successful_sends}\n"
-    "• Ошибок: {failed_sends}\n\n"
+    "• Ошибок: {failed_sends} (заблокировали бота: {blocked_sends})\n"
+    "• Время: {elapsed}, скорость: {rate:.1f} сообщ./с\n\n"
     "Рассылка завершена успешно!"
 )
 
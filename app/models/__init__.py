@@ -3,5 +3,7 @@ from app.models.player import Player
 from app.models.match import Match
 from app.models.player_stats import PlayerStats
 from app.models.bot_game_stats import BotGameStats
-from app.models.achievements import Achievement, PlayerAchievement
-from app.models.donor import Donor
\ No newline at end of file
+from app.models.achievements import Achievement, PlayerAchievement, AchievementProgress
+from app.models.donor import Donor
+from app.models.game_records import GameRecords, PlayerRecords
+from app.models.broadcast import BroadcastJob, BroadcastDelivery
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -43,3 +43,22 @@ class PlayerAchievement(Base):
         )
 
 
+
+
+class AchievementProgress(Base):
+    """
+    Счетчики прогресса мультиплеерных достижений игрока, обновляются после каждого матча:
+    текущая серия побед, серия поражений без сдачи и число дней подряд с матчами.
+    ID игрока — его telegram_id, как в таблице matches.
+    """
+    __tablename__ = "achievement_progress"
+
+    player_id = Column(Integer, primary_key=True)
+
+    win_streak = Column(Integer, default=0)
+    brave_loss_streak = Column(Integer, default=0)
+    active_days = Column(Integer, default=0)
+    last_active_day = Column(Date, nullable=True)
+
+    def __repr__(self):
+        return f"<AchievementProgress player_id={self.player_id} win_streak={self.win_streak}>"
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+
+from app.models.base import Base
+
+
+class BroadcastJob(Base):
+    """
+    Задание рассылки. Статусы: draft (подготовлено, ждет подтверждения), queued (в очереди),
+    running (отправляется), done (завершено), cancelled (отменено).
+
+    cursor — players.id, до которого (включительно) все получатели уже обработаны;
+    после перезапуска бота рассылка продолжается с него. blocked — сколько из failed заблокировали бота.
+    """
+    __tablename__ = "broadcast_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    admin_id = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="draft")
+
+    cursor = Column(Integer, default=0)
+    total = Column(Integer, default=0)
+    sent = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    blocked = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<BroadcastJob id={self.id} status={self.status} sent={self.sent}/{self.total}>"
+
+
+class BroadcastDelivery(Base):
+    """
+    Результат отправки рассылки одному получателю (status: sent / failed / blocked — заблокировал бота).
+    По этим записям продолжение рассылки пропускает уже обработанных получателей.
+    """
+    __tablename__ = "broadcast_deliveries"
+
+    job_id = Column(Integer, ForeignKey("broadcast_jobs.id"), primary_key=True)
+    player_id = Column(Integer, primary_key=True)
+    status = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<BroadcastDelivery job_id={self.job_id} player_id={self.player_id} status={self.status}>"
@@ -0,0 +1,58 @@
+from sqlalchemy import Column, Integer, Float, DateTime
+
+from app.models.base import Base
+
+
+class GameRecords(Base):
+    """
+    Текущие рекорды игры (одна строка с id = 1).
+    Обновляются при завершении каждого матча, страница рекордов читает только эту строку.
+    ID игроков — их telegram_id, как в таблице matches.
+    """
+    __tablename__ = "game_records"
+
+    id = Column(Integer, primary_key=True)
+
+    # Самая быстрая игра
+    fastest_match_id = Column(Integer, nullable=True)
+    fastest_seconds = Column(Float, nullable=True)
+    fastest_ended_at = Column(DateTime, nullable=True)
+    fastest_player_1_id = Column(Integer, nullable=True)
+    fastest_player_2_id = Column(Integer, nullable=True)
+
+    # Самые долгие серии побед и поражений
+    win_streak = Column(Integer, default=0)
+    win_streak_player_id = Column(Integer, nullable=True)
+    loss_streak = Column(Integer, default=0)
+    loss_streak_player_id = Column(Integer, nullable=True)
+
+    # Самые играющие игроки: по количеству игр и по времени
+    most_games = Column(Integer, default=0)
+    most_games_player_id = Column(Integer, nullable=True)
+    most_seconds = Column(Float, default=0)
+    most_seconds_player_id = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<GameRecords fastest={self.fastest_seconds} win_streak={self.win_streak}>"
+
+
+class PlayerRecords(Base):
+    """
+    Накопленные показатели игрока, из которых складываются рекорды:
+    сыгранные игры, время в игре, текущие и лучшие серии побед и поражений.
+    Учитываются только завершенные матчи со статусом 'normal'.
+    """
+    __tablename__ = "player_records"
+
+    player_id = Column(Integer, primary_key=True)
+
+    games_played = Column(Integer, default=0)
+    play_seconds = Column(Float, default=0)
+
+    current_win_streak = Column(Integer, default=0)
+    best_win_streak = Column(Integer, default=0)
+    current_loss_streak = Column(Integer, default=0)
+    best_loss_streak = Column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<PlayerRecords player_id={self.player_id} games={self.games_played}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -26,5 +26,10 @@ class Match(Base):
     player_2 = relationship("Player", foreign_keys=[player_2_id])
     winner = relationship("Player", foreign_keys=[winner_id])
 
+    __table_args__ = (
+        # Рекорды и статистика: завершенные матчи нужного статуса в порядке окончания
+        Index("ix_matches_result_ended_at", "result", "ended_at"),
+    )
+
     def __repr__(self):
         return f"<Match id={self.id} p1={self.player_1_id} p2={self.player_2_id} winner={self.winner_id}>"
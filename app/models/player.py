@@ -15,6 +15,8 @@ class Player(Base):
 
     first_seen = Column(DateTime, default=datetime.now)
     last_seen = Column(DateTime, default=datetime.now)
+    # Когда рассылка обнаружила, что игрок заблокировал бота (None — доступен); сбрасывается при следующем визите
+    unreachable_at = Column(DateTime, nullable=True)
 
     stats = relationship("PlayerStats", uselist=False, back_populates="player")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -15,6 +15,10 @@ class PlayerStats(Base):
 
     rating = Column(Integer, default=1000)
 
+    # Накопительные итоги по завершенным PvP-матчам (для профиля без чтения всех матчей)
+    finished_matches = Column(Integer, default=0)
+    play_seconds = Column(Float, default=0)
+
     player = relationship("Player", back_populates="stats")
 
     def __repr__(self):
@@ -1,6 +1,8 @@
 from app.services import achievements_service
 from app.services import bot_ai
 from app.services import bot_game_service
+from app.services import density_targeting
+from app.services import fleet_pool
 from app.services import game_service
 from app.services import matchmaking_service
 from app.services import player_service
\ No newline at end of file
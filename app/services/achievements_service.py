@@ -2,83 +2,153 @@ from datetime import datetime, timedelta
 from typing import Type
 from sqlalchemy.orm import Session
 
-from app.models import Achievement, PlayerAchievement, Match, BotGameStats
+from app.models import Achievement, AchievementProgress, PlayerAchievement, Match, BotGameStats
 from app.config import ACHIEVEMENT_DEFINITIONS, ADMIN_ID
 from app.config import MOSCOW_TZ
 from app.db_utils.achievements import (
     seed_achievements,
-    get_achievements_by_code,
+    get_all_achievements,
     get_or_create_player_achievement,
     unlock_achievement,
     get_achievement_percentages,
+    update_achievement_progress,
 )
 
+# ID достижений по коду. Заполняется один раз при старте бота (load_achievements),
+# чтобы не сверять справочник достижений с БД после каждого матча
+_achievement_ids: dict[str, int] = {}
 
-def _unlock_by_code(db: Session, player_id: int, achievements_by_code: dict[str, Achievement], code: str) -> None:
+
+def load_achievements(db: Session) -> int:
+    """
+    Создает недостающие достижения из ACHIEVEMENT_DEFINITIONS и кеширует их ID по коду.
+    Вызывается один раз при старте бота.
+
+    Args:
+        db (Session): Активная сессия SQLAlchemy для работы с базой данных.
+
+    Returns:
+        int: Количество достижений в справочнике.
+    """
+    seed_achievements(db, ACHIEVEMENT_DEFINITIONS)
+    _achievement_ids.clear()
+    _achievement_ids.update({a.code: a.id for a in get_all_achievements(db)})
+    return len(_achievement_ids)
+
+
+def get_achievement_ids(db: Session, commit: bool = True) -> dict[str, int]:
+    """
+    Возвращает ID достижений по коду из кеша.
+
+    Если кеш не заполнен (например, при запуске вне бота), справочник читается из БД.
+    При commit=False новые достижения не зафиксированы и могут откатиться вместе с транзакцией,
+    поэтому в кеш они не попадают.
+
+    Args:
+        db (Session): Активная сессия SQLAlchemy для работы с базой данных.
+        commit (bool): Фиксировать ли созданные достижения сразу.
+
+    Returns:
+        dict[str, int]: Словарь {код: ID достижения}.
+    """
+    if _achievement_ids:
+        return _achievement_ids
+    if commit:
+        load_achievements(db)
+        return _achievement_ids
+    seed_achievements(db, ACHIEVEMENT_DEFINITIONS, commit=False)
+    return {a.code: a.id for a in get_all_achievements(db)}
+
+
+def _unlock_by_code(db: Session, player_id: int, achievement_ids: dict[str, int], code: str,
+                    commit: bool = True) -> None:
     """
     Разблокирует достижение по его коду для конкретного игрока.
 
-    Функция получает объект достижения по коду, создаёт запись PlayerAchievement,
+    Функция находит ID достижения по коду, создаёт запись PlayerAchievement,
     если её ещё нет, и помечает достижение как разблокированное.
 
     Args:
         db (Session): Активная сессия SQLAlchemy для работы с базой данных.
         player_id (int): ID игрока, которому нужно выдать достижение.
-        achievements_by_code (dict[str, Achievement]): Словарь достижений, где ключ — код, значение — объект Achievement.
+        achievement_ids (dict[str, int]): Словарь достижений, где ключ — код, значение — ID достижения.
         code (str): Уникальный код достижения (например, "fleet_marathon" или "speedrunner").
+        commit (bool): Фиксировать ли транзакцию сразу. При False изменения фиксирует вызывающий код.
 
     Returns:
         None
     """
-    achievement = achievements_by_code.get(code)
-    if not achievement:
+    achievement_id = achievement_ids.get(code)
+    if not achievement_id:
         return
-    link = get_or_create_player_achievement(db, player_id, achievement)
-    unlock_achievement(db, link)
+    link = get_or_create_player_achievement(db, player_id, achievement_id, commit=commit)
+    unlock_achievement(db, link, commit=commit)
 
 
 def evaluate_achievements_after_bot_game(db: Session, player_id: int) -> None:
     """
     Проверяет и назначает достижения после игр с ботами.
     """
-    seed_achievements(db, ACHIEVEMENT_DEFINITIONS)
-    achievements_by_code = get_achievements_by_code(db)
+    achievement_ids = get_achievement_ids(db)
 
     stats = {s.difficulty: s for s in db.query(BotGameStats).filter_by(player_id=player_id).all()}
     easy, medium, hard, super_hard = stats.get("easy"), stats.get("medium"), stats.get("hard"), stats.get("super_hard")
 
     # 1) full_captain_course — сыграй хотя бы 1 матч на каждом уровне с ботом
     if easy and medium and hard and super_hard and all(s.games_played > 0 for s in [easy, medium, hard, super_hard]):
-        _unlock_by_code(db, player_id, achievements_by_code, "full_captain_course")
+        _unlock_by_code(db, player_id, achievement_ids, "full_captain_course")
 
     # 2) fleet_marathon — суммарно 50 матчей с ботом
     total_games = sum(s.games_played for s in stats.values())
     if total_games >= 50:
-        _unlock_by_code(db, player_id, achievements_by_code, "fleet_marathon")
+        _unlock_by_code(db, player_id, achievement_ids, "fleet_marathon")
 
     # 7) easy_breeze — 20 побед на easy
     if easy and easy.wins >= 20:
-        _unlock_by_code(db, player_id, achievements_by_code, "easy_breeze")
+        _unlock_by_code(db, player_id, achievement_ids, "easy_breeze")
 
     # 8) medium_master — 10 побед на medium
     if medium and medium.wins >= 10:
-        _unlock_by_code(db, player_id, achievements_by_code, "medium_master")
+        _unlock_by_code(db, player_id, achievement_ids, "medium_master")
 
     # 9) hard_master — 5 побед на hard
     if hard and hard.wins >= 5:
-        _unlock_by_code(db, player_id, achievements_by_code, "hard_master")
+        _unlock_by_code(db, player_id, achievement_ids, "hard_master")
 
     # 10) super_hard_master — 3 победы на super_hard
     if super_hard and super_hard.wins >= 3:
-        _unlock_by_code(db, player_id, achievements_by_code, "super_hard_master")
+        _unlock_by_code(db, player_id, achievement_ids, "super_hard_master")
 
 
-def evaluate_achievements_after_multiplayer_match(db: Session, match: Type[Match]) -> None:
+def update_progress_after_multiplayer_match(db: Session, match: Type[Match],
+                                            commit: bool = True) -> dict[int, AchievementProgress]:
+    """
+    Обновляет счетчики прогресса достижений обоих игроков по итогу матча, не проверяя сами достижения.
+
+    Args:
+        db (Session): Активная сессия SQLAlchemy.
+        match (Match): Завершенный матч.
+        commit (bool): Зафиксировать транзакцию (при False — только flush).
+
+    Returns:
+        dict[int, AchievementProgress]: Счетчики прогресса по telegram_id игрока.
+    """
+    day = (match.ended_at or datetime.now(MOSCOW_TZ)).date()
+    return {
+        pid: update_achievement_progress(db, pid, match.winner_id == pid, match.result, day, commit=commit)
+        for pid in (match.player_1_id, match.player_2_id)
+    }
+
+
+def evaluate_achievements_after_multiplayer_match(db: Session, match: Type[Match], commit: bool = True) -> None:
     """
     Проверяет и назначает достижения после мультиплеерных матчей.
+    При commit=False ничего не фиксирует — так достижения попадают в ту же транзакцию, что и итог матча.
+
+    Серии побед, поражений и дней с матчами берутся из счетчиков AchievementProgress,
+    которые обновляются здесь же за O(1) на игрока — историю матчей читать не нужно.
     """
-    seed_achievements(db, ACHIEVEMENT_DEFINITIONS)
-    achievements_by_code = get_achievements_by_code(db)
+    achievement_ids = get_achievement_ids(db, commit=commit)
 
     if not match.ended_at or not match.started_at:
         db.refresh(match)
@@ -87,7 +157,7 @@ def evaluate_achievements_after_multiplayer_match(db: Session, match: Type[Match
 
     # 3) speedrunner — победа <= 60 секунд
     if match.winner_id and duration and duration <= timedelta(seconds=60) and match.result == "normal":
-        _unlock_by_code(db, match.winner_id, achievements_by_code, "speedrunner")
+        _unlock_by_code(db, match.winner_id, achievement_ids, "speedrunner", commit=commit)
 
     # 4) night_hunter — матч между 00:00 и 03:00 МСК
     # 5) morning_sailor — матч между 05:00 и 08:00 МСК
@@ -95,93 +165,32 @@ def evaluate_achievements_after_multiplayer_match(db: Session, match: Type[Match
         hour = match.started_at.hour
         for pid in [match.player_1_id, match.player_2_id]:
             if 0 <= hour < 3:
-                _unlock_by_code(db, pid, achievements_by_code, "night_hunter")
+                _unlock_by_code(db, pid, achievement_ids, "night_hunter", commit=commit)
             if 5 <= hour < 8:
-                _unlock_by_code(db, pid, achievements_by_code, "morning_sailor")
+                _unlock_by_code(db, pid, achievement_ids, "morning_sailor", commit=commit)
 
     # 6) win_streak_10 — 10 побед подряд в мультиплеере
     # 11) brave_loser — 5 поражений подряд (без сдачи)
-    def _get_recent_results(pid: int, limit: int = 20) -> list[tuple[bool, str]]:
-        rows = (
-            db.query(Match)
-            .filter(((Match.player_1_id == pid) | (Match.player_2_id == pid)) & (Match.ended_at.isnot(None)))
-            .order_by(Match.ended_at.desc())
-            .limit(limit)
-            .all()
-        )
-        out: list[tuple[bool, str]] = []
-        for m in rows:
-            is_win = m.winner_id == pid
-            out.append((is_win, m.result or ""))
-        return list(reversed(out))
-
-    for pid in [match.player_1_id, match.player_2_id]:
-        recent = _get_recent_results(pid, limit=30)
-
-        # победная серия
-        best_win_streak = 0
-        cur = 0
-        for is_win, _ in recent:
-            if is_win:
-                cur += 1
-                best_win_streak = max(best_win_streak, cur)
-            else:
-                cur = 0
-        if best_win_streak >= 10:
-            _unlock_by_code(db, pid, achievements_by_code, "win_streak_10")
-
-        # серия поражений без сдачи
-        best_lose_streak = 0
-        cur = 0
-        for is_win, result in recent:
-            if (not is_win) and (result != "surrender"):
-                cur += 1
-                best_lose_streak = max(best_lose_streak, cur)
-            else:
-                cur = 0
-        if best_lose_streak >= 5:
-            _unlock_by_code(db, pid, achievements_by_code, "brave_loser")
-
     # 12) week_streak — каждый день хотя бы 1 матч в течение 7 дней
-    def _has_7_day_streak(pid: int) -> bool:
-        rows = (
-            db.query(Match)
-            .filter(((Match.player_1_id == pid) | (Match.player_2_id == pid)) & (Match.ended_at.isnot(None)))
-            .order_by(Match.ended_at.desc())
-            .limit(100)
-            .all()
-        )
-        days: set[str] = set()
-        for m in rows:
-            d = (m.ended_at or m.started_at).date()
-            days.add(str(d))
-        today = datetime.now(MOSCOW_TZ).date()
-        for start_offset in range(0, 21):
-            ok = True
-            for i in range(7):
-                day = today - timedelta(days=start_offset + i)
-                if str(day) not in days:
-                    ok = False
-                    break
-            if ok:
-                return True
-        return False
-
-    for pid in [match.player_1_id, match.player_2_id]:
-        if _has_7_day_streak(pid):
-            _unlock_by_code(db, pid, achievements_by_code, "week_streak")
+    for pid, progress in update_progress_after_multiplayer_match(db, match, commit=commit).items():
+        if progress.win_streak >= 10:
+            _unlock_by_code(db, pid, achievement_ids, "win_streak_10", commit=commit)
+        if progress.brave_loss_streak >= 5:
+            _unlock_by_code(db, pid, achievement_ids, "brave_loser", commit=commit)
+        if progress.active_days >= 7:
+            _unlock_by_code(db, pid, achievement_ids, "week_streak", commit=commit)
 
     # 13) fan_dev — сыграй матч с разработчиком (@vladelo)
     if int(ADMIN_ID) in [match.player_1_id, match.player_2_id]:
         for pid in [match.player_1_id, match.player_2_id]:
-            _unlock_by_code(db, pid, achievements_by_code, "fan_dev")
+            _unlock_by_code(db, pid, achievement_ids, "fan_dev", commit=commit)
 
 
 def get_player_achievements(db: Session, player_id: int) -> list[dict]:
     """
     Возвращает все достижения с флагом разблокировки и статистикой процентов.
     """
-    seed_achievements(db, ACHIEVEMENT_DEFINITIONS)
+    get_achievement_ids(db)
     achievements = db.query(Achievement).all()
     links = db.query(PlayerAchievement).filter(PlayerAchievement.player_id == player_id).all()
     by_id = {l.achievement_id: l for l in links}
@@ -1,7 +1,8 @@
 import random
 from typing import List, Optional, Tuple
 
-from app.game_logic import BOARD_SIZE
+from app.game_logic import BOARD_SIZE, Board, ShotResult, ship_cells
+from app.services.density_targeting import DensityTargeting
 
 Coordinate = Tuple[int, int]
 
@@ -14,6 +15,8 @@ class BotAI:
     - шахматная схема
     - "знание" о координатах кораблей (читерство).
     Также реализована логика добивания корабля с корректным определением линии.
+    В режиме super_hard вместо шахматной схемы и случайных выстрелов используется карта плотности
+    вероятностей (DensityTargeting), которая сама ведет и поиск, и добивание.
     """
     # Вероятности для medium режима
     MEDIUM_RANDOM_PROBABILITY = 0.5  # 50% шанс на случайный выстрел
@@ -24,11 +27,9 @@ class BotAI:
     RANDOM_PROBABILITY = 0.4  # 40% вероятность случайного выбора
 
     # Вероятности для super_hard режима
-    SUPER_HARD_CHEAT_PROBABILITY = 0.3  # 30% вероятность читерства
-    SUPER_HARD_CHECKER_PROBABILITY = 0.4  # 40% вероятность шахматной схемы
-    SUPER_HARD_RANDOM_PROBABILITY = 0.3  # 30% вероятность случайного выбора
+    SUPER_HARD_CHEAT_PROBABILITY = 0.2  # 20% вероятность читерства, иначе — карта плотности
 
-    def __init__(self, difficulty: str, enemy_board: Optional[List[List[str]]] = None):
+    def __init__(self, difficulty: str, enemy_board: Optional[Board] = None):
         self.difficulty = difficulty  # easy | medium | hard
         self.tried: set[Coordinate] = set()
         self.targets: list[Coordinate] = []  # клетки для добивания
@@ -49,6 +50,9 @@ class BotAI:
         if difficulty in ["hard", "super_hard"] and enemy_board is not None:
             self._extract_ship_positions(enemy_board)
 
+        # Для super_hard — карта плотности вероятностей расположения оставшихся кораблей
+        self.density: Optional[DensityTargeting] = DensityTargeting() if difficulty == "super_hard" else None
+
     def reset_ship_hunt(self) -> None:
         """Сбрасывает состояние охоты на корабль после его уничтожения"""
         self.targets.clear()
@@ -95,18 +99,18 @@ class BotAI:
         if self.difficulty == "easy":
             return self._random_untried()
 
-        # 1. ПРИОРИТЕТ: Если есть цели для добивания — бьем туда
+        # 1. Для super_hard режима - продвинутая стратегия для доноров (добивание ведет карта плотности)
+        if self.difficulty == "super_hard":
+            return self._choose_super_hard_strategy()
+
+        # 2. ПРИОРИТЕТ: Если есть цели для добивания — бьем туда
         if self.targets:
             return self.targets.pop(0)
 
-        # 2. Для hard режима - выбор стратегии по независимым вероятностям
+        # 3. Для hard режима - выбор стратегии по независимым вероятностям
         if self.difficulty == "hard":
             return self._choose_hard_strategy()
 
-        # 3. Для super_hard режима - продвинутая стратегия для доноров
-        if self.difficulty == "super_hard":
-            return self._choose_super_hard_strategy()
-
         # 4. medium — 50 на 50: шахматные клетки или случайный выстрел
         if self.difficulty == "medium":
             if random.random() < self.MEDIUM_RANDOM_PROBABILITY:
@@ -119,7 +123,7 @@ class BotAI:
         # 5. fallback — случайно
         return self._random_untried()
 
-    def process_result(self, coord: Coordinate, hit: Optional[bool], ship_destroyed: bool) -> None:
+    def process_result(self, coord: Coordinate, hit: Optional[ShotResult], ship_destroyed: bool) -> None:
         """
         Обрабатывает результат выстрела:
         - Добавляет клетку в tried
@@ -129,6 +133,10 @@ class BotAI:
         was_targeting_shot = coord in self.targets
         self.tried.add(coord)
 
+        if self.density is not None:
+            self.density.record(coord, hit, ship_destroyed)
+            return
+
         # Easy уровень - никакой стратегии добивания
         if self.difficulty == "easy":
             return
@@ -163,13 +171,9 @@ class BotAI:
             if self.hit_sequence:
                 self._update_targets_after_miss(coord)
 
-    def _extract_ship_positions(self, enemy_board: List[List[str]]) -> None:
+    def _extract_ship_positions(self, enemy_board: Board) -> None:
         """Для hard уровня - извлекаем реальные позиции всех кораблей противника"""
-        self.ship_positions = set()
-        for x in range(BOARD_SIZE):
-            for y in range(BOARD_SIZE):
-                if enemy_board[x][y] == "🚢":
-                    self.ship_positions.add((x, y))
+        self.ship_positions = set(ship_cells(enemy_board))
 
     def _get_known_ship_position(self) -> Optional[Coordinate]:
         """Возвращает известную позицию корабля, если она еще не стреляна"""
@@ -206,31 +210,14 @@ class BotAI:
         return self._random_untried()
 
     def _choose_super_hard_strategy(self) -> Coordinate:
-        """Выбирает стратегию для super_hard режима (только для доноров)"""
-        possible_coords: List[Coordinate] = []
-
+        """Выбирает стратегию для super_hard режима (только для доноров): читерство или карта плотности"""
         # Повышенное читерство для доноров
         if random.random() < self.SUPER_HARD_CHEAT_PROBABILITY:
             cheat_coord = self._get_known_ship_position()
             if cheat_coord is not None:
-                possible_coords.append(cheat_coord)
-
-        # Шахматная схема
-        if random.random() < self.SUPER_HARD_CHECKER_PROBABILITY:
-            checker_coord = self._random_checker_untried()
-            if checker_coord is not None:
-                possible_coords.append(checker_coord)
+                return cheat_coord
 
-        # Рандом
-        if random.random() < self.SUPER_HARD_RANDOM_PROBABILITY:
-            random_coord = self._random_untried()
-            possible_coords.append(random_coord)
-
-        if possible_coords:
-            return random.choice(possible_coords)
-
-        # Fallback
-        return self._random_untried()
+        return self.density.choose()
 
     def _update_targets_by_direction(self) -> None:
         """Обновляет цели для добивания на основе направления корабля"""
@@ -1,54 +1,60 @@
 import asyncio
 from typing import Optional
 from aiogram.types import Message, ReplyKeyboardRemove
+from sqlalchemy.orm import Session
 
 from app.state.in_memory import games
-from app.game_logic import create_empty_board, place_all_ships, process_shot, check_victory, print_board
-from app.utils.game_id import generate_game_id
-from app.utils.none_username import safe_username
+from app.storage import create_bot_game, delete_game, get_player_game_id
+from app.game_logic import BOARD_SIZE, process_shot, print_board, is_cell_opened, ShotResult
+from app.state.constants import COORDINATES, BOT_TURN_BATCHING, BOT_TURN_DELAYS, DEFAULT_BOT_TURN_DELAY
 from app.keyboards import enemy_board_keyboard, after_game_menu
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.db_utils.bot_stats import increment_bot_game_result
 from app.services.bot_ai import BotAI
 from app.services.achievements_service import evaluate_achievements_after_bot_game
+from app.services.outbox import outbox
+from app.services.game_service import remember_message_id
 from app.logger import setup_logger
 from app.messages.texts import (
     SUCCESSFUL_SHOT, BAD_SHOT, YOUR_BOARD_TEXT_AFTER_SUCCESS_SHOT, YOUR_BOARD_TEXT_AFTER_BAD_SHOT,
     WINNER, LOSER, AD_AFTER_GAME, BOT_USERNAME, LOSER_SUR, INVALID_GAME_DATA, BAD_COORDINATES, NOT_YOUR_TURN,
-    ALREADY_USED_COORDINATES
+    ALREADY_USED_COORDINATES, YOUR_BOARD_TEXT_AFTER_BOT_TURN, YOUR_BOARD_TEXT_AFTER_BOT_WIN, BOT_SHOT_MISS,
+    BOT_SHOT_HIT, BOT_SHOT_SUNK
 )
 
 logger = setup_logger(__name__)
 
 
+def _save_bot_game_result(db: Session, user_id: int, difficulty: str, is_win: bool) -> None:
+    """
+    Записывает результат игры с ботом и проверяет достижения.
+    Синхронная функция — вызывается через run_db в пуле потоков БД.
+    """
+    increment_bot_game_result(db, player_id=user_id, difficulty=difficulty, is_win=is_win)
+    try:
+        evaluate_achievements_after_bot_game(db, user_id)
+    except Exception:
+        pass
+
+
+async def _save_bot_game_result_safe(user_id: int, difficulty: Optional[str], is_win: bool, reason: str) -> None:
+    """
+    Обновляет bot-статистику игрока вне event loop; ошибки только логируются.
+
+    :param user_id: ID игрока.
+    :param difficulty: Уровень сложности бота.
+    :param is_win: True, если игрок победил.
+    :param reason: Причина завершения для лога ('win', 'lose', 'surrender').
+    """
+    try:
+        await run_db(_save_bot_game_result, user_id, difficulty or "easy", is_win)
+    except Exception as e:
+        logger.exception(f"Не удалось обновить bot-статистику ({reason}): {e}")
+
+
 def start_bot_game(user_id: int, username: Optional[str], difficulty: str) -> str:
-    # Создаем доски
-    human_board = create_empty_board()
-    bot_board = create_empty_board()
-    place_all_ships(human_board)
-    place_all_ships(bot_board)
-
-    # Регистрируем игру
-    game_id = generate_game_id()
-    bot_id = -abs(hash((user_id, game_id)))  # отрицательный идентификатор для бота в памяти
-
-    games[game_id] = {
-        "player1": user_id,
-        "player2": bot_id,
-        "bot_id": bot_id,
-        "is_bot_game": True,
-        "difficulty": difficulty,
-        "boards": {user_id: human_board, bot_id: bot_board},
-        "turn": user_id,
-        "usernames": {
-            user_id: safe_username(username, "Игрок"),
-            bot_id: "vladelo_sea_battle_bot",
-        },
-        "message_ids": {},
-        "bot_state": {
-            "ai": BotAI(difficulty, human_board),
-        },
-    }
+    # Создаем доски и регистрируем игру вместе с индексом игрока
+    game_id = create_bot_game(user_id, username, difficulty)
 
     logger.info(f"🤖 Игрок @{username} создал игру с ботом, сложность: {difficulty}, game id: {game_id}")
     return game_id
@@ -58,20 +64,16 @@ async def handle_player_shot_vs_bot(message: Message) -> None:
     user_id = message.from_user.id
 
     # Найдем игру с ботом для пользователя
-    game_id: Optional[str] = None
-    for gid, g in games.items():
-        if g.get("is_bot_game") and (g.get("player1") == user_id or g.get("player2") == user_id):
-            game_id = gid
-            break
+    game_id = get_player_game_id(user_id)
 
-    if not game_id or game_id not in games:
+    if not game_id or game_id not in games or not games[game_id].is_bot_game:
         await message.answer(INVALID_GAME_DATA)
         return
 
     game = games[game_id]
-    bot_id = game["bot_id"]
+    bot_id = game.bot_id
 
-    if game["turn"] != user_id:
+    if game.turn != user_id:
         await message.answer(NOT_YOUR_TURN)
         return
 
@@ -87,135 +89,199 @@ async def handle_player_shot_vs_bot(message: Message) -> None:
         return
 
     # Игрок стреляет по доске бота
-    bot_board = game["boards"][bot_id]
+    bot_board = game.board_of(bot_id)
 
     # Проверяем, стрелял ли игрок уже по этой клетке
-    cell_value = bot_board[x][y]
-    if cell_value in ("❌", "💥"):
+    if is_cell_opened(bot_board, x, y):
         await message.answer(ALREADY_USED_COORDINATES)
         return
 
-    hit = process_shot(bot_board, x, y)
+    result = process_shot(bot_board, x, y)
 
-    if check_victory(bot_board):
+    if result is ShotResult.VICTORY:
         # Игрок победил
         # Обновляем статистику игр с ботом (победа)
-        try:
-            with db_session() as db:
-                increment_bot_game_result(db, player_id=user_id, difficulty=game.get("difficulty", "easy"), is_win=True)
-                try:
-                    evaluate_achievements_after_bot_game(db, user_id)
-                except Exception:
-                    pass
-        except Exception as e:
-            logger.exception(f"Не удалось обновить bot-статистику (win): {e}")
-
-        human_board = game["boards"].get(bot_id, '')
-
-        games.pop(game_id, None)
-        await message.bot.send_message(user_id,
-                                       WINNER.format(board=print_board(human_board), username=BOT_USERNAME),
-                                       parse_mode="html",
-                                       reply_markup=ReplyKeyboardRemove())
-        await message.bot.send_message(user_id,
-                                       AD_AFTER_GAME, parse_mode="html", disable_web_page_preview=True,
-                                       reply_markup=after_game_menu())
+        human_board = game.board_of(bot_id)
+
+        delete_game(game_id)
+        await _save_bot_game_result_safe(user_id, game.difficulty, is_win=True, reason="win")
+        outbox.send_message(message.bot, user_id,
+                            WINNER.format(board=print_board(human_board), username=BOT_USERNAME),
+                            parse_mode="html",
+                            reply_markup=ReplyKeyboardRemove())
+        outbox.send_message(message.bot, user_id,
+                            AD_AFTER_GAME, parse_mode="html", disable_web_page_preview=True,
+                            reply_markup=after_game_menu())
         return
 
-    if hit:
-        msg = await message.bot.send_message(
-            chat_id=user_id,
-            text=SUCCESSFUL_SHOT,
-            parse_mode="html",
-            reply_markup=enemy_board_keyboard(game_id, bot_id)
-        )
-    else:
+    if not result:
         # Передача хода боту
-        game["turn"] = bot_id
+        game.turn = bot_id
 
-        msg = await message.bot.send_message(
+    # Ошибка отправки уже записана в лог outbox и не должна останавливать игру: иначе после промаха
+    # ход остался бы у бота, а бот так и не походил бы
+    msg, = await asyncio.gather(
+        outbox.send_message(
+            message.bot,
             chat_id=user_id,
-            text=BAD_SHOT,
+            text=SUCCESSFUL_SHOT if result else BAD_SHOT,
             parse_mode="html",
             reply_markup=enemy_board_keyboard(game_id, bot_id)
-        )
+        ),
+        return_exceptions=True,
+    )
+    # Обновим message_id игрока
+    remember_message_id(game, user_id, msg)
 
+    if not result:
         # Ход бота (пока ход не вернется игроку или игра не закончится)
         await _bot_turn_loop(message, game_id)
 
-    # Обновим message_ids
-    game.setdefault("message_ids", {})
-    game["message_ids"][user_id] = msg.message_id
-
 
 async def _bot_turn_loop(message: Message, game_id: str) -> None:
+    """
+    Выполняет ход бота: в пакетном режиме (BOT_TURN_BATCHING) — одним сообщением за весь ход,
+    иначе — отдельным сообщением на каждый выстрел.
+
+    :param message: Сообщение игрока, после которого ход перешел боту.
+    :param game_id: ID игры.
+    """
+    if BOT_TURN_BATCHING:
+        await _bot_turn_batched(message, game_id)
+    else:
+        await _bot_turn_per_shot(message, game_id)
+
+
+def _bot_turn_delay(difficulty: Optional[str]) -> float:
+    """Возвращает задержку хода бота для уровня сложности."""
+    return BOT_TURN_DELAYS.get(difficulty or "easy", DEFAULT_BOT_TURN_DELAY)
+
+
+async def _finish_bot_victory(message: Message, game_id: str) -> None:
+    """
+    Завершает игру победой бота: обновляет статистику, удаляет игру и отправляет итоговые сообщения.
+
+    :param message: Сообщение игрока.
+    :param game_id: ID игры.
+    """
+    game = games[game_id]
+    user_id = game.player1.id
+    bot_board = game.board_of(game.bot_id)
+
+    delete_game(game_id)
+    await _save_bot_game_result_safe(user_id, game.difficulty, is_win=False, reason="lose")
+    outbox.send_message(message.bot, user_id,
+                        LOSER.format(board=print_board(bot_board), username=BOT_USERNAME),
+                        parse_mode="html",
+                        reply_markup=ReplyKeyboardRemove())
+    outbox.send_message(message.bot, user_id, AD_AFTER_GAME, parse_mode="html",
+                        disable_web_page_preview=True, reply_markup=after_game_menu())
+
+
+async def _bot_turn_batched(message: Message, game_id: str) -> None:
+    """
+    Считает весь ход бота сразу (до промаха или победы), выдерживает одну паузу
+    и отправляет игроку одно сообщение со сводкой выстрелов и полем.
+    """
+    game = games.get(game_id)
+    if not game:
+        return
+
+    user_id = game.player1.id
+    bot_id = game.bot_id
+    ai: BotAI = game.bot_ai
+    human_board = game.player1.board
+
+    shots = []
+    result = None
+    while result is not ShotResult.MISS and result is not ShotResult.VICTORY:
+        x, y = ai.choose_shot()
+        result = process_shot(human_board, x, y)
+        ai.process_result((x, y), result, result in (ShotResult.SUNK, ShotResult.VICTORY))
+        if result is None:
+            # Некорректный ход (клетка уже открыта) — игрок его не видит
+            continue
+        if result is ShotResult.MISS:
+            mark = BOT_SHOT_MISS
+        elif result is ShotResult.HIT:
+            mark = BOT_SHOT_HIT
+        else:
+            mark = BOT_SHOT_SUNK
+        shots.append(f"{COORDINATES[x * BOARD_SIZE + y]} {mark}")
+
+    await asyncio.sleep(_bot_turn_delay(game.difficulty))
+
+    # Пока бот «думал», игрок мог сдаться
+    if games.get(game_id) is not game:
+        return
+
+    if result is ShotResult.VICTORY:
+        outbox.send_message(
+            message.bot,
+            chat_id=user_id,
+            text=YOUR_BOARD_TEXT_AFTER_BOT_WIN.format(shots=", ".join(shots), board=print_board(human_board)),
+            parse_mode="html"
+        )
+        await _finish_bot_victory(message, game_id)
+        return
+
+    # Мимо — ход переходит игроку
+    game.turn = user_id
+    outbox.send_message(
+        message.bot,
+        chat_id=user_id,
+        text=YOUR_BOARD_TEXT_AFTER_BOT_TURN.format(shots=", ".join(shots), board=print_board(human_board)),
+        parse_mode="html",
+        reply_markup=enemy_board_keyboard(game_id, bot_id)
+    )
+
+
+async def _bot_turn_per_shot(message: Message, game_id: str) -> None:
+    """Выполняет ход бота с паузой и отдельным сообщением на каждый выстрел."""
     game = games.get(game_id)
     if not game:
         return
 
-    user_id = game["player1"] if game["player1"] != game["bot_id"] else game["player2"]
-    bot_id = game["bot_id"]
-    ai: BotAI = game["bot_state"]["ai"]
+    user_id = game.player1.id
+    bot_id = game.bot_id
+    ai: BotAI = game.bot_ai
+    delay = _bot_turn_delay(game.difficulty)
 
-    human_board = game["boards"][user_id]
+    human_board = game.player1.board
 
-    while game["turn"] == bot_id:
+    while game.turn == bot_id:
         x, y = ai.choose_shot()
 
-        # Сохраняем состояние доски до выстрела для определения уничтожения корабля
-        board_before = [row[:] for row in human_board]
         result = process_shot(human_board, x, y)
-
-        # Определяем, был ли корабль уничтожен, сравнивая состояние доски до и после выстрела
-        ship_destroyed = False
-        if result:  # Если попали
-            # Проверяем, появились ли новые "❌" вокруг попадания (признак уничтожения корабля)
-            for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < 10 and 0 <= ny < 10 and
-                        board_before[nx][ny] == "⬜" and human_board[nx][ny] == "❌"):
-                    ship_destroyed = True
-                    break
+        ship_destroyed = result in (ShotResult.SUNK, ShotResult.VICTORY)
 
         ai.process_result((x, y), result, ship_destroyed)
-        await asyncio.sleep(0.9)
-        if result is True:
+        await asyncio.sleep(delay)
+
+        # Пока бот «думал», игрок мог сдаться
+        if games.get(game_id) is not game:
+            return
+
+        if result:
             # По игроку попали — бот ходит снова
-            await message.bot.send_message(
+            outbox.send_message(
+                message.bot,
                 chat_id=user_id,
                 text=YOUR_BOARD_TEXT_AFTER_SUCCESS_SHOT.format(board=print_board(human_board)),
                 parse_mode="html",
                 reply_markup=enemy_board_keyboard(game_id, bot_id)
             )
 
-            if check_victory(human_board):
+            if result is ShotResult.VICTORY:
                 # Бот победил -> поражение игрока
-                try:
-                    with db_session() as db:
-                        increment_bot_game_result(db, player_id=user_id, difficulty=game.get("difficulty", "easy"),
-                                                  is_win=False)
-                        try:
-                            evaluate_achievements_after_bot_game(db, user_id)
-                        except Exception:
-                            pass
-                except Exception as e:
-                    logger.exception(f"Не удалось обновить bot-статистику (lose): {e}")
-
-                human_board = game["boards"].get(bot_id, '')
-
-                games.pop(game_id, None)
-                await message.bot.send_message(user_id,
-                                               LOSER.format(board=print_board(human_board), username=BOT_USERNAME),
-                                               parse_mode="html",
-                                               reply_markup=ReplyKeyboardRemove())
-                await message.bot.send_message(user_id, AD_AFTER_GAME, parse_mode="html",
-                                               disable_web_page_preview=True, reply_markup=after_game_menu())
+                await _finish_bot_victory(message, game_id)
                 return
 
-        elif result is False:
+        elif result is ShotResult.MISS:
             # Мимо — ход переходит игроку
-            game["turn"] = user_id
-            await message.bot.send_message(
+            game.turn = user_id
+            outbox.send_message(
+                message.bot,
                 chat_id=user_id,
                 text=YOUR_BOARD_TEXT_AFTER_BAD_SHOT.format(board=print_board(human_board)),
                 parse_mode="html",
@@ -224,53 +290,34 @@ async def _bot_turn_loop(message: Message, game_id: str) -> None:
             break
         else:
             # Некорректный ход — помечаем клетку и продолжаем
-            game["turn"] = bot_id
+            game.turn = bot_id
 
 
 async def handle_surrender_vs_bot(message: Message) -> None:
     user_id = message.from_user.id
-    game_id: Optional[str] = None
-    for gid, g in games.items():
-        if g.get("is_bot_game") and (g.get("player1") == user_id or g.get("player2") == user_id):
-            game_id = gid
-            break
+    game_id = get_player_game_id(user_id)
 
-    if not game_id or game_id not in games:
+    if not game_id or game_id not in games or not games[game_id].is_bot_game:
         await message.answer(INVALID_GAME_DATA)
         return
 
-    # Сдача — считаем поражением игрока
-    try:
-        game = games.get(game_id)
-        if game:
-            with db_session() as db:
-                increment_bot_game_result(db, player_id=user_id, difficulty=game.get("difficulty", "easy"),
-                                          is_win=False)
-                try:
-                    evaluate_achievements_after_bot_game(db, user_id)
-                except Exception:
-                    pass
-    except Exception as e:
-        logger.exception(f"Не удалось обновить bot-статистику (surrender): {e}")
+    game = games[game_id]
+    human_board = game.board_of(game.bot_id)
 
-    human_board = ''
-    try:
-        game = games.get(game_id)
-        bot_id = game["bot_id"]
-        if game:
-            human_board = game["boards"].get(bot_id, '')
-    except Exception:
-        pass
+    delete_game(game_id)
 
-    games.pop(game_id, None)
+    # Сдача — считаем поражением игрока
+    await _save_bot_game_result_safe(user_id, game.difficulty, is_win=False, reason="surrender")
 
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         user_id,
         LOSER_SUR.format(board=print_board(human_board), username=BOT_USERNAME),
         parse_mode="html",
         reply_markup=ReplyKeyboardRemove()
     )
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         user_id,
         AD_AFTER_GAME,
         parse_mode="html",
@@ -0,0 +1,282 @@
+import asyncio
+import time
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.types import ReplyKeyboardRemove
+
+from app.config import BROADCAST_RATE, BROADCAST_WORKERS, BROADCAST_CHUNK, BROADCAST_SKIP_UNREACHABLE
+from app.db_utils.broadcast import (
+    get_next_broadcast_job,
+    start_broadcast_job,
+    get_pending_recipients,
+    record_broadcast_deliveries,
+    finish_broadcast_job,
+)
+from app.dependencies import run_db
+from app.logger import setup_logger
+from app.services.outbox import telegram_limiter
+from app.utils.rate_limit import TokenBucket
+
+logger = setup_logger(__name__)
+
+# Сколько раз повторять отправку одному получателю после RetryAfter
+MAX_RETRIES = 3
+
+# Доля рассылок в общем лимите бота: все отправители (и одновременные рассылки) берут токены из одного ведра,
+# а затем еще и из telegram_limiter, общего с игровыми сообщениями
+broadcast_limiter = TokenBucket(BROADCAST_RATE)
+
+
+class BroadcastProgress:
+    """
+    Ход задания рассылки: сколько получателей всего, скольким отправлено и сколько ошибок
+    (blocked — сколько из них заблокировали бота).
+    Обновляется отправителями, читается обработчиком для отчета администратору.
+    Для продолженного после перезапуска задания скорость считается только по отправкам этого запуска.
+    """
+
+    def __init__(self, total: int, sent: int = 0, failed: int = 0, blocked: int = 0) -> None:
+        self.total = total
+        self.sent = sent
+        self.failed = failed
+        self.blocked = blocked
+        self.finished = False
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self._initial = sent + failed
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def rate(self) -> float:
+        """Средняя скорость обработки получателей в этом запуске, сообщений в секунду."""
+        elapsed = self.elapsed or time.monotonic() - self.started
+        return (self.processed - self._initial) / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> Optional[float]:
+        """Оценка оставшегося времени в секундах (None, пока скорость неизвестна)."""
+        rate = self.rate
+        if not rate:
+            return None
+        return max(self.total - self.processed, 0) / rate
+
+
+def broadcast_text(text: str) -> str:
+    """Текст сообщения рассылки с приглашением начать игру."""
+    return (f"{text}\n\n"
+            f"🎮 <b>Начните играть командой /start</b>")
+
+
+async def _deliver(bot: Bot, chat_id: str, text: str, limiter: TokenBucket, global_limiter: TokenBucket) -> str:
+    """
+    Отправляет сообщение рассылки одному получателю с учетом лимита рассылок и общего лимита бота.
+    При RetryAfter на паузу ставятся оба лимита (и с ними игровые сообщения), а отправка повторяется.
+
+    :return: Статус отправки: sent — доставлено, blocked — пользователь заблокировал бота, failed — другая ошибка.
+    """
+    for _ in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        await global_limiter.acquire()
+        try:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode="HTML",
+                reply_markup=ReplyKeyboardRemove()
+            )
+            return "sent"
+
+        except TelegramRetryAfter as e:
+            # Telegram просит подождать — останавливаем все отправки бота, а не только этот поток
+            limiter.pause(e.retry_after)
+            global_limiter.pause(e.retry_after)
+            logger.warning(f"⏳ Превышен лимит Telegram, рассылка приостановлена на {e.retry_after} с")
+
+        except TelegramForbiddenError:
+            # Пользователь заблокировал бота
+            logger.warning(f"❌ Пользователь {chat_id} заблокировал бота")
+            return "blocked"
+
+        except TelegramBadRequest as e:
+            # Другие ошибки API
+            logger.error(f"❌ Ошибка при отправке пользователю {chat_id}: {e}")
+            return "failed"
+
+        except Exception as e:
+            # Неожиданные ошибки
+            logger.error(f"❌ Неожиданная ошибка при отправке пользователю {chat_id}: {e}")
+            return "failed"
+
+    logger.error(f"❌ Не удалось отправить пользователю {chat_id}: превышено число повторов после RetryAfter")
+    return "failed"
+
+
+class BroadcastWorker:
+    """
+    Фоновый отправитель заданий рассылки из таблицы broadcast_jobs.
+
+    Задания выполняются по одному: сначала прерванное перезапуском, затем по очереди.
+    Получатели читаются из БД порциями по chunk (keyset-пагинация по players.id) и через ограниченную
+    очередь раздаются workers параллельным отправителям; скорость рассылок ограничена limiter,
+    а вместе с игровыми сообщениями — global_limiter.
+    Результаты отправки записываются в broadcast_deliveries пакетами раз в flush_interval секунд,
+    после обработки порции курсор задания сдвигается. После перезапуска задание продолжается с курсора,
+    а получатели с записанным результатом пропускаются.
+
+    Доставка «хотя бы один раз»: результат записывается после отправки, поэтому при аварийном падении
+    (при штатной остановке stop записывает все) сообщение повторно получат те, кому оно ушло за последние
+    flush_interval секунд, — около flush_interval * BROADCAST_RATE человек (5 при настройках по умолчанию).
+    Запись до отправки, наоборот, оставила бы этих получателей без сообщения.
+
+    Заблокировавшие бота игроки отмечаются недоступными при записи результатов; при skip_unreachable
+    следующие рассылки их не читают и не тратят на них лимит скорости.
+    """
+
+    def __init__(self, workers: int, chunk: int, limiter: TokenBucket, global_limiter: TokenBucket,
+                 flush_interval: float = 0.2, skip_unreachable: bool = True) -> None:
+        self.workers = workers
+        self.chunk = chunk
+        self.limiter = limiter
+        self.global_limiter = global_limiter
+        self.flush_interval = flush_interval
+        self.skip_unreachable = skip_unreachable
+        self.progress: dict[int, BroadcastProgress] = {}
+        self.bot: Optional[Bot] = None
+        self._results: list[tuple[int, str]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        """Сообщает, что в очереди появилось новое задание."""
+        self._wakeup.set()
+
+    def start(self, bot: Bot) -> None:
+        """
+        Запускает фоновую задачу; незавершенные задания продолжаются сразу.
+
+        :param bot: Объект бота, через который отправляются сообщения.
+        """
+        self.bot = bot
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._wakeup.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Останавливает отправку: новые получатели не берутся, уже взятые дожидаются отправки
+        (не дольше timeout секунд), результаты записываются в БД. Задание продолжится после запуска.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            logger.error(f"❌ Ошибка при остановке рассылки: {e}")
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                while not self._stopping.is_set() and (job := await run_db(get_next_broadcast_job)):
+                    await self._run_job(job["id"])
+            except Exception as e:
+                logger.exception(f"❌ Ошибка при выполнении рассылки, повтор через 30 с: {e}")
+                await asyncio.sleep(30)
+                self._wakeup.set()
+
+    async def _flush(self, job_id: int, cursor: Optional[int] = None) -> None:
+        """
+        Записывает накопленные результаты отправки (и новый курсор) в БД.
+        Если запись не удалась, результаты возвращаются в буфер и будут записаны следующим сбросом.
+        """
+        async with self._flush_lock:
+            results, self._results = self._results, []
+            if not results and cursor is None:
+                return
+            try:
+                await run_db(record_broadcast_deliveries, job_id, results, cursor)
+            except Exception as e:
+                self._results = results + self._results
+                logger.error(f"❌ Не удалось записать результаты рассылки #{job_id} ({len(results)}): {e}")
+
+    async def _flusher(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.shield(self._flush(job_id))
+
+    async def _run_job(self, job_id: int) -> None:
+        job = await run_db(start_broadcast_job, job_id, self.skip_unreachable)
+        progress = BroadcastProgress(job["total"], job["sent"], job["failed"], job["blocked"])
+        self.progress[job_id] = progress
+        text = broadcast_text(job["text"])
+        if progress.processed:
+            logger.info(f"📊 Рассылка #{job_id} продолжается: {progress.processed} из {progress.total} уже обработано")
+        else:
+            logger.info(f"📊 Рассылка #{job_id} началась: {progress.total} пользователей")
+
+        queue: asyncio.Queue[Optional[tuple[int, str]]] = asyncio.Queue(maxsize=self.workers * 2)
+
+        async def sender() -> None:
+            while (recipient := await queue.get()) is not None:
+                player_id, chat_id = recipient
+                status = await _deliver(self.bot, chat_id, text, self.limiter, self.global_limiter)
+                if status == "sent":
+                    progress.sent += 1
+                else:
+                    progress.failed += 1
+                    if status == "blocked":
+                        progress.blocked += 1
+                self._results.append((player_id, status))
+                queue.task_done()
+            queue.task_done()
+
+        senders = [asyncio.create_task(sender()) for _ in range(self.workers)]
+        flusher = asyncio.create_task(self._flusher(job_id))
+        completed = False
+        try:
+            cursor = job["cursor"]
+            while page := await run_db(get_pending_recipients, job_id, cursor, self.chunk, self.skip_unreachable):
+                for recipient in page:
+                    if self._stopping.is_set():
+                        break
+                    await queue.put(recipient)
+                # Курсор сдвигается, только когда вся порция отправлена и записана
+                await queue.join()
+                if self._stopping.is_set():
+                    break
+                cursor = page[-1][0]
+                await self._flush(job_id, cursor)
+            else:
+                completed = True
+            for _ in senders:
+                await queue.put(None)
+            await asyncio.gather(*senders)
+        finally:
+            for task in senders:
+                task.cancel()
+            flusher.cancel()
+            await self._flush(job_id)
+
+        if completed:
+            await run_db(finish_broadcast_job, job_id)
+            progress.elapsed = time.monotonic() - progress.started
+            progress.finished = True
+            logger.info(f"📊 Рассылка #{job_id} завершена: {progress.sent}/{progress.total} успешно "
+                        f"({progress.rate:.1f} сообщ./с)")
+
+
+broadcast_worker = BroadcastWorker(BROADCAST_WORKERS, BROADCAST_CHUNK, broadcast_limiter, telegram_limiter,
+                                   skip_unreachable=BROADCAST_SKIP_UNREACHABLE)
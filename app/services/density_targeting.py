@@ -0,0 +1,159 @@
+import random
+from typing import List, Optional, Tuple
+
+from app.game_logic import (
+    BOARD_SIZE, CELL_MASKS, FIRST_COLUMN_MASK, FLEET_SIZES, FULL_MASK, LAST_COLUMN_MASK, NEIGHBOURS_MASKS,
+    PLACEMENTS, ShotResult,
+)
+
+Coordinate = Tuple[int, int]
+
+# Для каждого размера корабля: клетки каждого размещения и индекс «клетка -> размещения, которые её занимают»
+PLACEMENT_CELLS = {
+    size: [[cell for cell in range(BOARD_SIZE * BOARD_SIZE) if ship & CELL_MASKS[cell]] for ship, _ in placements]
+    for size, placements in PLACEMENTS.items()
+}
+CELL_PLACEMENTS = {
+    size: [[index for index, cells in enumerate(placement_cells) if cell in cells]
+           for cell in range(BOARD_SIZE * BOARD_SIZE)]
+    for size, placement_cells in PLACEMENT_CELLS.items()
+}
+
+
+def _mask_cells(mask: int) -> List[int]:
+    """Возвращает индексы клеток, отмеченных в маске."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+class DensityTargeting:
+    """
+    Выбор выстрела по карте плотности вероятностей.
+
+    Для каждой клетки хранится, сколько возможных размещений оставшихся кораблей её накрывают
+    (с учетом количества кораблей каждого размера). Карта обновляется инкрементально: промах или
+    открытая вокруг потопленного корабля клетка вычеркивает только размещения, проходящие через неё.
+    - В режиме поиска (нет недобитых попаданий) бот стреляет в клетку с наибольшей плотностью.
+    - В режиме добивания учитываются только размещения, накрывающие недобитые попадания;
+      размещение, накрывающее k попаданий, весит в HIT_WEIGHT^k раз больше.
+    """
+    HIT_WEIGHT = 50
+
+    def __init__(self, fleet_sizes: Tuple[int, ...] = FLEET_SIZES):
+        self.remaining: dict[int, int] = {}
+        for size in fleet_sizes:
+            self.remaining[size] = self.remaining.get(size, 0) + 1
+        self.alive: dict[int, set[int]] = {size: set(range(len(PLACEMENTS[size]))) for size in self.remaining}
+        self.blocked = 0  # клетки, где кораблей точно нет (промахи, потопленные корабли и клетки вокруг них)
+        self.shot = 0  # клетки, по которым уже стреляли
+        self.hits = 0  # попадания по ещё не потопленным кораблям
+
+        self.density = [0] * (BOARD_SIZE * BOARD_SIZE)
+        for size, count in self.remaining.items():
+            for cells in PLACEMENT_CELLS[size]:
+                for cell in cells:
+                    self.density[cell] += count
+
+    def record(self, coord: Coordinate, result: Optional[ShotResult], ship_destroyed: bool) -> None:
+        """
+        Учитывает результат выстрела и обновляет карту плотности.
+
+        :param coord: Координаты выстрела.
+        :param result: Результат process_shot (None — клетка уже была открыта).
+        :param ship_destroyed: True, если выстрел потопил корабль.
+        """
+        bit = CELL_MASKS[coord[0] * BOARD_SIZE + coord[1]]
+        self.shot |= bit
+        if not result:
+            self._block(bit)
+            return
+
+        self.hits |= bit
+        if ship_destroyed:
+            ship = self._hit_component(bit)
+            self.hits &= ~ship
+            self._sink(ship)
+
+    def choose(self) -> Coordinate:
+        """Возвращает клетку с наибольшей вероятностью попадания (при равенстве — случайную из лучших)."""
+        available = FULL_MASK & ~(self.shot | self.blocked)
+        if self.hits:
+            scores = self._target_scores(available)
+            if scores:
+                return self._pick_best(scores)
+
+        density = self.density
+        return self._pick_best({cell: density[cell] for cell in _mask_cells(available)})
+
+    def _target_scores(self, available: int) -> dict[int, int]:
+        """Считает плотность только по размещениям, накрывающим недобитые попадания."""
+        scores: dict[int, int] = {}
+        hits = self.hits
+        for size, count in self.remaining.items():
+            if not count:
+                continue
+            placements = PLACEMENTS[size]
+            for index in self.alive[size]:
+                overlap = placements[index][0] & hits
+                if not overlap:
+                    continue
+                weight = count * self.HIT_WEIGHT ** bin(overlap).count("1")
+                for cell in _mask_cells(placements[index][0] & available):
+                    scores[cell] = scores.get(cell, 0) + weight
+        return scores
+
+    @staticmethod
+    def _pick_best(scores: dict[int, int]) -> Coordinate:
+        best = max(scores.values())
+        cell = random.choice([cell for cell, score in scores.items() if score == best])
+        return divmod(cell, BOARD_SIZE)
+
+    def _hit_component(self, bit: int) -> int:
+        """Возвращает маску недобитых попаданий, связанных с клеткой bit по вертикали и горизонтали."""
+        ship = bit
+        while True:
+            grown = (ship
+                     | ((ship << 1) & ~FIRST_COLUMN_MASK)
+                     | ((ship >> 1) & ~LAST_COLUMN_MASK)
+                     | (ship << BOARD_SIZE)
+                     | (ship >> BOARD_SIZE)) & self.hits
+            if grown == ship:
+                return ship
+            ship = grown
+
+    def _sink(self, ship: int) -> None:
+        """Убирает потопленный корабль из оставшихся и вычеркивает его клетки и клетки вокруг."""
+        cells = _mask_cells(ship)
+        size = len(cells)
+        if self.remaining.get(size):
+            # У всех живых размещений этого размера вес уменьшается на единицу
+            self.remaining[size] -= 1
+            for index in self.alive[size]:
+                for cell in PLACEMENT_CELLS[size][index]:
+                    self.density[cell] -= 1
+
+        halo = ship
+        for cell in cells:
+            halo |= NEIGHBOURS_MASKS[cell]
+        self._block(halo)
+
+    def _block(self, mask: int) -> None:
+        """Отмечает клетки как пустые и вычитает из карты размещения, которые через них проходят."""
+        new = mask & ~self.blocked
+        if not new:
+            return
+        self.blocked |= new
+        density = self.density
+        for cell in _mask_cells(new):
+            for size, alive in self.alive.items():
+                weight = self.remaining[size]
+                for index in CELL_PLACEMENTS[size][cell]:
+                    if index in alive:
+                        alive.discard(index)
+                        if weight:
+                            for covered in PLACEMENT_CELLS[size][index]:
+                                density[covered] -= weight
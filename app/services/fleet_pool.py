@@ -0,0 +1,109 @@
+import asyncio
+from collections import deque
+from typing import Optional
+
+from app.config import FLEET_POOL_LOW_WATER, FLEET_POOL_HIGH_WATER
+from app.game_logic import Board, create_empty_board, place_all_ships
+from app.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Сколько флотов генерировать подряд, прежде чем отдать управление event loop
+REFILL_BATCH = 16
+
+
+def _new_fleet() -> Board:
+    """Создает поле с расставленным флотом."""
+    board = create_empty_board()
+    place_all_ships(board)
+    return board
+
+
+class FleetPool:
+    """
+    Ограниченный пул готовых полей с расставленными кораблями.
+
+    Создание игры только забирает поле из пула (take). Когда в пуле остается меньше low_water полей,
+    фоновая задача пополняет его до high_water небольшими порциями, не блокируя обработку апдейтов.
+    Если пул пуст, поле генерируется на месте — это считается промахом пула.
+    """
+
+    def __init__(self, low_water: int, high_water: int) -> None:
+        self.low_water = low_water
+        self.high_water = high_water
+        self.hits = 0
+        self.misses = 0
+        self._boards: deque[Board] = deque()
+        self._refill_needed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def take(self) -> Board:
+        """
+        Возвращает готовое поле с флотом из пула или генерирует его, если пул пуст.
+
+        :return: Игровое поле с расставленными кораблями.
+        """
+        if self._boards:
+            self.hits += 1
+            board = self._boards.popleft()
+        else:
+            self.misses += 1
+            board = _new_fleet()
+
+        if len(self._boards) < self.low_water:
+            self._refill_needed.set()
+        return board
+
+    def stats(self) -> dict:
+        """
+        Возвращает текущее состояние пула: размер, отметки и счетчики попаданий/промахов.
+        """
+        return {
+            "size": len(self._boards),
+            "low_water": self.low_water,
+            "high_water": self.high_water,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def start(self) -> None:
+        """Запускает фоновую задачу пополнения пула."""
+        if self._task is None or self._task.done():
+            self._refill_needed.set()
+            self._task = asyncio.create_task(self._producer())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу пополнения пула и пишет в лог итоговые счетчики."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        stats = self.stats()
+        taken = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / taken if taken else 0.0
+        logger.info(f"♻️ Пул флотов остановлен: выдано {taken}, из пула {stats['hits']} ({hit_rate:.0%}), "
+                    f"сгенерировано на месте {stats['misses']}, в пуле {stats['size']}")
+
+    async def _producer(self) -> None:
+        """Ждет сигнала о нехватке полей и пополняет пул до high_water порциями по REFILL_BATCH."""
+        while True:
+            await self._refill_needed.wait()
+            self._refill_needed.clear()
+
+            while len(self._boards) < self.high_water:
+                for _ in range(min(REFILL_BATCH, self.high_water - len(self._boards))):
+                    self._boards.append(_new_fleet())
+                await asyncio.sleep(0)
+
+            logger.info(f"♻️ Пул флотов пополнен до {len(self._boards)} "
+                        f"(из пула: {self.hits}, сгенерировано на месте: {self.misses})")
+
+
+fleet_pool = FleetPool(FLEET_POOL_LOW_WATER, FLEET_POOL_HIGH_WATER)
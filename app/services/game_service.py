@@ -1,15 +1,26 @@
+import asyncio
+import time
+
 from aiogram.types import Message, ReplyKeyboardRemove
-from typing import Optional
+from sqlalchemy.orm import Session
 
 from app.state.in_memory import games
-from app.game_logic import print_board, process_shot, check_victory
+from app.storage import delete_game, get_player_game_id
+from app.game_logic import print_board, process_shot, is_cell_opened, ShotResult
 from app.db_utils.match import update_match_result
 from app.db_utils.stats import update_stats_after_match
-from app.dependencies import db_session
+from app.db_utils.game_records import update_records_after_match
+from app.dependencies import run_db
 from app.keyboards import after_game_menu, enemy_board_keyboard
 from app.logger import setup_logger
-from app.services.achievements_service import evaluate_achievements_after_multiplayer_match
+from app.services.achievements_service import (
+    evaluate_achievements_after_multiplayer_match,
+    update_progress_after_multiplayer_match,
+)
 from app.services.complaint_service import cancel_complaint_timer, notify_complaint_cancelled
+from app.services.outbox import outbox
+from app.state.game import Game
+from app.utils.latency import shot_latency
 
 from app.messages.texts import (
     GAME_NOT_FOUND, LOSER_SUR, WINNER_SUR, AD_AFTER_GAME, NOT_YOUR_TURN, BAD_COORDINATES, WINNER, LOSER,
@@ -20,6 +31,85 @@ from app.messages.texts import (
 logger = setup_logger(__name__)
 
 
+def _apply_match_result(db: Session, game_id: str, winner_id: int, loser_id: int, result: str):
+    """Записывает в сессию итог матча, рейтинг игроков и рекорды, не фиксируя транзакцию."""
+    match = update_match_result(db, game_id, winner_id=winner_id, result=result, commit=False)
+    match_seconds = (match.ended_at - match.started_at).total_seconds() if match and match.started_at else 0.0
+    update_stats_after_match(db, winner_id=winner_id, loser_id=loser_id, commit=False, match_seconds=match_seconds)
+    if match:
+        update_records_after_match(db, match, commit=False)
+    return match
+
+
+def finalize_match(db: Session, game_id: str, winner_id: int, loser_id: int, result: str) -> None:
+    """
+    Завершает PvP-матч одной транзакцией: результат матча, рейтинг Elo, рекорды и достижения
+    фиксируются одним commit. Синхронная функция — вызывается через run_db в пуле потоков БД.
+
+    Если при проверке достижений произошла ошибка, транзакция откатывается и итог матча
+    с рейтингом и рекордами записываются повторно без достижений, но со счетчиками прогресса
+    (иначе они разойдутся с историей матчей). Если не удается и это, итог записывается без счетчиков —
+    их потом пересобирает python -m scripts.rebuild_achievement_progress.
+
+    :param db: Сессия SQLAlchemy.
+    :param game_id: ID игры.
+    :param winner_id: ID победителя.
+    :param loser_id: ID проигравшего.
+    :param result: Тип завершения матча ('normal', 'surrender', 'complaint').
+    """
+    try:
+        match = _apply_match_result(db, game_id, winner_id, loser_id, result)
+        if match:
+            evaluate_achievements_after_multiplayer_match(db, match, commit=False)
+        db.commit()
+        return
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Ошибка при проверке достижений, ID игры: {game_id}: {e}")
+
+    for with_progress in (True, False):
+        try:
+            match = _apply_match_result(db, game_id, winner_id, loser_id, result)
+            if match and with_progress:
+                update_progress_after_multiplayer_match(db, match, commit=False)
+            db.commit()
+            if not with_progress:
+                logger.warning(f"⚠️ Итог матча {game_id} записан без счетчиков прогресса достижений, "
+                               f"пересоберите их: python -m scripts.rebuild_achievement_progress")
+            return
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Не удалось записать итог матча, ID игры: {game_id}: {e}")
+            if not with_progress:
+                raise
+
+
+async def finalize_match_safe(game_id: str, winner_id: int, loser_id: int, result: str) -> None:
+    """
+    Завершает матч через finalize_match вне event loop; ошибки только логируются.
+    Игра к этому моменту уже удалена из памяти, поэтому игроки должны получить итоговые сообщения
+    даже тогда, когда итог не удалось записать в БД.
+
+    :param game_id: ID игры.
+    :param winner_id: ID победителя.
+    :param loser_id: ID проигравшего.
+    :param result: Тип завершения матча ('normal', 'surrender', 'complaint').
+    """
+    try:
+        await run_db(finalize_match, game_id, winner_id=winner_id, loser_id=loser_id, result=result)
+    except Exception as e:
+        logger.exception(f"❌ Итог матча не записан в БД, ID игры: {game_id}: {e}")
+
+
+def remember_message_id(game: Game, player_id: int, msg: Message | BaseException) -> None:
+    """
+    Запоминает ID последнего игрового сообщения игрока. Если отправить сообщение не удалось
+    (ошибка уже записана в лог outbox), остается прежний ID — ход второго игрока от этого не зависит.
+    """
+    if not isinstance(msg, BaseException):
+        game.get_player(player_id).message_id = msg.message_id
+
+
 async def handle_surrender(message: Message) -> None:
     """
     Обрабатывает сдачу игрока в игре:
@@ -34,24 +124,17 @@ async def handle_surrender(message: Message) -> None:
     user_id = message.from_user.id
 
     # Найдем игру, в которой играет user_id
-    game_id: Optional[str] = None
-    for gid, g in games.items():
-        if user_id == g.get("player1") or user_id == g.get("player2"):
-            game_id = gid
-            break
+    game_id = get_player_game_id(user_id)
 
-    if not game_id or game_id not in games:
+    if not game_id or game_id not in games or not games[game_id].is_full:
         await message.answer(GAME_NOT_FOUND.format(game_id=game_id))
         return
 
     game = games[game_id]
-    player1 = game["player1"]
-    player2 = game["player2"]
-    opponent_id = player2 if user_id == player1 else player1
+    opponent_id = game.opponent_of(user_id).id
 
-    usernames = game.get("usernames", {})
-    loser_username = usernames.get(user_id, "Игрок 1")
-    winner_username = usernames.get(opponent_id, "Игрок 2")
+    loser_username = game.username_of(user_id, "Игрок 1")
+    winner_username = game.username_of(opponent_id, "Игрок 2")
 
     logger.info(f'🏳️ Игрок @{loser_username} сдался, ID игры: {game_id}')
     logger.info(f'🎉️ Игрок @{winner_username} выиграл, ID игры: {game_id}')
@@ -59,29 +142,24 @@ async def handle_surrender(message: Message) -> None:
     # Отменяем таймер жалобы, если он был активен
     await cancel_complaint_timer(game_id)
 
-    with db_session() as db:
-        match = update_match_result(db, game_id, winner_id=opponent_id, result="surrender")
-        update_stats_after_match(db, winner_id=opponent_id, loser_id=user_id)
-        try:
-            if match:
-                evaluate_achievements_after_multiplayer_match(db, match)
-        except Exception:
-            pass
+    winner_board = game.board_of(opponent_id)
+    loser_board = game.board_of(user_id)
 
-    winner_board = game["boards"].get(opponent_id)
-    loser_board = game["boards"].get(user_id)
+    # Удаляем игру и все связи до записи в БД, чтобы за время ожидания игру не завершили повторно
+    delete_game(game_id)
 
-    # Удаляем игру и все связи
-    games.pop(game_id, None)
+    await finalize_match_safe(game_id, winner_id=opponent_id, loser_id=user_id, result="surrender")
 
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         user_id,
         LOSER_SUR.format(board=print_board(winner_board), username=winner_username),
         parse_mode="html",
         reply_markup=ReplyKeyboardRemove()
     )
 
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         user_id,
         text=AD_AFTER_GAME,
         parse_mode="html",
@@ -89,13 +167,15 @@ async def handle_surrender(message: Message) -> None:
         reply_markup=after_game_menu()
     )
 
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         opponent_id,
         WINNER_SUR.format(board=print_board(loser_board), username=loser_username),
         parse_mode="html",
         reply_markup=ReplyKeyboardRemove()
     )
-    await message.bot.send_message(
+    outbox.send_message(
+        message.bot,
         opponent_id,
         text=AD_AFTER_GAME,
         parse_mode="html",
@@ -112,28 +192,26 @@ async def handle_shot(message: Message) -> None:
     - Парсит координаты выстрела
     - Обновляет состояние доски и игры
     - Проверяет победу
-    - Отправляет обновления игрокам
+    - Отправляет обновления обоим игрокам одновременно; ошибка отправки одному не мешает другому
     - Обновляет ID сообщений для последующего удаления/редактирования
+    - Записывает в shot_latency время от получения выстрела до доставки сообщений обоим игрокам
 
     :param message: Объект сообщения с координатами выстрела.
     """
+    received = time.monotonic()
     user_id = message.from_user.id
     # username = message.from_user.username
 
     # Найдем игру, в которой играет user_id
-    game_id: Optional[str] = None
-    for gid, g in games.items():
-        if user_id == g.get("player1") or user_id == g.get("player2"):
-            game_id = gid
-            break
+    game_id = get_player_game_id(user_id)
 
-    if not game_id or game_id not in games:
+    if not game_id or game_id not in games or not games[game_id].is_full:
         await message.answer(GAME_NOT_FOUND.format(game_id=game_id))
         return
 
     game = games[game_id]
 
-    if user_id != game["turn"]:
+    if user_id != game.turn:
         await message.answer(NOT_YOUR_TURN)
         return
 
@@ -147,16 +225,15 @@ async def handle_shot(message: Message) -> None:
         await message.answer(BAD_COORDINATES)
         return
 
-    opponent_id = game["player1"] if game["turn"] == game["player2"] else game["player2"]
-    board = game["boards"][opponent_id]
+    opponent_id = game.opponent_of(user_id).id
+    board = game.board_of(opponent_id)
 
     # Проверяем, стрелял ли игрок уже по этой клетке
-    cell_value = board[x][y]
-    if cell_value in ("❌", "💥"):
+    if is_cell_opened(board, x, y):
         await message.answer(ALREADY_USED_COORDINATES)
         return
 
-    hit = process_shot(board, x, y)
+    result = process_shot(board, x, y)
 
     # Отменяем таймер жалобы, если он был активен
     was_cancelled = await cancel_complaint_timer(game_id)
@@ -165,68 +242,71 @@ async def handle_shot(message: Message) -> None:
     if was_cancelled and game_id in games:
         await notify_complaint_cancelled(message.bot, game_id, current_player_id=user_id)
 
-    # Получаем username'ы из словаря, только для сообщений
-    usernames = game.get("usernames", {})
-    current_username = usernames.get(user_id, "Игрок 1")
-    opponent_username = usernames.get(opponent_id, "Игрок 2")
-
-    if check_victory(board):
-        with db_session() as db:
-            match = update_match_result(db, game_id, winner_id=user_id, result="normal")
-            update_stats_after_match(db, winner_id=user_id, loser_id=opponent_id)
-            try:
-                if match:
-                    evaluate_achievements_after_multiplayer_match(db, match)
-            except Exception:
-                pass
-
-        winner_board = game["boards"].get(user_id)
-        loser_board = game["boards"].get(opponent_id)
-
-        games.pop(game_id, None)
-
-        await message.bot.send_message(
-            opponent_id,
-            LOSER.format(board=print_board(winner_board), username=current_username),
-            parse_mode="html",
-            reply_markup=ReplyKeyboardRemove()
-        )
-
-        await message.bot.send_message(
-            opponent_id,
-            text=AD_AFTER_GAME,
-            parse_mode="html",
-            disable_web_page_preview=True,
-            reply_markup=after_game_menu()
-        )
-
-        await message.bot.send_message(
-            user_id,
-            WINNER.format(board=print_board(loser_board), username=opponent_username),
-            parse_mode="html",
-            reply_markup=ReplyKeyboardRemove()
-        )
-        await message.bot.send_message(
-            user_id,
-            text=AD_AFTER_GAME,
-            parse_mode="html",
-            disable_web_page_preview=True,
-            reply_markup=after_game_menu()
+    # Получаем username'ы, только для сообщений
+    current_username = game.username_of(user_id, "Игрок 1")
+    opponent_username = game.username_of(opponent_id, "Игрок 2")
+
+    if result is ShotResult.VICTORY:
+        winner_board = game.board_of(user_id)
+        loser_board = game.board_of(opponent_id)
+
+        # Удаляем игру до записи в БД, чтобы за время ожидания игру не завершили повторно
+        delete_game(game_id)
+
+        # Сообщения уходят через очередь outbox: каждому игроку по порядку, обоим игрокам — параллельно.
+        # Итог ставится в очередь до записи в БД — игроки не ждут транзакцию finalize_match
+        notifications = [
+            outbox.send_message(
+                message.bot,
+                opponent_id,
+                LOSER.format(board=print_board(winner_board), username=current_username),
+                parse_mode="html",
+                reply_markup=ReplyKeyboardRemove()
+            ),
+            outbox.send_message(
+                message.bot,
+                opponent_id,
+                text=AD_AFTER_GAME,
+                parse_mode="html",
+                disable_web_page_preview=True,
+                reply_markup=after_game_menu()
+            ),
+            outbox.send_message(
+                message.bot,
+                user_id,
+                WINNER.format(board=print_board(loser_board), username=opponent_username),
+                parse_mode="html",
+                reply_markup=ReplyKeyboardRemove()
+            ),
+            outbox.send_message(
+                message.bot,
+                user_id,
+                text=AD_AFTER_GAME,
+                parse_mode="html",
+                disable_web_page_preview=True,
+                reply_markup=after_game_menu()
+            ),
+        ]
+        delivered = asyncio.gather(*notifications, return_exceptions=True)
+        # Задержка считается до доставки сообщений, без времени записи в БД
+        delivered.add_done_callback(lambda _: shot_latency.observe(time.monotonic() - received))
+        await asyncio.gather(
+            finalize_match_safe(game_id, winner_id=user_id, loser_id=opponent_id, result="normal"),
+            delivered,
         )
-
         return
 
-    if hit:
-        # Отправляем новое сообщение стрелявшему
-        msg1 = await message.bot.send_message(
+    if result:
+        # Отправляем новые сообщения стрелявшему и сопернику, не дожидаясь друг друга
+        msg1 = outbox.send_message(
+            message.bot,
             chat_id=user_id,
             text=SUCCESSFUL_SHOT,
             parse_mode="html",
             reply_markup=enemy_board_keyboard(game_id, opponent_id)
         )
-
-        # Отправляем новое сообщение сопернику
-        msg2 = await message.bot.send_message(
+        msg2 = outbox.send_message(
+            message.bot,
             chat_id=opponent_id,
             text=YOUR_BOARD_TEXT_AFTER_SUCCESS_SHOT.format(board=print_board(board)),
             parse_mode="html",
@@ -236,23 +316,23 @@ async def handle_shot(message: Message) -> None:
         # # Удаляем сообщение соперника
         # await message.bot.delete_message(
         #     chat_id=opponent_id,
-        #     message_id=game.get("message_ids", {}).get(opponent_id, 0)
+        #     message_id=game.get_player(opponent_id).message_id or 0
         # )
 
     else:
         # Меняем ход
-        game["turn"] = opponent_id
+        game.turn = opponent_id
 
-        # Отправляем новое сообщение стрелявшему
-        msg1 = await message.bot.send_message(
+        # Отправляем новые сообщения стрелявшему и сопернику, не дожидаясь друг друга
+        msg1 = outbox.send_message(
+            message.bot,
             chat_id=user_id,
             text=BAD_SHOT,
             parse_mode="html",
             reply_markup=enemy_board_keyboard(game_id, opponent_id)
         )
-
-        # Отправляем новое сообщение сопернику
-        msg2 = await message.bot.send_message(
+        msg2 = outbox.send_message(
+            message.bot,
             chat_id=opponent_id,
             text=YOUR_BOARD_TEXT_AFTER_BAD_SHOT.format(board=print_board(board)),
             parse_mode="html",
@@ -262,10 +342,12 @@ async def handle_shot(message: Message) -> None:
         # # Удаляем сообщение соперника
         # await message.bot.delete_message(
         #     chat_id=opponent_id,
-        #     message_id=game.get("message_ids", {}).get(opponent_id, 0)
+        #     message_id=game.get_player(opponent_id).message_id or 0
         # )
 
-    # Обновляем message_ids в игре
-    game.setdefault("message_ids", {})
-    game["message_ids"][user_id] = msg1.message_id
-    game["message_ids"][opponent_id] = msg2.message_id
+    msg1, msg2 = await asyncio.gather(msg1, msg2, return_exceptions=True)
+    shot_latency.observe(time.monotonic() - received)
+
+    # Обновляем message_id участников игры
+    remember_message_id(game, user_id, msg1)
+    remember_message_id(game, opponent_id, msg2)
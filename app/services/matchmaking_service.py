@@ -1,15 +1,25 @@
-from app.state.in_memory import user_game_requests, games
-from app.storage import create_game, join_game
-from app.utils.none_username import safe_username
-from app.db_utils.match import create_match
+from sqlalchemy.orm import Session
+
+from app.state.in_memory import user_game_requests, games, pending_joins
+from app.storage import create_game, join_game, delete_game, get_player_game_id
+from app.db_utils.match import create_match, delete_match
 from app.db_utils.player import get_or_create_player
-from app.dependencies import db_session
+from app.dependencies import run_db
 from app.logger import setup_logger
-from app.messages.texts import UNKNOWN_USERNAME_SECOND
 
 logger = setup_logger(__name__)
 
 
+def _register_match(db: Session, game_id: str, player1_id: int, player2_id: int, username: str) -> None:
+    """
+    Регистрирует игроков (если их еще нет) и создает запись о матче.
+    Синхронная функция — вызывается через run_db в пуле потоков БД.
+    """
+    get_or_create_player(db, telegram_id=str(player1_id))
+    get_or_create_player(db, telegram_id=str(player2_id), username=username)
+    create_match(db, game_id, player1_id, player2_id)
+
+
 def try_create_game(user_id: int, username: str) -> str:
     """
     Создает новую игру и отмечает пользователя, что он создал игру и ожидает присоединения второго игрока.
@@ -23,59 +33,60 @@ def try_create_game(user_id: int, username: str) -> str:
     return game_id
 
 
-def try_join_game(game_id: str, user_id: int, username: str) -> str | dict:
+async def try_join_game(game_id: str, user_id: int, username: str) -> str | dict:
     """
     Пытается присоединить пользователя к существующей игре.
 
     :param game_id: ID игры, к которой присоединяется игрок.
     :param user_id: ID присоединяющегося игрока.
     :param username: Username присоединяющегося игрока.
-    :return: Строка с ошибкой ('not_found', 'same_game', 'invalid') или словарь с данными об успешном присоединении.
+    :return: Строка с ошибкой ('not_found', 'same_game', 'invalid') или словарь с данными об успешном присоединении
+             (в том числе сам объект игры под ключом "game").
     """
     if user_id in user_game_requests and user_game_requests[user_id] is None:
         game = games.get(game_id)
-        if not game:
+        # Игра не найдена, уже началась или к ней прямо сейчас подключается другой игрок
+        if not game or game.player2 is not None or game_id in pending_joins:
             return "not_found"
 
         # Проверяем, не пытается ли игрок присоединиться к своей же игре
-        if user_id == game["player1"]:
+        if user_id == game.player1.id:
             return "same_game"
 
         # Проверяем, не играет ли игрок в активной игре (игра началась, есть 2 игрока)
-        for gid, g in list(games.items()):
-            if user_id == g.get("player1") or user_id == g.get("player2"):
-                # Если игра активна (есть 2 игрока), блокируем присоединение
-                if g.get("player1") and g.get("player2"):
-                    return "already_in_active_game"
-                # Если игра неактивна (только создатель ждет), удаляем её
-                else:
-                    games.pop(gid, None)
-                    break
-
-        # Присоединяем второго игрока
-        if not join_game(game_id, user_id, username):
-            return "not_found"
+        own_game_id = get_player_game_id(user_id)
+        if own_game_id:
+            own_game = games.get(own_game_id)
+            # Если игра активна (есть 2 игрока), блокируем присоединение
+            if own_game and own_game.is_full:
+                return "already_in_active_game"
+            # Если игра неактивна (только создатель ждет), удаляем её
+            delete_game(own_game_id)
 
-        # Работа с БД
-        with db_session() as db:
-            get_or_create_player(db, telegram_id=str(game["player1"]))
-            get_or_create_player(db, telegram_id=str(user_id), username=username)
-            create_match(db, game_id, game["player1"], user_id)
+        # Сначала записываем матч в БД и только потом делаем игру полной: иначе быстрая сдача или жалоба
+        # дошли бы до finalize_match раньше, чем появится запись о матче, и итог игры потерялся бы.
+        # Пока идет запись, игра зарезервирована за этим игроком.
+        pending_joins.add(game_id)
+        try:
+            await run_db(_register_match, game_id, game.player1.id, user_id, username)
+        finally:
+            pending_joins.discard(game_id)
 
-        # Сохраняем username второго игрока
-        game = games[game_id]
-        game["player2"] = user_id
-        game["usernames"] = game.get("usernames", {})
-        game["usernames"][user_id] = safe_username(username, UNKNOWN_USERNAME_SECOND)
+        # За время записи создатель мог отменить игру или она удалилась по таймауту
+        if games.get(game_id) is not game or not join_game(game_id, user_id, username):
+            logger.warning(f"⚠️ Игра {game_id} исчезла, пока к ней подключался второй игрок")
+            await run_db(delete_match, game_id)
+            return "not_found"
 
         # Обновляем статус в user_game_requests (удаляем)
         user_game_requests.pop(user_id, None)
 
         return {
             "status": "joined",
-            "player1": game["player1"],
+            "player1": game.player1.id,
             "player2": user_id,
             "game_id": game_id,
+            "game": game,
         }
 
     return "invalid"
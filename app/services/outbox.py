@@ -0,0 +1,171 @@
+import asyncio
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.types import Message
+
+from app.config import OUTBOX_RATE, OUTBOX_CHAT_RATE, OUTBOX_CHAT_BURST, OUTBOX_MAX_RETRIES
+from app.logger import setup_logger
+from app.utils.rate_limit import TokenBucket
+
+logger = setup_logger(__name__)
+
+# Сколько сообщений общий лимит пропускает разом (например, по одному обоим игрокам после выстрела)
+GLOBAL_BURST = 5
+
+# Первая пауза перед повтором после сетевой ошибки; каждая следующая вдвое длиннее
+RETRY_BACKOFF = 0.5
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Ошибка уже записана в лог отправителем; без этого asyncio ругается на неполученное исключение,
+    # если результат отправки никто не ждет
+    if not future.cancelled():
+        future.exception()
+
+
+class _ChatQueue:
+    """Очередь исходящих сообщений одного чата и его собственный лимит скорости."""
+
+    def __init__(self, limiter: TokenBucket) -> None:
+        self.queue: asyncio.Queue[tuple[Bot, dict, asyncio.Future]] = asyncio.Queue()
+        self.limiter = limiter
+        self.task: Optional[asyncio.Task] = None
+
+
+class Outbox:
+    """
+    Диспетчер исходящих сообщений игрокам.
+
+    У каждого чата своя очередь (FIFO) и свой лимит скорости (у Telegram — около сообщения в секунду
+    на чат, короткие всплески допустимы), поэтому сообщения одному игроку приходят по порядку,
+    а разным игрокам отправляются параллельно. Поверх этого действует общий для всего бота limiter
+    (его же используют рассылки), так что игровые сообщения и рассылки вместе не превышают его скорость.
+    При RetryAfter отправка всем чатам приостанавливается, при сетевых ошибках и 5xx повторяется
+    с нарастающей паузой (не больше max_retries раз).
+
+    send_message только ставит сообщение в очередь и возвращает future с отправленным Message:
+    его ждут, когда нужен message_id, иначе сообщение уходит в фоне. Отправитель чата
+    создается при первом сообщении и завершается после простоя.
+    """
+
+    def __init__(self, limiter: TokenBucket, chat_rate: float, chat_burst: int, max_retries: int = 3) -> None:
+        self.limiter = limiter
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.sent = 0
+        self.failed = 0
+        self._chats: dict[str, _ChatQueue] = {}
+        self._pending = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def send_message(self, bot: Bot, chat_id: int | str, text: str, **kwargs) -> asyncio.Future:
+        """
+        Ставит сообщение в очередь чата. Параметры те же, что у Bot.send_message.
+
+        :param bot: Объект бота.
+        :param chat_id: ID чата получателя.
+        :param text: Текст сообщения.
+        :return: Future с отправленным Message (или с исключением, если отправить не удалось).
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+
+        key = str(chat_id)
+        chat = self._chats.get(key)
+        if chat is None:
+            chat = self._chats[key] = _ChatQueue(TokenBucket(self.chat_rate, self.chat_burst))
+            chat.task = asyncio.create_task(self._chat_sender(key, chat))
+
+        chat.queue.put_nowait((bot, {"chat_id": chat_id, "text": text, **kwargs}, future))
+        self._pending += 1
+        self._drained.clear()
+        return future
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Дожидается отправки сообщений из очередей (не дольше timeout секунд),
+        затем останавливает отправителей; неотправленные сообщения отменяются.
+        """
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Не дождались отправки {self._pending} сообщений при остановке")
+
+        for chat in self._chats.values():
+            chat.task.cancel()
+            while not chat.queue.empty():
+                chat.queue.get_nowait()[2].cancel()
+        self._chats.clear()
+        self._pending = 0
+        self._drained.set()
+
+    async def _chat_sender(self, key: str, chat: _ChatQueue) -> None:
+        """Отправляет сообщения одного чата по очереди; после простоя удаляет очередь чата."""
+        # За это время лимит чата полностью восстанавливается, и новая очередь не даст лишнего всплеска
+        idle_timeout = self.chat_burst / self.chat_rate
+        while True:
+            try:
+                bot, kwargs, future = await asyncio.wait_for(chat.queue.get(), idle_timeout)
+            except asyncio.TimeoutError:
+                if chat.queue.empty():
+                    del self._chats[key]
+                    return
+                continue
+
+            try:
+                if not future.cancelled():
+                    message = await self._deliver(bot, kwargs, chat.limiter)
+                    self.sent += 1
+                    # Ждавший результата мог отменить future, пока сообщение отправлялось
+                    if not future.done():
+                        future.set_result(message)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Не удалось отправить сообщение в чат {key}: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._pending -= 1
+                if not self._pending:
+                    self._drained.set()
+
+    async def _deliver(self, bot: Bot, kwargs: dict, chat_limiter: TokenBucket) -> Message:
+        """Отправляет одно сообщение с учетом лимитов, повторяя его после RetryAfter и сетевых ошибок."""
+        attempt = 0
+        while True:
+            await chat_limiter.acquire()
+            await self.limiter.acquire()
+            try:
+                return await bot.send_message(**kwargs)
+
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                # Telegram просит подождать — останавливаем отправку всем чатам, а не только этому
+                self.limiter.pause(e.retry_after)
+                logger.warning(f"⏳ Превышен лимит Telegram, отправка приостановлена на {e.retry_after} с")
+
+            except (TelegramNetworkError, TelegramServerError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = RETRY_BACKOFF * 2 ** attempt
+                logger.warning(f"⚠️ Ошибка сети при отправке в чат {kwargs['chat_id']}, повтор через {delay} с: {e}")
+                await asyncio.sleep(delay)
+
+            attempt += 1
+
+
+# Общий лимит всех исходящих сообщений бота: и игровых, и рассылок
+telegram_limiter = TokenBucket(OUTBOX_RATE, GLOBAL_BURST)
+
+outbox = Outbox(telegram_limiter, OUTBOX_CHAT_RATE, OUTBOX_CHAT_BURST, OUTBOX_MAX_RETRIES)
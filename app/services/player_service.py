@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.db_utils.player import get_or_create_player
+from app.dependencies import run_db
+from app.services.presence_buffer import presence_buffer
 
 
 def register_or_update_player(db: Session, telegram_id: str, username: str):
@@ -12,3 +14,21 @@ def register_or_update_player(db: Session, telegram_id: str, username: str):
     :return: Объект Player, созданный или обновленный в базе.
     """
     return get_or_create_player(db, telegram_id, username)
+
+
+async def touch_player(telegram_id: str, username: str | None) -> None:
+    """
+    Отмечает визит игрока.
+
+    Игрок, уже записанный в БД в этом процессе, обновляется через буфер отложенной записи
+    (last_seen и username попадут в БД при следующем сбросе буфера). Первый визит записывается
+    в БД сразу: новый игрок должен быть зарегистрирован до дальнейших действий.
+
+    :param telegram_id: Telegram ID пользователя.
+    :param username: Username пользователя.
+    """
+    if presence_buffer.is_known(telegram_id):
+        presence_buffer.touch(telegram_id, username)
+        return
+    await run_db(register_or_update_player, telegram_id=telegram_id, username=username)
+    presence_buffer.mark_known(telegram_id)
@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from app.config import MOSCOW_TZ, PRESENCE_FLUSH_INTERVAL
+from app.db_utils.player import update_players_presence
+from app.dependencies import run_db
+from app.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PresenceBuffer:
+    """
+    Буфер отложенной записи last_seen и username игроков (write-behind).
+
+    Обновления копятся в памяти и схлопываются по игроку: в БД попадает только последнее.
+    Фоновая задача раз в flush_interval секунд записывает их одним пакетным UPDATE,
+    при остановке бота оставшиеся обновления записываются сразу.
+
+    Буфер обновляет только уже зарегистрированных игроков: известные в этом процессе
+    telegram_id хранятся в памяти, первое появление игрока записывается в БД синхронно.
+    Методы вызываются только из event loop, поэтому буфер не защищен потоковыми блокировками.
+    """
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self.flushed = 0
+        self._pending: dict[str, dict] = {}
+        self._known: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def is_known(self, telegram_id: str) -> bool:
+        """Проверяет, что игрок уже записан в БД в этом процессе."""
+        return telegram_id in self._known
+
+    def mark_known(self, telegram_id: str) -> None:
+        """Запоминает, что игрок есть в БД и дальше его можно обновлять через буфер."""
+        self._known.add(telegram_id)
+
+    def touch(self, telegram_id: str, username: str | None) -> None:
+        """
+        Запоминает визит игрока: время последнего появления и текущий username.
+
+        :param telegram_id: Telegram ID пользователя.
+        :param username: Username пользователя (может быть None).
+        """
+        self._pending[telegram_id] = {
+            "telegram_id": telegram_id,
+            "username": username,
+            "last_seen": datetime.now(MOSCOW_TZ),
+        }
+
+    async def flush(self) -> int:
+        """
+        Записывает накопленные обновления в БД. Записи идут по очереди, чтобы более старое
+        обновление игрока не легло в БД после более нового.
+        Если запись не удалась, обновления возвращаются в буфер (если их не перекрыли более новые).
+
+        :return: Количество записанных обновлений.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            updates, self._pending = self._pending, {}
+            try:
+                written = await run_db(update_players_presence, list(updates.values()))
+            except Exception as e:
+                for telegram_id, update in updates.items():
+                    self._pending.setdefault(telegram_id, update)
+                logger.error(f"❌ Не удалось записать визиты игроков ({len(updates)}): {e}")
+                return 0
+            self.flushed += written
+            return written
+
+    def start(self) -> None:
+        """Запускает фоновую задачу периодической записи."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flusher())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и записывает оставшиеся обновления."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flusher(self) -> None:
+        """Раз в flush_interval секунд записывает накопленные обновления."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Остановка не прерывает уже начатую запись: иначе взятые из буфера обновления потеряются
+            await asyncio.shield(self.flush())
+
+
+presence_buffer = PresenceBuffer(PRESENCE_FLUSH_INTERVAL)
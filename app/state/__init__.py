@@ -1,2 +1,3 @@
 from app.state import constants
+from app.state import game
 from app.state import in_memory
@@ -8,3 +8,17 @@ COORDINATES = ['A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9', 'A10',
                'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'H7', 'H8', 'H9', 'H10',
                'I1', 'I2', 'I3', 'I4', 'I5', 'I6', 'I7', 'I8', 'I9', 'I10',
                'J1', 'J2', 'J3', 'J4', 'J5', 'J6', 'J7', 'J8', 'J9', 'J10']
+
+# Ход бота целиком считается сразу и отправляется игроку одним сообщением (False — сообщение на каждый выстрел)
+BOT_TURN_BATCHING = True
+
+# Искусственная задержка хода бота по уровням сложности, в секундах
+# (в пакетном режиме — одна пауза на весь ход, иначе — перед каждым выстрелом).
+# Пока у всех уровней одинаковая; неизвестный уровень получает DEFAULT_BOT_TURN_DELAY
+BOT_TURN_DELAYS = {
+    "easy": 0.9,
+    "medium": 0.9,
+    "hard": 0.9,
+    "super_hard": 0.9,
+}
+DEFAULT_BOT_TURN_DELAY = 0.9
@@ -0,0 +1,99 @@
+from typing import Optional, TYPE_CHECKING
+
+from app.game_logic import Board
+
+if TYPE_CHECKING:
+    from app.services.bot_ai import BotAI
+
+
+class Player:
+    """
+    Участник активной игры: ID, отображаемый username, игровое поле и ID последнего сообщения с полем.
+    """
+    __slots__ = ("id", "username", "board", "message_id")
+
+    def __init__(self, player_id: int, username: str, board: Board) -> None:
+        self.id: int = player_id
+        self.username: str = username
+        self.board: Board = board
+        self.message_id: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<Player id={self.id} username={self.username}>"
+
+
+class Game:
+    """
+    Активная игра в памяти.
+    Поля хранятся в слотах, а данные каждого участника (поле, username, message_id) — в объекте Player,
+    вместо словаря с вложенными словарями boards/usernames/message_ids.
+    """
+    __slots__ = ("game_id", "player1", "player2", "turn", "bot_id", "difficulty", "bot_ai", "creation_message_id")
+
+    def __init__(self, game_id: str, player1: Player, player2: Optional[Player] = None,
+                 bot_id: Optional[int] = None, difficulty: Optional[str] = None,
+                 bot_ai: Optional["BotAI"] = None) -> None:
+        self.game_id: str = game_id
+        self.player1: Player = player1
+        self.player2: Optional[Player] = player2
+        self.turn: int = player1.id
+        self.bot_id: Optional[int] = bot_id
+        self.difficulty: Optional[str] = difficulty
+        self.bot_ai: Optional["BotAI"] = bot_ai
+        self.creation_message_id: Optional[int] = None
+
+    def __repr__(self) -> str:
+        player2_id = self.player2.id if self.player2 else None
+        return f"<Game id={self.game_id} p1={self.player1.id} p2={player2_id} turn={self.turn}>"
+
+    @property
+    def is_bot_game(self) -> bool:
+        """True, если второй участник — бот."""
+        return self.bot_id is not None
+
+    @property
+    def is_full(self) -> bool:
+        """True, если в игре есть оба участника."""
+        return self.player2 is not None
+
+    def get_player(self, player_id: int) -> Optional[Player]:
+        """
+        Возвращает участника игры по его ID.
+
+        :param player_id: ID игрока.
+        :return: Объект Player или None, если игрок не участвует в игре.
+        """
+        if self.player1.id == player_id:
+            return self.player1
+        if self.player2 is not None and self.player2.id == player_id:
+            return self.player2
+        return None
+
+    def opponent_of(self, player_id: int) -> Optional[Player]:
+        """
+        Возвращает соперника указанного игрока.
+
+        :param player_id: ID игрока.
+        :return: Объект Player соперника или None, если второго игрока ещё нет.
+        """
+        return self.player2 if self.player1.id == player_id else self.player1
+
+    def board_of(self, player_id: int) -> Board:
+        """
+        Возвращает игровое поле указанного игрока.
+
+        :param player_id: ID игрока.
+        :return: Игровое поле игрока.
+        """
+        return self.get_player(player_id).board
+
+    def username_of(self, player_id: int, default: str) -> str:
+        """
+        Возвращает username участника или значение по умолчанию.
+
+        :param player_id: ID игрока.
+        :param default: Значение, если игрок не найден.
+        :return: Username игрока.
+        """
+        player = self.get_player(player_id)
+        return player.username if player else default
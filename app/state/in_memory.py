@@ -1,8 +1,19 @@
 from typing import Optional
 import asyncio
 
-# Тут хранятся текущие игры с расширенной структурой
-games: dict[str, dict] = {}
+from app.state.game import Game
+
+# Тут хранятся текущие игры (объекты Game)
+games: dict[str, Game] = {}
+
+# Индекс «ID игрока -> ID игры» для поиска игры пользователя за O(1)
+player_games: dict[int, str] = {}
+
+# Открытые лобби — PvP-игры, ожидающие второго игрока (dict сохраняет порядок создания)
+open_lobbies: dict[str, None] = {}
+
+# Игры, к которым прямо сейчас подключается второй игрок (матч записывается в БД)
+pending_joins: set[str] = set()
 
 # Создаём глобальный словарь для хранения ID игры, где пользователь ожидает действия
 user_game_requests: dict[int, Optional[None]] = {}
@@ -1,59 +1,57 @@
 from typing import Optional
 
-from app.game_logic import create_empty_board, place_all_ships
-from app.utils import generate_game_id
+from app.game_logic import Board
+from app.utils.game_id import generate_game_id
 from app.utils.none_username import safe_username
-from app.state.in_memory import games
+from app.state.in_memory import games, player_games, open_lobbies
+from app.state.game import Game, Player
 from app.messages.texts import UNKNOWN_USERNAME_FIRST, UNKNOWN_USERNAME_SECOND
 
 
 def create_game(player_id: int, username: str) -> str:
     """
     Создает новую игру с игроком player_id и его username.
-    Генерирует уникальный ID игры, создает доску, размещает корабли и инициализирует структуру игры.
+    Генерирует уникальный ID игры, берет доску с расставленными кораблями из пула и инициализирует структуру игры.
 
     :param player_id: ID первого игрока.
     :param username: Username первого игрока.
     :return: Сгенерированный ID игры.
     """
+    from app.services.fleet_pool import fleet_pool  # локальный импорт, чтобы избежать циклов
+
     game_id = generate_game_id()
-    board = create_empty_board()
-    place_all_ships(board)
-    games[game_id] = {
-        "player1": player_id,
-        "player2": None,
-        "boards": {player_id: board},
-        "turn": player_id,
-        "usernames": {player_id: safe_username(username, UNKNOWN_USERNAME_FIRST)},
-        "message_ids": {},
-    }
+    board = fleet_pool.take()
+    games[game_id] = Game(game_id, Player(player_id, safe_username(username, UNKNOWN_USERNAME_FIRST), board))
+    player_games[player_id] = game_id
+    open_lobbies[game_id] = None
     return game_id
 
 
 def join_game(game_id: str, player_id: int, username: str) -> bool:
     """
     Присоединяет второго игрока к существующей игре, если место свободно.
-    Создает игровое поле для второго игрока и сохраняет его username.
+    Берет игровое поле для второго игрока из пула и сохраняет его username.
 
     :param game_id: ID игры для присоединения.
     :param player_id: ID второго игрока.
     :param username: Username второго игрока.
     :return: True если присоединение прошло успешно, иначе False.
     """
+    from app.services.fleet_pool import fleet_pool  # локальный импорт, чтобы избежать циклов
+
     game = games.get(game_id)
-    if game and game["player2"] is None:
-        board = create_empty_board()
-        place_all_ships(board)
-        game["player2"] = player_id
-        game["boards"][player_id] = board
-        game["usernames"][player_id] = safe_username(username, UNKNOWN_USERNAME_SECOND)
+    if game and game.player2 is None:
+        board = fleet_pool.take()
+        game.player2 = Player(player_id, safe_username(username, UNKNOWN_USERNAME_SECOND), board)
+        player_games[player_id] = game_id
+        open_lobbies.pop(game_id, None)
         return True
     return False
 
 
 def create_bot_game(player_id: int, username: str, difficulty: str) -> str:
     """
-    Создает игру против бота. Второй игрок — виртуальный bot_id. Сохраняет флаг is_bot_game и сложность.
+    Создает игру против бота. Второй игрок — виртуальный bot_id. Сохраняет bot_id, сложность и AI бота.
 
     :param player_id: ID человеческого игрока
     :param username: username игрока
@@ -61,40 +59,57 @@ def create_bot_game(player_id: int, username: str, difficulty: str) -> str:
     :return: game_id
     """
     from app.services.bot_ai import BotAI  # локальный импорт, чтобы избежать циклов
+    from app.services.fleet_pool import fleet_pool
 
     game_id = generate_game_id()
-    human_board = create_empty_board()
-    bot_board = create_empty_board()
-    place_all_ships(human_board)
-    place_all_ships(bot_board)
+    human_board = fleet_pool.take()
+    bot_board = fleet_pool.take()
 
     bot_id = -abs(hash((player_id, game_id)))
 
-    games[game_id] = {
-        "player1": player_id,
-        "player2": bot_id,
-        "bot_id": bot_id,
-        "is_bot_game": True,
-        "difficulty": difficulty,
-        "boards": {player_id: human_board, bot_id: bot_board},
-        "turn": player_id,
-        "usernames": {player_id: safe_username(username, UNKNOWN_USERNAME_FIRST), bot_id: "vladelo_sea_battle_bot"},
-        "message_ids": {},
-        "bot_state": {"ai": BotAI(difficulty, human_board)},
-    }
+    games[game_id] = Game(
+        game_id,
+        Player(player_id, safe_username(username, UNKNOWN_USERNAME_FIRST), human_board),
+        Player(bot_id, "vladelo_sea_battle_bot", bot_board),
+        bot_id=bot_id,
+        difficulty=difficulty,
+        bot_ai=BotAI(difficulty, human_board),
+    )
+    player_games[player_id] = game_id
     return game_id
 
 
-def get_game(game_id: str) -> Optional[dict]:
+def get_game(game_id: str) -> Optional[Game]:
     """
-    Возвращает структуру игры по game_id или None если игры нет.
+    Возвращает игру по game_id или None если игры нет.
 
     :param game_id: ID игры.
-    :return: Словарь с данными игры или None.
+    :return: Объект Game или None.
     """
     return games.get(game_id)
 
 
+def get_player_game_id(player_id: int) -> Optional[str]:
+    """
+    Возвращает ID игры, в которой участвует игрок, по индексу player_games за O(1).
+
+    :param player_id: ID игрока.
+    :return: ID игры или None, если игрок не в игре.
+    """
+    return player_games.get(player_id)
+
+
+def get_player_game(player_id: int) -> Optional[Game]:
+    """
+    Возвращает игру, в которой участвует игрок, или None.
+
+    :param player_id: ID игрока.
+    :return: Объект Game или None.
+    """
+    game_id = player_games.get(player_id)
+    return games.get(game_id) if game_id else None
+
+
 def switch_turn(game_id: str) -> None:
     """
     Меняет текущего игрока, чей ход, на противоположного.
@@ -102,10 +117,10 @@ def switch_turn(game_id: str) -> None:
     :param game_id: ID игры.
     """
     game = games[game_id]
-    game["turn"] = game["player1"] if game["turn"] == game["player2"] else game["player2"]
+    game.turn = game.opponent_of(game.turn).id
 
 
-def get_board(game_id: str, player_id: int) -> list[list[str]]:
+def get_board(game_id: str, player_id: int) -> Board:
     """
     Возвращает игровое поле указанного игрока в игре.
 
@@ -113,7 +128,7 @@ def get_board(game_id: str, player_id: int) -> list[list[str]]:
     :param player_id: ID игрока.
     :return: Игровое поле игрока.
     """
-    return games[game_id]["boards"][player_id]
+    return games[game_id].board_of(player_id)
 
 
 def get_turn(game_id: str) -> int:
@@ -123,17 +138,21 @@ def get_turn(game_id: str) -> int:
     :param game_id: ID игры.
     :return: ID игрока, чей ход.
     """
-    return games[game_id]["turn"]
+    return games[game_id].turn
 
 
 def delete_game(game_id: str) -> None:
     """
-    Удаляет игру из словаря игр по ID.
+    Удаляет игру из словаря игр по ID вместе с записями индексов игроков и лобби.
 
     :param game_id: ID игры для удаления.
     """
-    if game_id in games:
-        del games[game_id]
+    game = games.pop(game_id, None)
+    if game:
+        for player in (game.player1, game.player2):
+            if player is not None and player_games.get(player.id) == game_id:
+                del player_games[player.id]
+    open_lobbies.pop(game_id, None)
 
     # Также удаляем таймер жалобы, если он был активен
     from app.state.in_memory import complaint_timers
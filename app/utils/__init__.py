@@ -2,3 +2,6 @@ from app.utils.game_cleanup import remove_game_if_no_join
 from app.utils.game_id import generate_game_id
 from app.utils.rating import calculate_elo
 from app.utils.none_username import safe_username
+from app.utils.rating_index import RatingIndex, rating_index
+from app.utils.rate_limit import TokenBucket
+from app.utils.latency import LatencyHistogram, shot_latency
@@ -1,6 +1,6 @@
 import asyncio
 
-from app.state.in_memory import user_game_requests, games
+from app.state.in_memory import user_game_requests, games, pending_joins
 from app.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,14 +14,17 @@ async def remove_game_if_no_join(game_id: str, bot, delay: int = 300) -> None:
     :param bot: Объект бота для удаления сообщений.
     :param delay: Время ожидания в секундах перед удалением.
     """
+    from app.storage import delete_game  # локальный импорт, чтобы избежать циклов
+
     await asyncio.sleep(delay)
     game = games.get(game_id)
-    if game and game["player2"] is None:
+    # Игру, к которой прямо сейчас подключается второй игрок, не трогаем
+    if game and game.player2 is None and game_id not in pending_joins:
         logger.info(f"🧹 Автоудаление игры {game_id} — второй игрок не присоединился.")
-        player1_id = game["player1"]
+        player1_id = game.player1.id
 
         # Удаляем сообщение о создании игры у первого игрока
-        creation_message_id = game.get("creation_message_id")
+        creation_message_id = game.creation_message_id
         if creation_message_id:
             try:
                 await bot.delete_message(player1_id, creation_message_id)
@@ -29,4 +32,4 @@ async def remove_game_if_no_join(game_id: str, bot, delay: int = 300) -> None:
                 pass
 
         user_game_requests.pop(player1_id, None)
-        games.pop(game_id, None)
+        delete_game(game_id)
@@ -0,0 +1,67 @@
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+# Верхние границы корзин по умолчанию, в секундах
+DEFAULT_BOUNDS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с фиксированными границами корзин (в секундах).
+
+    Хранит только счетчики по корзинам, поэтому память не растет с числом замеров.
+    Квантили оцениваются с точностью до корзины: возвращается ее верхняя граница,
+    но не больше наибольшей замеренной задержки.
+    """
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BOUNDS) -> None:
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Добавляет замер.
+
+        :param seconds: Задержка в секундах.
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Оценивает квантиль задержки.
+
+        :param q: Квантиль от 0 до 1 (например, 0.95).
+        :return: Верхняя граница корзины, в которую попадает квантиль (не больше max), или None, если замеров нет.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def buckets(self) -> list[tuple[Optional[float], int]]:
+        """
+        Возвращает непустые корзины.
+
+        :return: Пары (верхняя граница в секундах или None для последней корзины, число замеров).
+        """
+        bounds = self.bounds + (None,)
+        return [(bound, count) for bound, count in zip(bounds, self.counts) if count]
+
+
+# Время от получения выстрела до доставки сообщений обоим игрокам (PvP)
+shot_latency = LatencyHistogram()
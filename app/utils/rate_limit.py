@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Ограничитель скорости «ведро токенов» для asyncio.
+
+    Токены пополняются со скоростью rate в секунду, но не больше burst. Каждая отправка забирает
+    один токен (acquire), при пустом ведре ждет следующего. Ожидающие обслуживаются по очереди.
+    pause останавливает выдачу токенов на заданное время — так обрабатывается RetryAfter от Telegram.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Ждет и забирает один токен."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Останавливает выдачу токенов на seconds секунд (после паузы ведро начинает с нуля).
+
+        :param seconds: Длительность паузы.
+        """
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
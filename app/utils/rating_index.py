@@ -0,0 +1,169 @@
+import threading
+from typing import Iterable, Optional
+
+# Начальный диапазон рейтингов дерева; при выходе рейтинга за границы дерево перестраивается шире
+INITIAL_LOW = 0
+INITIAL_SIZE = 4096
+
+
+class RatingIndex:
+    """
+    Индекс рейтингов игроков в памяти для таблицы лидеров и места в рейтинге.
+
+    Хранит рейтинг каждого игрока, игроков по значению рейтинга и дерево Фенвика с количеством
+    игроков на каждом значении. Место игрока, k-й рейтинг и топ/низ таблицы находятся за O(log R),
+    где R — ширина диапазона рейтингов.
+
+    Пока индекс не загружен из БД (ready == False), читать его нельзя — вызывающий код считает через SQL.
+    Обновления, пришедшие во время загрузки, откладываются и применяются поверх загруженных данных.
+    Методы потокобезопасны: индекс обновляется из пула потоков БД.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self._lock = threading.Lock()
+        self._pending: Optional[dict[int, int]] = None
+        self._reset(INITIAL_LOW, INITIAL_SIZE)
+
+    def _reset(self, low: int, size: int) -> None:
+        self._low = low
+        self._size = size
+        self._tree = [0] * (size + 1)
+        self._ratings: dict[int, int] = {}
+        self._buckets: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ratings)
+
+    def begin_load(self) -> None:
+        """Начинает загрузку: с этого момента обновления запоминаются до вызова load."""
+        with self._lock:
+            self._pending = {}
+
+    def load(self, rows: Iterable[tuple[int, int]]) -> None:
+        """
+        Заполняет индекс парами (player_id, rating) из БД и помечает его готовым.
+
+        :param rows: Пары (ID игрока, рейтинг).
+        """
+        with self._lock:
+            self._reset(INITIAL_LOW, INITIAL_SIZE)
+            for player_id, rating in rows:
+                self._set(player_id, rating)
+            for player_id, rating in (self._pending or {}).items():
+                self._set(player_id, rating)
+            self._pending = None
+            self.ready = True
+
+    def set(self, player_id: int, rating: int) -> None:
+        """
+        Записывает текущий рейтинг игрока (новый игрок добавляется).
+
+        :param player_id: ID игрока.
+        :param rating: Рейтинг после изменения.
+        """
+        with self._lock:
+            if not self.ready:
+                if self._pending is not None:
+                    self._pending[player_id] = rating
+                return
+            self._set(player_id, rating)
+
+    def place(self, rating: int) -> int:
+        """Место в рейтинге для значения rating: 1 + число игроков со строго большим рейтингом."""
+        with self._lock:
+            return len(self._ratings) - self._count_up_to(rating) + 1
+
+    def player_place(self, player_id: int) -> Optional[tuple[int, int]]:
+        """
+        Возвращает рейтинг и место игрока.
+
+        :param player_id: ID игрока.
+        :return: Кортеж (рейтинг, место) или None, если игрока нет в индексе.
+        """
+        with self._lock:
+            rating = self._ratings.get(player_id)
+            if rating is None:
+                return None
+            return rating, len(self._ratings) - self._count_up_to(rating) + 1
+
+    def top(self, limit: int) -> list[tuple[int, int]]:
+        """Возвращает до limit пар (player_id, rating) по убыванию рейтинга."""
+        with self._lock:
+            result = []
+            while len(result) < limit and len(result) < len(self._ratings):
+                rating = self._kth(len(self._ratings) - len(result))
+                for player_id in sorted(self._buckets[rating]):
+                    result.append((player_id, rating))
+            return result[:limit]
+
+    def bottom(self, limit: int) -> list[tuple[int, int]]:
+        """Возвращает до limit пар (player_id, rating) по возрастанию рейтинга."""
+        with self._lock:
+            result = []
+            while len(result) < limit and len(result) < len(self._ratings):
+                rating = self._kth(len(result) + 1)
+                for player_id in sorted(self._buckets[rating]):
+                    result.append((player_id, rating))
+            return result[:limit]
+
+    def _set(self, player_id: int, rating: int) -> None:
+        old = self._ratings.get(player_id)
+        if old == rating:
+            return
+        if old is not None:
+            del self._ratings[player_id]
+            self._add(old, -1)
+            bucket = self._buckets[old]
+            bucket.discard(player_id)
+            if not bucket:
+                del self._buckets[old]
+        if not self._low <= rating < self._low + self._size:
+            self._grow(rating)
+        self._ratings[player_id] = rating
+        self._buckets.setdefault(rating, set()).add(player_id)
+        self._add(rating, 1)
+
+    def _grow(self, rating: int) -> None:
+        """Расширяет диапазон дерева вдвое (в сторону rating), пока rating не поместится, и перестраивает его."""
+        low, size = self._low, self._size
+        while not low <= rating < low + size:
+            if rating < low:
+                low -= size
+            size *= 2
+        ratings = self._ratings
+        self._reset(low, size)
+        for player_id, value in ratings.items():
+            self._ratings[player_id] = value
+            self._buckets.setdefault(value, set()).add(player_id)
+            self._add(value, 1)
+
+    def _add(self, rating: int, delta: int) -> None:
+        i = rating - self._low + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_up_to(self, rating: int) -> int:
+        """Число игроков с рейтингом <= rating."""
+        i = min(rating - self._low + 1, self._size)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _kth(self, k: int) -> int:
+        """Возвращает k-й по возрастанию рейтинг (k от 1 до числа игроков), спуском по дереву."""
+        position = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self._size and self._tree[nxt] < k:
+                position = nxt
+                k -= self._tree[nxt]
+            step >>= 1
+        return position + self._low
+
+
+rating_index = RatingIndex()
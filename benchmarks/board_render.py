@@ -0,0 +1,90 @@
+"""
+Микробенчмарк отрисовки поля: сколько раз в секунду строятся текст поля и ряды кнопок клавиатуры.
+
+Моделируется обычная партия: между отрисовками делается один выстрел, после чего строятся
+print_board и ряды кнопок игрового поля (как при каждом ответе на ход).
+
+Сравниваются два способа:
+- full — строки и кнопки всего поля строятся заново при каждой отрисовке (как было раньше);
+- cached — строки и кнопки берутся из кэша доски, перестраиваются только изменившиеся ряды.
+
+Запуск из корня репозитория:
+    python -m benchmarks.board_render
+    python -m benchmarks.board_render 500
+"""
+import random
+import sys
+import time
+
+from aiogram.types import KeyboardButton
+
+from app.game_logic import (
+    BOARD_HEADER, BOARD_LETTERS, BOARD_SIZE, board_rows, create_empty_board, place_all_ships, print_board,
+    process_shot,
+)
+from app.keyboards import board_buttons
+
+DEFAULT_GAMES = 200
+
+
+def _full_print_board(board, hide_ships: bool = False) -> str:
+    rows = [f"{BOARD_LETTERS[i]} " + " ".join(row) for i, row in enumerate(board_rows(board, hide_ships))]
+    return "<code>\n" + BOARD_HEADER + "\n" + "\n".join(rows) + "\n</code>"
+
+
+def _full_board_buttons(board) -> list[list[KeyboardButton]]:
+    rows = board_rows(board, hide_ships=True)
+    return [
+        [
+            KeyboardButton(text=(cell if cell in ["❌", "💥"] else f"{chr(65 + row)}{col + 1}"))
+            for col, cell in enumerate(rows[row])
+        ]
+        for row in range(BOARD_SIZE)
+    ]
+
+
+def _shot_sequences(games: int) -> list[tuple[int, list[tuple[int, int]]]]:
+    """Готовит для каждой партии seed расстановки флота и случайный порядок выстрелов."""
+    rng = random.Random(42)
+    cells = [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)]
+    return [(seed, rng.sample(cells, len(cells))) for seed in range(games)]
+
+
+def _play(sequences, render_text, render_buttons) -> tuple[int, float]:
+    """Проигрывает партии и возвращает число отрисовок и затраченное на них время."""
+    renders = 0
+    elapsed = 0.0
+    for seed, shots in sequences:
+        random.seed(seed)
+        board = create_empty_board()
+        place_all_ships(board)
+        for x, y in shots:
+            if process_shot(board, x, y) is None:
+                continue
+            started = time.perf_counter()
+            render_text(board)
+            render_text(board, True)
+            render_buttons(board)
+            elapsed += time.perf_counter() - started
+            renders += 1
+    return renders, elapsed
+
+
+def main(games: int) -> None:
+    sequences = _shot_sequences(games)
+    print(f"Партий: {games:,}")
+    print(f"{'способ':>8} | {'отрисовок/с':>12} | {'мкс/отрисовка':>14}")
+    print("-" * 42)
+    rates = {}
+    for name, render_text, render_buttons in (
+            ("full", _full_print_board, _full_board_buttons),
+            ("cached", print_board, board_buttons),
+    ):
+        renders, elapsed = _play(sequences, render_text, render_buttons)
+        rates[name] = renders / elapsed
+        print(f"{name:>8} | {rates[name]:>12,.0f} | {elapsed / renders * 1e6:>14,.1f}")
+    print(f"Ускорение: x{rates['cached'] / rates['full']:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_GAMES)
@@ -0,0 +1,151 @@
+"""
+Самоигра BotAI: бот стреляет по полям с флотом из place_all_ships, без Telegram и БД.
+
+Для каждого уровня сложности выводится распределение числа выстрелов до победы (среднее, перцентили,
+минимум, максимум) и скорость принятия решений (choose_shot + process_result) в секунду.
+Партии детерминированы: партия с номером seed использует random.seed(seed) и для флота, и для бота,
+поэтому прогоны с одинаковыми параметрами сравнимы между собой.
+
+Партии раскидываются по процессам (ProcessPoolExecutor) порциями по --chunk.
+Константы BotAI можно переопределить для подбора параметров:
+    --set CHEAT_PROBABILITY=0.2 --set SUPER_HARD_CHEAT_PROBABILITY=0.05
+
+Запуск из корня репозитория:
+    python -m benchmarks.bot_selfplay
+    python -m benchmarks.bot_selfplay --games 1000000 --workers 8
+    python -m benchmarks.bot_selfplay --difficulties hard super_hard --set CHEAT_PROBABILITY=0.1
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Пакет app.services при импорте создает движок БД; самоигре БД не нужна — хватит SQLite в памяти
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.game_logic import ShotResult, create_empty_board, place_all_ships, process_shot  # noqa: E402
+from app.services.bot_ai import BotAI  # noqa: E402
+
+DIFFICULTIES = ("easy", "medium", "hard", "super_hard")
+DEFAULT_GAMES = 2_000
+DEFAULT_CHUNK = 250
+
+# Предохранитель от зацикливания: на поле 100 клеток, бот не должен делать больше решений
+MAX_DECISIONS = 400
+
+
+def _apply_overrides(overrides: dict[str, float]) -> None:
+    """Переопределяет константы BotAI (вызывается в каждом процессе пула)."""
+    for name, value in overrides.items():
+        setattr(BotAI, name, value)
+
+
+def play_game(difficulty: str, seed: int) -> tuple[int, int, float]:
+    """
+    Играет одну партию бота против поля с флотом.
+
+    :param difficulty: Уровень сложности бота.
+    :param seed: Seed партии (флот и решения бота).
+    :return: Кортеж (выстрелов до победы, решений бота, время на решения в секундах).
+    """
+    random.seed(seed)
+    board = create_empty_board()
+    place_all_ships(board)
+    ai = BotAI(difficulty, board)
+
+    shots = 0
+    decisions = 0
+    elapsed = 0.0
+    while decisions < MAX_DECISIONS:
+        started = time.perf_counter()
+        x, y = ai.choose_shot()
+        elapsed += time.perf_counter() - started
+
+        result = process_shot(board, x, y)
+
+        started = time.perf_counter()
+        ai.process_result((x, y), result, result in (ShotResult.SUNK, ShotResult.VICTORY))
+        elapsed += time.perf_counter() - started
+
+        decisions += 1
+        if result is not None:
+            shots += 1
+        if result is ShotResult.VICTORY:
+            return shots, decisions, elapsed
+    raise RuntimeError(f"Бот {difficulty} не победил за {MAX_DECISIONS} решений (seed={seed})")
+
+
+def play_chunk(difficulty: str, seeds: range) -> tuple[list[int], int, float]:
+    """
+    Играет порцию партий в одном процессе.
+
+    :return: Кортеж (выстрелы до победы по партиям, всего решений, время на решения в секундах).
+    """
+    shots = []
+    decisions = 0
+    elapsed = 0.0
+    for seed in seeds:
+        game_shots, game_decisions, game_elapsed = play_game(difficulty, seed)
+        shots.append(game_shots)
+        decisions += game_decisions
+        elapsed += game_elapsed
+    return shots, decisions, elapsed
+
+
+def _percentile(values: list[int], percent: float) -> int:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Самоигра BotAI: сила и скорость уровней сложности")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="партий на каждый уровень сложности")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="число процессов")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="партий в одной задаче пула")
+    parser.add_argument("--seed", type=int, default=0, help="seed первой партии")
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES), choices=DIFFICULTIES)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="переопределить константу BotAI, например CHEAT_PROBABILITY=0.2")
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        if not hasattr(BotAI, name):
+            parser.error(f"У BotAI нет константы {name}")
+        overrides[name] = float(value)
+
+    print(f"Партий на уровень: {args.games:,}, процессов: {args.workers}")
+    if overrides:
+        print("Переопределено: " + ", ".join(f"{name}={value}" for name, value in overrides.items()))
+    print(f"{'уровень':>10} | {'среднее':>7} | {'p10':>4} | {'p50':>4} | {'p90':>4} | {'мин':>4} | {'макс':>4} | "
+          f"{'решений/с':>10} | {'партий/с':>9}")
+    print("-" * 86)
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_apply_overrides,
+                             initargs=(overrides,)) as pool:
+        for difficulty in args.difficulties:
+            started = time.perf_counter()
+            futures = [
+                pool.submit(play_chunk, difficulty, range(start, min(start + args.chunk, args.seed + args.games)))
+                for start in range(args.seed, args.seed + args.games, args.chunk)
+            ]
+            shots: list[int] = []
+            decisions = 0
+            elapsed = 0.0
+            for future in futures:
+                chunk_shots, chunk_decisions, chunk_elapsed = future.result()
+                shots.extend(chunk_shots)
+                decisions += chunk_decisions
+                elapsed += chunk_elapsed
+            wall = time.perf_counter() - started
+
+            shots.sort()
+            print(f"{difficulty:>10} | {statistics.fmean(shots):>7.1f} | {_percentile(shots, 10):>4} | "
+                  f"{_percentile(shots, 50):>4} | {_percentile(shots, 90):>4} | {shots[0]:>4} | {shots[-1]:>4} | "
+                  f"{decisions / elapsed:>10,.0f} | {len(shots) / wall:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Бенчмарк генерации флота: сколько полей с расставленными кораблями получается в секунду.
+
+Сравниваются два способа:
+- legacy — случайные (x, y, направление) с повтором до успешного place_ship, без ограничения попыток;
+- tables — выбор из заранее посчитанных размещений (place_all_ships) с бэктрекингом.
+
+Для legacy дополнительно выводится среднее число вызовов place_ship на один флот.
+
+Запуск из корня репозитория:
+    python -m benchmarks.fleet_generation
+    python -m benchmarks.fleet_generation 50000
+"""
+import random
+import sys
+import time
+
+from app.game_logic import BOARD_SIZE, FLEET_SIZES, create_empty_board, place_all_ships, place_ship
+
+DEFAULT_FLEETS = 20_000
+
+
+def _legacy_place_all_ships(board) -> int:
+    """Прежняя расстановка флота. Возвращает число попыток place_ship."""
+    attempts = 0
+    for size in FLEET_SIZES:
+        placed = False
+        while not placed:
+            attempts += 1
+            x = random.randint(0, BOARD_SIZE - 1)
+            y = random.randint(0, BOARD_SIZE - 1)
+            orientation = random.choice(["horizontal", "vertical"])
+            placed = place_ship(board, x, y, size, orientation)
+    return attempts
+
+
+def _bench_legacy(fleets: int) -> tuple[float, float]:
+    attempts = 0
+    started = time.perf_counter()
+    for _ in range(fleets):
+        attempts += _legacy_place_all_ships(create_empty_board())
+    elapsed = time.perf_counter() - started
+    return fleets / elapsed, attempts / fleets
+
+
+def _bench_tables(fleets: int) -> float:
+    started = time.perf_counter()
+    for _ in range(fleets):
+        place_all_ships(create_empty_board())
+    elapsed = time.perf_counter() - started
+    return fleets / elapsed
+
+
+def main(fleets: int) -> None:
+    legacy_rate, legacy_attempts = _bench_legacy(fleets)
+    tables_rate = _bench_tables(fleets)
+    print(f"Флотов в каждом прогоне: {fleets:,}")
+    print(f"{'способ':>8} | {'флотов/с':>10} | {'попыток/флот':>12}")
+    print("-" * 38)
+    print(f"{'legacy':>8} | {legacy_rate:>10,.0f} | {legacy_attempts:>12,.1f}")
+    print(f"{'tables':>8} | {tables_rate:>10,.0f} | {'—':>12}")
+    print(f"Ускорение: x{tables_rate / legacy_rate:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FLEETS)
@@ -0,0 +1,91 @@
+"""
+Бенчмарк памяти: сколько байт занимает одна активная PvP-игра в словаре games.
+
+Сравниваются две структуры:
+- legacy — прежний dict с вложенными словарями boards/usernames/message_ids;
+- slotted — объект Game со слотами и двумя объектами Player.
+
+Структура игры замеряется через tracemalloc при общих досках (чтобы измерять только накладные расходы
+самой игры), стоимость двух досок замеряется отдельно и прибавляется в колонке «с досками».
+
+Запуск из корня репозитория:
+    python -m benchmarks.game_memory
+    python -m benchmarks.game_memory 10000 100000
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+from app.game_logic import Board, create_empty_board
+from app.state.game import Game, Player
+
+DEFAULT_COUNTS = (10_000, 100_000, 1_000_000)
+
+
+def _legacy_game(i: int, game_id: str, board1: Board, board2: Board) -> dict:
+    """Игра в прежнем формате (dict с вложенными словарями)."""
+    player1, player2 = 100_000_000 + 2 * i, 100_000_001 + 2 * i
+    return {
+        "player1": player1,
+        "player2": player2,
+        "boards": {player1: board1, player2: board2},
+        "turn": player1,
+        "usernames": {player1: f"captain_{i}", player2: f"sailor_{i}"},
+        "message_ids": {player1: 10_000 + i, player2: 20_000 + i},
+    }
+
+
+def _slotted_game(i: int, game_id: str, board1: Board, board2: Board) -> Game:
+    """Игра в новом формате (Game и Player со слотами)."""
+    player1, player2 = 100_000_000 + 2 * i, 100_000_001 + 2 * i
+    game = Game(game_id, Player(player1, f"captain_{i}", board1), Player(player2, f"sailor_{i}", board2))
+    game.player1.message_id = 10_000 + i
+    game.player2.message_id = 20_000 + i
+    return game
+
+
+def _measure(factory: Callable[[int, str, Board, Board], object], count: int) -> float:
+    """
+    Создает count игр и возвращает средний размер структуры одной игры в байтах (без досок).
+    """
+    board1, board2 = create_empty_board(), create_empty_board()
+    game_ids = [f"G{i:07d}" for i in range(count)]
+    gc.collect()
+
+    tracemalloc.start()
+    storage = {}
+    for i, game_id in enumerate(game_ids):
+        storage[game_id] = factory(i, game_id, board1, board2)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del storage
+    gc.collect()
+    return current / count
+
+
+def _board_pair_bytes(samples: int = 1_000) -> float:
+    """Возвращает средний размер пары досок одной игры в байтах."""
+    gc.collect()
+    tracemalloc.start()
+    boards = [(create_empty_board(), create_empty_board()) for _ in range(samples)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del boards
+    return current / samples
+
+
+def main(counts: tuple[int, ...]) -> None:
+    boards_bytes = _board_pair_bytes()
+    print(f"Две доски одной игры: {boards_bytes:,.0f} байт")
+    print(f"{'игр':>10} | {'структура':>8} | {'байт/игра':>10} | {'с досками':>10}")
+    print("-" * 50)
+    for count in counts:
+        for name, factory in (("legacy", _legacy_game), ("slotted", _slotted_game)):
+            per_game = _measure(factory, count)
+            print(f"{count:>10,} | {name:>8} | {per_game:>10,.0f} | {per_game + boards_bytes:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or DEFAULT_COUNTS)
@@ -0,0 +1,102 @@
+"""
+Бенчмарк завершения PvP-матча на SQLite: сколько матчей в секунду записывается в базу.
+
+Сравниваются два способа:
+- legacy — как было раньше: update_match_result, update_stats_after_match и каждая выданная ачивка
+  фиксируются отдельными commit (несколько fsync на матч);
+- finalize — finalize_match: результат, рейтинг Elo и ачивки одной транзакцией.
+
+Для каждого способа создается свежая файловая база во временной папке (в памяти fsync не измерить),
+в ней игроки и незавершенные матчи, после чего матчи по очереди завершаются.
+
+Запуск из корня репозитория:
+    python -m benchmarks.match_finalization
+    python -m benchmarks.match_finalization 2000
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Пакет app.services при импорте создает движок БД; бенчмарк создает свои базы сам.
+# ADMIN_ID нужен проверке ачивки fan_dev
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ADMIN_ID", "0")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import MOSCOW_TZ  # noqa: E402
+from app.db_utils.match import update_match_result  # noqa: E402
+from app.db_utils.stats import update_stats_after_match  # noqa: E402
+from app.models import Base, Match, Player  # noqa: E402
+from app.services.achievements_service import (  # noqa: E402
+    evaluate_achievements_after_multiplayer_match, load_achievements,
+)
+from app.services.game_service import finalize_match  # noqa: E402
+
+DEFAULT_MATCHES = 500
+PLAYERS = 50
+
+
+def _legacy_finalize(db, game_id: str, winner_id: int, loser_id: int, result: str) -> None:
+    """Прежнее завершение матча: каждый шаг фиксирует свою транзакцию."""
+    match = update_match_result(db, game_id, winner_id=winner_id, result=result)
+    update_stats_after_match(db, winner_id=winner_id, loser_id=loser_id)
+    if match:
+        evaluate_achievements_after_multiplayer_match(db, match)
+
+
+def _prepare(path: str, matches: int) -> tuple[sessionmaker, list[tuple[str, int, int]]]:
+    """Создает базу с игроками и незавершенными матчами. Возвращает фабрику сессий и (игра, победитель, проигравший)."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    rng = random.Random(42)
+    started_at = datetime.now(MOSCOW_TZ) - timedelta(days=1)
+    plan = []
+    with session_factory() as db:
+        db.add_all(Player(id=i, telegram_id=str(i), username=f"player{i}") for i in range(1, PLAYERS + 1))
+        for n in range(matches):
+            winner_id, loser_id = rng.sample(range(1, PLAYERS + 1), 2)
+            game_id = f"G{n:07d}"
+            db.add(Match(game_id=game_id, player_1_id=winner_id, player_2_id=loser_id,
+                         started_at=started_at + timedelta(seconds=n)))
+            plan.append((game_id, winner_id, loser_id))
+        db.commit()
+        # Как при старте бота: справочник достижений создается и кешируется до первого матча
+        load_achievements(db)
+    return session_factory, plan
+
+
+def _run(finalize, matches: int) -> float:
+    """Завершает matches матчей выбранным способом и возвращает затраченное время."""
+    with tempfile.TemporaryDirectory() as directory:
+        session_factory, plan = _prepare(os.path.join(directory, "bench.sqlite3"), matches)
+        started = time.perf_counter()
+        for game_id, winner_id, loser_id in plan:
+            # Как и в run_db: отдельная сессия на каждое завершение матча
+            with session_factory() as db:
+                finalize(db, game_id, winner_id, loser_id, "normal")
+        elapsed = time.perf_counter() - started
+        session_factory.kw["bind"].dispose()
+    return elapsed
+
+
+def main(matches: int) -> None:
+    print(f"Матчей: {matches:,}, игроков: {PLAYERS}")
+    print(f"{'способ':>9} | {'матчей/с':>9} | {'мс/матч':>8}")
+    print("-" * 33)
+    rates = {}
+    for name, finalize in (("legacy", _legacy_finalize), ("finalize", finalize_match)):
+        elapsed = _run(finalize, matches)
+        rates[name] = matches / elapsed
+        print(f"{name:>9} | {rates[name]:>9,.0f} | {elapsed / matches * 1e3:>8.2f}")
+    print(f"Ускорение: x{rates['finalize'] / rates['legacy']:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MATCHES)
@@ -0,0 +1,203 @@
+"""
+Бенчмарк запросов страницы рекордов на синтетической базе SQLite.
+
+Для каждого рекорда сравниваются два способа пересчета по всей истории матчей:
+- legacy — все завершенные матчи загружаются в Python и обрабатываются в цикле;
+- sql — сортировка, суммирование и поиск серий выполняются в БД (ORDER BY ... LIMIT 1, SUM, оконные функции).
+
+Сам бот больше не пересчитывает рекорды по истории: они обновляются после каждого матча
+(app.db_utils.game_records), а оба способа остались здесь как база для сравнения.
+
+База создается один раз во временной папке: игроки и завершенные матчи со случайными
+участниками, победителями и длительностями.
+
+Запуск из корня репозитория:
+    python -m benchmarks.records_queries
+    python -m benchmarks.records_queries --matches 100000 --players 2000
+    python -m benchmarks.records_queries --no-legacy
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Пакет app.db_utils не требует БД, но app.config читает окружение — бенчмарк создает свою базу сам
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import and_, case, create_engine, desc, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db_utils.records import match_duration_seconds, match_participants  # noqa: E402
+from app.models import Base, Match, Player  # noqa: E402
+
+DEFAULT_MATCHES = 1_000_000
+DEFAULT_PLAYERS = 10_000
+INSERT_BATCH = 50_000
+
+
+def _finished_games(db):
+    return (
+        db.query(Match)
+        .filter(Match.result == "normal", Match.ended_at.isnot(None), Match.winner_id.isnot(None))
+        .order_by(Match.ended_at.asc())
+        .all()
+    )
+
+
+def _legacy_fastest_game(db):
+    fastest = min(_finished_games(db), key=lambda m: m.ended_at - m.started_at, default=None)
+    return fastest and fastest.ended_at - fastest.started_at
+
+
+def _legacy_most_time(db):
+    times = defaultdict(timedelta)
+    for match in _finished_games(db):
+        for player_id in (match.player_1_id, match.player_2_id):
+            times[player_id] += match.ended_at - match.started_at
+    return max(times.values(), default=None)
+
+
+def _legacy_streak(db, wins: bool):
+    best = 0
+    current = defaultdict(int)
+    for match in _finished_games(db):
+        for player_id in (match.player_1_id, match.player_2_id):
+            if (match.winner_id == player_id) == wins:
+                current[player_id] += 1
+                best = max(best, current[player_id])
+            else:
+                current[player_id] = 0
+    return best
+
+
+def _finished_normal_games():
+    return and_(Match.result == "normal", Match.ended_at.isnot(None))
+
+
+def _sql_fastest_game(db):
+    return (
+        db.query(Match)
+        .filter(_finished_normal_games(), Match.started_at.isnot(None))
+        .order_by(match_duration_seconds(db).asc(), Match.id.asc())
+        .first()
+    )
+
+
+def _sql_streak(db, wins: bool):
+    """
+    Самая длинная серия побед или поражений подряд среди всех игроков (gaps-and-islands).
+
+    Матчи каждого игрока нумеруются по времени (row_number), параллельно считается число его побед
+    к текущему матчу. Внутри серии побед разность «номер - побед» не меняется, внутри серии
+    поражений не меняется число побед — это и есть номер серии.
+    """
+    games = match_participants(
+        Match.id, Match.ended_at, Match.winner_id,
+        condition=and_(_finished_normal_games(), Match.winner_id.isnot(None)),
+    )
+    is_win = case((games.c.winner_id == games.c.player_id, 1), else_=0)
+    window = {"partition_by": games.c.player_id, "order_by": (games.c.ended_at, games.c.id)}
+    row_number = func.row_number().over(**window)
+    wins_so_far = func.sum(is_win).over(**window)
+    numbered = select(
+        games.c.player_id,
+        is_win.label("is_win"),
+        (row_number - wins_so_far if wins else wins_so_far).label("island"),
+    ).subquery()
+    return db.execute(
+        select(numbered.c.player_id, func.count().label("streak"))
+        .where(numbered.c.is_win == (1 if wins else 0))
+        .group_by(numbered.c.player_id, numbered.c.island)
+        .order_by(desc("streak"))
+        .limit(1)
+    ).first()
+
+
+def _sql_most_time(db):
+    games = match_participants(
+        match_duration_seconds(db).label("seconds"),
+        condition=and_(_finished_normal_games(), Match.started_at.isnot(None)),
+    )
+    return db.execute(
+        select(games.c.player_id, func.sum(games.c.seconds).label("total_seconds"))
+        .group_by(games.c.player_id)
+        .order_by(desc("total_seconds"))
+        .limit(1)
+    ).first()
+
+
+def _seed(session_factory, matches: int, players: int) -> None:
+    """Заполняет базу игроками и завершенными матчами."""
+    rng = random.Random(42)
+    started_at = datetime(2024, 1, 1)
+    with session_factory() as db:
+        db.execute(insert(Player), [
+            {"id": i, "telegram_id": str(i), "username": f"player{i}"} for i in range(1, players + 1)
+        ])
+        for start in range(0, matches, INSERT_BATCH):
+            rows = []
+            for n in range(start, min(start + INSERT_BATCH, matches)):
+                player_1_id, player_2_id = rng.sample(range(1, players + 1), 2)
+                started_at += timedelta(seconds=rng.randint(1, 60))
+                rows.append({
+                    "game_id": f"G{n:08d}",
+                    "player_1_id": player_1_id,
+                    "player_2_id": player_2_id,
+                    "winner_id": rng.choice((player_1_id, player_2_id)),
+                    "started_at": started_at,
+                    "ended_at": started_at + timedelta(seconds=rng.randint(30, 1800)),
+                    "result": "normal" if rng.random() < 0.9 else "surrender",
+                })
+            db.execute(insert(Match), rows)
+        db.commit()
+
+
+def _measure(session_factory, query) -> float:
+    with session_factory() as db:
+        started = time.perf_counter()
+        query(db)
+        return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Запросы страницы рекордов: Python против SQL")
+    parser.add_argument("--matches", type=int, default=DEFAULT_MATCHES, help="число матчей в базе")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help="число игроков в базе")
+    parser.add_argument("--no-legacy", action="store_true", help="не запускать прежние реализации")
+    args = parser.parse_args()
+
+    queries = (
+        ("fastest_game", _legacy_fastest_game, _sql_fastest_game),
+        ("win_streak", lambda db: _legacy_streak(db, wins=True), lambda db: _sql_streak(db, wins=True)),
+        ("loss_streak", lambda db: _legacy_streak(db, wins=False), lambda db: _sql_streak(db, wins=False)),
+        ("most_time", _legacy_most_time, _sql_most_time),
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'records.sqlite3')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        started = time.perf_counter()
+        _seed(session_factory, args.matches, args.players)
+        print(f"Матчей: {args.matches:,}, игроков: {args.players:,} (база заполнена за "
+              f"{time.perf_counter() - started:.1f} с)")
+        print(f"{'рекорд':>12} | {'legacy, с':>9} | {'sql, с':>7} | {'ускорение':>9}")
+        print("-" * 47)
+
+        for name, legacy, sql in queries:
+            sql_elapsed = _measure(session_factory, sql)
+            if args.no_legacy:
+                print(f"{name:>12} | {'-':>9} | {sql_elapsed:>7.3f} | {'-':>9}")
+                continue
+            legacy_elapsed = _measure(session_factory, legacy)
+            print(f"{name:>12} | {legacy_elapsed:>9.3f} | {sql_elapsed:>7.3f} | "
+                  f"x{legacy_elapsed / sql_elapsed:>8.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Бенчмарк записи в SQLite с разными профилями настроек (app.database.SQLITE_PROFILES).
+
+Для каждого профиля создается свежая файловая база во временной папке и выполняются две нагрузки:
+- presence — короткие транзакции «обновить last_seen одного игрока и commit»;
+- finalize — завершение PvP-матчей через finalize_match (результат, рейтинг, рекорды и ачивки).
+
+Транзакции выполняются из пула потоков того же размера, что и пул БД бота (DB_EXECUTOR_WORKERS),
+отдельной сессией на каждую транзакцию, как в run_db. Транзакции, завершившиеся ошибкой
+(например, «database is locked»), считаются отдельно.
+
+Запуск из корня репозитория:
+    python -m benchmarks.sqlite_profiles
+    python -m benchmarks.sqlite_profiles --transactions 5000 --workers 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Пакет app.services при импорте создает движок БД; бенчмарк создает свои базы сам.
+# ADMIN_ID нужен проверке ачивки fan_dev
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ADMIN_ID", "0")
+
+from sqlalchemy import update  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import DB_EXECUTOR_WORKERS, MOSCOW_TZ  # noqa: E402
+from app.database import SQLITE_PROFILES, create_db_engine  # noqa: E402
+from app.models import Base, Match, Player  # noqa: E402
+from app.services.achievements_service import load_achievements  # noqa: E402
+from app.services.game_service import finalize_match  # noqa: E402
+
+DEFAULT_TRANSACTIONS = 2000
+PLAYERS = 200
+
+
+def _prepare(path: str, profile: str, workers: int, matches: int) -> tuple[sessionmaker, list[tuple[str, int, int]]]:
+    """Создает базу с игроками и незавершенными матчами. Возвращает фабрику сессий и (игра, победитель, проигравший)."""
+    engine = create_db_engine(f"sqlite:///{path}", profile=profile, pool_size=workers, max_overflow=0)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    rng = random.Random(42)
+    started_at = datetime.now(MOSCOW_TZ) - timedelta(days=1)
+    plan = []
+    with session_factory() as db:
+        db.add_all(Player(id=i, telegram_id=str(i), username=f"player{i}") for i in range(1, PLAYERS + 1))
+        for n in range(matches):
+            winner_id, loser_id = rng.sample(range(1, PLAYERS + 1), 2)
+            game_id = f"G{n:07d}"
+            db.add(Match(game_id=game_id, player_1_id=winner_id, player_2_id=loser_id,
+                         started_at=started_at + timedelta(seconds=n)))
+            plan.append((game_id, winner_id, loser_id))
+        db.commit()
+        load_achievements(db)
+    return session_factory, plan
+
+
+def _touch_player(session_factory, telegram_id: str) -> None:
+    with session_factory() as db:
+        db.execute(update(Player).where(Player.telegram_id == telegram_id).values(last_seen=datetime.now(MOSCOW_TZ)))
+        db.commit()
+
+
+def _finalize(session_factory, game_id: str, winner_id: int, loser_id: int) -> None:
+    with session_factory() as db:
+        finalize_match(db, game_id, winner_id, loser_id, "normal")
+
+
+def _run(jobs: list, workers: int) -> tuple[float, int]:
+    """Выполняет задания в пуле потоков. Возвращает затраченное время и число заданий с ошибкой."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(job, *args) for job, *args in jobs]
+        errors = sum(1 for future in futures if future.exception() is not None)
+    return time.perf_counter() - started, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Скорость записи в SQLite с разными профилями настроек")
+    parser.add_argument("--transactions", type=int, default=DEFAULT_TRANSACTIONS,
+                        help="число транзакций в каждой нагрузке")
+    parser.add_argument("--workers", type=int, default=DB_EXECUTOR_WORKERS, help="число потоков")
+    args = parser.parse_args()
+
+    print(f"Транзакций: {args.transactions:,}, потоков: {args.workers}")
+    print(f"{'профиль':>8} | {'нагрузка':>8} | {'транз./с':>9} | {'мс/транз.':>9} | {'ошибок':>6}")
+    print("-" * 52)
+    for profile in SQLITE_PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            session_factory, plan = _prepare(os.path.join(directory, "bench.sqlite3"), profile, args.workers,
+                                             args.transactions)
+            rng = random.Random(7)
+            workloads = (
+                ("presence", [(_touch_player, session_factory, str(rng.randint(1, PLAYERS)))
+                              for _ in range(args.transactions)]),
+                ("finalize", [(_finalize, session_factory, *match) for match in plan]),
+            )
+            for name, jobs in workloads:
+                elapsed, errors = _run(jobs, args.workers)
+                print(f"{profile:>8} | {name:>8} | {len(jobs) / elapsed:>9,.0f} | "
+                      f"{elapsed / len(jobs) * 1e3:>9.2f} | {errors:>6}")
+            session_factory.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Заполнение итогов завершенных матчей в player_stats (finished_matches, play_seconds) по таблице matches.
+
+Нужна один раз после миграции, добавившей эти колонки, и после ручных правок матчей в БД.
+Дальше итоги обновляются сами при завершении каждого матча.
+
+Запуск из корня репозитория (использует DATABASE_URL из .env):
+    python -m scripts.backfill_player_totals
+"""
+import time
+
+from app.db_utils.stats import backfill_match_totals
+from app.dependencies import db_session
+
+
+def main() -> None:
+    started = time.perf_counter()
+    with db_session() as db:
+        players = backfill_match_totals(db)
+    print(f"Итоги пересчитаны для {players:,} игроков за {time.perf_counter() - started:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Проверка планов запросов бота к таблице matches: EXPLAIN QUERY PLAN должен использовать индексы
+(уникальный индекс game_id и ix_matches_result_ended_at из миграции d4a7b9c1e3f5).
+
+Во временной базе SQLite создаются таблицы по моделям, база заполняется синтетическими матчами
+и собирается статистика (ANALYZE), после чего для каждого запроса проверяется план:
+ожидаемый индекс используется, полного прохода по matches нет.
+При нарушении скрипт завершается с кодом 1.
+
+Запуск из корня репозитория:
+    python -m scripts.explain_matches
+    python -m scripts.explain_matches --matches 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# app.config читает окружение — скрипт создает свою базу сам
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, select, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import Base, Match  # noqa: E402
+
+DEFAULT_MATCHES = 20_000
+PLAYERS = 500
+
+
+def _match_by_game_id_query():
+    """Тот же запрос, что выполняет get_match_by_game_id при завершении каждого матча."""
+    return select(Match).where(Match.game_id == "G00000001").limit(1)
+
+
+def _rebuild_records_query():
+    """Тот же запрос, что читает rebuild_game_records."""
+    return (
+        select(Match)
+        .where(Match.result == 'normal', Match.winner_id.isnot(None),
+               Match.started_at.isnot(None), Match.ended_at.isnot(None))
+        .order_by(Match.ended_at.asc(), Match.id.asc())
+    )
+
+
+# (название, запрос, индексы, которые должны встретиться в плане)
+CHECKS = (
+    ("match_by_game_id", _match_by_game_id_query(), ("sqlite_autoindex_matches_1",)),
+    ("rebuild_records", _rebuild_records_query(), ("ix_matches_result_ended_at",)),
+)
+
+
+def _seed(session_factory, matches: int) -> None:
+    """Заполняет базу завершенными и незавершенными матчами и собирает статистику для планировщика."""
+    rng = random.Random(42)
+    started_at = datetime(2024, 1, 1)
+    rows = []
+    for n in range(matches):
+        player_1_id, player_2_id = rng.sample(range(1, PLAYERS + 1), 2)
+        started_at += timedelta(seconds=rng.randint(1, 60))
+        finished = rng.random() < 0.95
+        rows.append({
+            "game_id": f"G{n:08d}",
+            "player_1_id": player_1_id,
+            "player_2_id": player_2_id,
+            "winner_id": rng.choice((player_1_id, player_2_id)) if finished else None,
+            "started_at": started_at,
+            "ended_at": started_at + timedelta(seconds=rng.randint(30, 1800)) if finished else None,
+            "result": rng.choice(("normal", "normal", "normal", "surrender")) if finished else None,
+        })
+    with session_factory() as db:
+        db.execute(insert(Match), rows)
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+
+def _plan(db, engine, statement) -> list[str]:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    return [row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Проверка индексов в планах запросов к matches")
+    parser.add_argument("--matches", type=int, default=DEFAULT_MATCHES, help="число матчей в базе")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'explain.sqlite3')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        _seed(session_factory, args.matches)
+
+        with session_factory() as db:
+            for name, statement, indexes in CHECKS:
+                plan = _plan(db, engine, statement)
+                missing = [index for index in indexes if not any(index in step for step in plan)]
+                scans = [step for step in plan if step.startswith("SCAN matches")]
+                ok = not missing and not scans
+                failed = failed or not ok
+                print(f"{'OK' if ok else 'FAIL':>4} {name}")
+                for step in plan:
+                    print(f"       {step}")
+                if missing:
+                    print(f"       не используются индексы: {', '.join(missing)}")
+        engine.dispose()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Пересборка счетчиков прогресса достижений (achievement_progress) по таблице matches:
+серии побед, серии поражений без сдачи и дни подряд с матчами.
+
+Нужна один раз после миграции, добавившей эту таблицу, — иначе серии, начатые до обновления,
+начнут считаться с нуля. Дальше счетчики обновляются сами при завершении каждого матча.
+
+Запуск из корня репозитория (использует DATABASE_URL из .env):
+    python -m scripts.rebuild_achievement_progress
+"""
+import time
+
+from app.db_utils.achievements import rebuild_achievement_progress
+from app.dependencies import db_session
+
+
+def main() -> None:
+    started = time.perf_counter()
+    with db_session() as db:
+        applied = rebuild_achievement_progress(db)
+    print(f"Учтено матчей: {applied:,} за {time.perf_counter() - started:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
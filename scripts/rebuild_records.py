@@ -0,0 +1,32 @@
+"""
+Пересборка таблиц рекордов (game_records и player_records) по таблице matches.
+
+Нужна один раз после миграции, добавившей эти таблицы, и после ручных правок матчей в БД.
+Дальше рекорды обновляются сами при завершении каждого матча.
+
+Запуск из корня репозитория (использует DATABASE_URL из .env):
+    python -m scripts.rebuild_records
+"""
+import time
+
+from app.db_utils.game_records import get_records_summary, rebuild_game_records
+from app.dependencies import db_session
+
+
+def main() -> None:
+    started = time.perf_counter()
+    with db_session() as db:
+        applied = rebuild_game_records(db)
+        fastest_game, win_streak, loss_streak, most_games, most_time = get_records_summary(db)
+
+    print(f"Учтено матчей: {applied:,} за {time.perf_counter() - started:.1f} с")
+    if fastest_game:
+        print(f"Самая быстрая игра: {int(fastest_game[0])} сек. (@{fastest_game[2]} vs @{fastest_game[3]})")
+    for title, record in (("Стрик побед", win_streak), ("Стрик поражений", loss_streak),
+                          ("Больше всего игр", most_games), ("Больше всего минут", most_time)):
+        if record:
+            print(f"{title}: {record[0]} (@{record[1]})")
+
+
+if __name__ == "__main__":
+    main()